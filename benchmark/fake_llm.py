@@ -0,0 +1,246 @@
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional
+import asyncio
+import hashlib
+import json
+import random
+import re
+import threading
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from nodes.chunking import estimate_tokens
+
+
+class FakeLLMError(Exception):
+    """
+    Injected provider failure. Carries an HTTP status code, so the scheduler treats a
+    429 / 5xx exactly like a real rate-limit or server error (and retries it).
+    """
+
+    def __init__(self, status_code: int):
+        super().__init__(f"Injected fake LLM failure (HTTP {status_code})")
+        self.status_code = status_code
+
+
+@dataclass
+class FakeLLMConfig:
+    """
+    Behaviour of the fake model.
+
+    Attributes:
+        latency_seconds (float): Fixed time to first token of every call.
+        jitter_seconds (float): Uniform random extra latency in [0, jitter_seconds].
+        output_tokens_per_second (float): Generation speed; 0 returns the whole completion at once.
+        failure_rate (float): Probability that a call raises an injected HTTP error.
+        failure_status (int): Status code of injected errors (429 and 5xx are retried).
+        malformed_rate (float): Probability that JSON output is wrapped in fences and truncated,
+                                to exercise the tolerant parser / repair prompt.
+        seed (int): Seed of the random generator, for reproducible runs.
+    """
+    latency_seconds: float = 0.2
+    jitter_seconds: float = 0.05
+    output_tokens_per_second: float = 500.0
+    failure_rate: float = 0.0
+    failure_status: int = 429
+    malformed_rate: float = 0.0
+    seed: int = 0
+
+
+@dataclass
+class FakeLLMStats:
+    """
+    Counters shared by every fake model instance of a benchmark run.
+    """
+    calls: int = 0
+    failures: int = 0
+    malformed: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    calls_by_task: Dict[str, int] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, task: str, input_tokens: int, output_tokens: int) -> None:
+        with self._lock:
+            self.calls += 1
+            self.input_tokens += input_tokens
+            self.output_tokens += output_tokens
+            self.calls_by_task[task] = self.calls_by_task.get(task, 0) + 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "malformed": self.malformed,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "calls_by_task": dict(self.calls_by_task),
+        }
+
+
+# Schema titles that appear in the repair prompt (see response_parser._build_repair_prompt)
+_REPAIR_TASKS = {
+    "ResumeExtraction": "combined",
+    "WorkExperienceList": "work",
+    "EducationList": "education",
+    "ResumeInsights": "insights",
+    "InterviewQuestions": "questions",
+}
+
+
+def detect_task(prompt: str) -> str:
+    """
+    Works out which node sent the prompt from the JSON keys of its output template.
+
+    Returns one of: combined, work, education, insights, questions, summary.
+    """
+    if "corrected JSON" in prompt:
+        for title, task in _REPAIR_TASKS.items():
+            if f'"title": "{title}"' in prompt:
+                return task
+    if '"questions"' in prompt:
+        return "questions"
+    if '"insights"' in prompt:
+        return "insights"
+    if '"work_experiences"' in prompt and '"education"' in prompt:
+        return "combined"
+    if '"work_experiences"' in prompt:
+        return "work"
+    if '"education"' in prompt:
+        return "education"
+    return "summary"
+
+
+def _work(rng: random.Random) -> List[Dict[str, Any]]:
+    return [
+        {
+            "company": f"Company {rng.randint(1, 999)}",
+            "role": rng.choice(["Software Engineer", "Data Analyst", "Product Manager", "Team Lead"]),
+            "start_date": f"{2010 + i * 2}-{rng.randint(1, 12):02d}",
+            "end_date": "Present" if i == 0 else f"{2012 + i * 2}-{rng.randint(1, 12):02d}",
+            "description": " ".join(rng.choice(["Built", "Led", "Shipped", "Scaled", "Designed"]) + " systems" for _ in range(6)),
+        }
+        for i in range(rng.randint(1, 4))
+    ]
+
+
+def _education(rng: random.Random) -> List[Dict[str, Any]]:
+    return [
+        {
+            "institution": f"University {rng.randint(1, 99)}",
+            "degree": rng.choice(["B.Sc.", "M.Sc.", "MBA", "Ph.D."]),
+            "field": rng.choice(["Computer Science", "Statistics", "Economics"]),
+            "start_date": f"{2000 + i * 4}-09",
+            "end_date": f"{2004 + i * 4}-06",
+        }
+        for i in range(rng.randint(1, 2))
+    ]
+
+
+def fake_completion(task: str, rng: random.Random) -> str:
+    """
+    Builds a schema-valid completion for the given task.
+    """
+    if task == "work":
+        return json.dumps({"work_experiences": _work(rng)})
+    if task == "education":
+        return json.dumps({"education": _education(rng)})
+    if task == "combined":
+        return json.dumps({"work_experiences": _work(rng), "education": _education(rng)})
+    if task == "insights":
+        return json.dumps({"insights": [f"Insight {i}: {rng.randint(1, 20)} years of relevant work" for i in range(6)]})
+    if task == "questions":
+        return json.dumps({"questions": [f"Question {i}: tell us about project {rng.randint(1, 99)}?" for i in range(5)]})
+    return " ".join(
+        rng.choice(["Experienced", "engineer", "with", "a", "track", "record", "of", "delivery."])
+        for _ in range(80)
+    )
+
+
+class FakeChatModel:
+    """
+    Offline stand-in for ChatGroq with the same async surface used by `call_llm`
+    (`ainvoke`, `astream`, `model_name`, `temperature`).
+
+    Each call sleeps for the configured latency plus jitter plus generation time, may raise
+    an injected HTTP error, and returns schema-valid JSON for the node that sent the prompt
+    (detected from its output template). Responses carry `usage_metadata`, so token
+    tracking and metrics work as with the real provider. Output is seeded by the prompt,
+    so the same prompt always yields the same completion.
+
+    Args:
+        model_name (str): Model name reported to the cache key.
+        temperature (float): Temperature reported to the cache key.
+        config (FakeLLMConfig): Latency, throughput and failure behaviour.
+        stats (FakeLLMStats): Shared counters for the benchmark report.
+    """
+
+    def __init__(self, model_name: str, temperature: float, config: FakeLLMConfig, stats: FakeLLMStats):
+        self.model_name = model_name
+        self.temperature = temperature
+        self.config = config
+        self.stats = stats
+        self._rng = random.Random(config.seed)
+
+    def _prepare(self, messages: List[Any]) -> Dict[str, Any]:
+        """
+        Picks the completion, its token counts and the latency of one call.
+        """
+        prompt = "\n".join(str(getattr(message, "content", message)) for message in messages)
+        task = detect_task(prompt)
+        # Seed by prompt so the completion is deterministic, but draw latency / failures from the run's generator
+        content = fake_completion(task, random.Random(hashlib.sha256(prompt.encode("utf-8")).hexdigest()))
+        if task != "summary" and self._rng.random() < self.config.malformed_rate:
+            # Fenced and cut off mid-string: salvageable locally, or via the repair prompt
+            content = "```json\n" + content[: max(1, int(len(content) * 0.8))]
+            self.stats.malformed += 1
+        input_tokens, output_tokens = estimate_tokens(prompt), estimate_tokens(content)
+        self.stats.record(task, input_tokens, output_tokens)
+        return {
+            "content": content,
+            "usage": {"input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": input_tokens + output_tokens},
+            "latency": self.config.latency_seconds + self._rng.uniform(0, self.config.jitter_seconds),
+            "fail": self._rng.random() < self.config.failure_rate,
+        }
+
+    def _generation_time(self, tokens: int) -> float:
+        rate = self.config.output_tokens_per_second
+        return tokens / rate if rate else 0.0
+
+    async def ainvoke(self, messages: List[Any], *args: Any, **kwargs: Any) -> AIMessage:
+        call = self._prepare(messages)
+        await asyncio.sleep(call["latency"])
+        if call["fail"]:
+            self.stats.failures += 1
+            raise FakeLLMError(self.config.failure_status)
+        await asyncio.sleep(self._generation_time(call["usage"]["output_tokens"]))
+        return AIMessage(content=call["content"], usage_metadata=call["usage"])
+
+    async def astream(self, messages: List[Any], *args: Any, **kwargs: Any) -> AsyncIterator[AIMessageChunk]:
+        call = self._prepare(messages)
+        await asyncio.sleep(call["latency"])
+        if call["fail"]:
+            self.stats.failures += 1
+            raise FakeLLMError(self.config.failure_status)
+        # Emit word-sized chunks at the configured token rate; usage arrives with the last chunk
+        pieces = re.findall(r"\S+\s*", call["content"]) or [call["content"]]
+        per_piece = self._generation_time(call["usage"]["output_tokens"]) / len(pieces)
+        for index, piece in enumerate(pieces):
+            await asyncio.sleep(per_piece)
+            last = index == len(pieces) - 1
+            yield AIMessageChunk(content=piece, usage_metadata=call["usage"] if last else None)
+
+
+def install_fake_llm(config: Optional[FakeLLMConfig] = None) -> FakeLLMStats:
+    """
+    Routes every `get_llm` call to a FakeChatModel and returns the shared counters.
+
+    Example:
+        stats = install_fake_llm(FakeLLMConfig(latency_seconds=0.5, failure_rate=0.05))
+    """
+    from nodes.llm_client import set_llm_factory
+
+    config = config or FakeLLMConfig()
+    stats = FakeLLMStats()
+    set_llm_factory(lambda model, temperature: FakeChatModel(model, temperature, config, stats))
+    return stats
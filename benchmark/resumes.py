@@ -0,0 +1,56 @@
+from typing import List
+import random
+
+
+_FIRST_NAMES = ["Asha", "Ben", "Chen", "Dana", "Elif", "Farid", "Grace", "Hiro", "Ines", "Jonas"]
+_LAST_NAMES = ["Patel", "Novak", "Garcia", "Kim", "Okafor", "Schmidt", "Rossi", "Ivanova"]
+_ROLES = ["Software Engineer", "Data Analyst", "Backend Developer", "Product Manager", "ML Engineer"]
+_COMPANIES = ["Acme Technologies", "Globex Corp", "Initech Solutions", "Umbrella Labs", "Hooli Inc"]
+_DEGREES = ["Bachelor of Science", "Master of Science", "MBA", "B.Tech"]
+_FIELDS = ["Computer Science", "Information Systems", "Statistics", "Economics"]
+_BULLETS = [
+    "Built REST APIs serving millions of requests per day",
+    "Reduced infrastructure cost by 30% through autoscaling",
+    "Mentored junior engineers and led code reviews",
+    "Designed data pipelines for real-time analytics",
+    "Migrated monolith services to containers",
+    "Improved test coverage from 40% to 85%",
+]
+
+
+def make_resume(index: int, seed: int = 0) -> str:
+    """
+    Generates a synthetic resume. Even indices get clean section headings (the layout
+    the rule-based extractor handles); odd indices are free-form prose that needs the LLM.
+
+    Every index yields a different resume, so benchmark runs are not short-circuited by
+    the response cache or request coalescing.
+    """
+    rng = random.Random(seed * 100003 + index)
+    name = f"{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)} #{index}"
+    jobs = []
+    year = 2024
+    for _ in range(rng.randint(2, 4)):
+        start = year - rng.randint(1, 4)
+        jobs.append((rng.choice(_ROLES), rng.choice(_COMPANIES), start, year, rng.sample(_BULLETS, 3)))
+        year = start
+    degree, field_name = rng.choice(_DEGREES), rng.choice(_FIELDS)
+    graduated = year - 1
+
+    if index % 2 == 0:
+        lines: List[str] = [name, "", "Experience"]
+        for n, (role, company, start, end, bullets) in enumerate(jobs):
+            end_text = "Present" if n == 0 else f"Jun {end}"
+            lines += [f"{role} | {company}", f"Jan {start} - {end_text}"] + [f"- {b}" for b in bullets] + [""]
+        lines += ["Education", "University of Springfield", f"{degree} in {field_name}, {graduated}", ""]
+        lines += ["Skills", "Python, SQL, Docker, Kubernetes, AWS"]
+        return "\n".join(lines)
+
+    paragraphs = [f"{name} is a professional with experience across several companies."]
+    for role, company, start, end, bullets in jobs:
+        paragraphs.append(
+            f"From {start} to {end} they worked as {role} at {company}, where they "
+            + "; ".join(b.lower() for b in bullets) + "."
+        )
+    paragraphs.append(f"They hold a {degree} in {field_name} from the University of Springfield ({graduated}).")
+    return "\n\n".join(paragraphs)
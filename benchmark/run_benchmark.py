@@ -0,0 +1,294 @@
+"""
+Offline benchmark of the resume analysis pipeline.
+
+Replaces the Groq client with a local fake model (see benchmark/fake_llm.py) and measures
+latency percentiles, throughput and LLM calls per resume, either on the compiled graph
+directly, through the FastAPI app (POST /analyze-resume, in process), or both.
+
+Usage:
+    python -m benchmark.run_benchmark --resumes 200 --concurrency 16 --output report.json
+    python -m benchmark.run_benchmark --mode api --latency 0.5 --failure-rate 0.05
+    python -m benchmark.run_benchmark --compare baseline.json --tolerance 0.15
+    python -m benchmark.run_benchmark --mode graph --topology both
+"""
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of `values` (0 if empty).
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float, llm_calls: int, tokens: int) -> Dict[str, Any]:
+    """
+    Builds the report block for one benchmark target.
+    """
+    completed = len(latencies) + errors
+    return {
+        "requests": completed,
+        "errors": errors,
+        "duration_seconds": round(elapsed, 3),
+        "requests_per_second": round(completed / elapsed, 3) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 1),
+            "p95": round(percentile(latencies, 95) * 1000, 1),
+            "p99": round(percentile(latencies, 99) * 1000, 1),
+            "mean": round(sum(latencies) / len(latencies) * 1000, 1) if latencies else 0.0,
+            "max": round(max(latencies) * 1000, 1) if latencies else 0.0,
+        },
+        "llm_calls_per_resume": round(llm_calls / completed, 3) if completed else 0.0,
+        "llm_tokens_per_resume": round(tokens / completed, 1) if completed else 0.0,
+    }
+
+
+async def drive(
+    count: int,
+    concurrency: int,
+    analyze: Callable[[int], Awaitable[bool]],
+) -> Dict[str, Any]:
+    """
+    Runs `analyze(index)` for `count` resumes with at most `concurrency` in flight.
+
+    Returns:
+        Dict[str, Any]: Per-request latencies, error count and wall-clock duration.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one(index: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                ok = await analyze(index)
+            except Exception:
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(count)))
+    return {"latencies": latencies, "errors": errors, "elapsed": time.perf_counter() - started}
+
+
+async def bench_graph(args: argparse.Namespace, stats: Any, topology: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Benchmarks the compiled LangGraph app directly (no HTTP layer).
+    """
+    from benchmark.resumes import make_resume
+    from graph import build_graph
+
+    app = build_graph(topology=topology)
+
+    async def analyze(index: int) -> bool:
+        state = await app.ainvoke(
+            {"resume_text": make_resume(index, args.seed), "extraction_mode": args.extraction_mode},
+            config={"configurable": {"thread_id": f"bench-graph-{uuid.uuid4()}"}},
+        )
+        return bool(state.get("summary")) and not state.get("error")
+
+    calls, tokens = stats.calls, stats.input_tokens + stats.output_tokens
+    run = await drive(args.resumes, args.concurrency, analyze)
+    return summarize(
+        run["latencies"], run["errors"], run["elapsed"],
+        stats.calls - calls, stats.input_tokens + stats.output_tokens - tokens,
+    )
+
+
+async def bench_api(args: argparse.Namespace, stats: Any) -> Dict[str, Any]:
+    """
+    Benchmarks POST /analyze-resume through the FastAPI app, in process via httpx's ASGI transport.
+    """
+    import httpx
+    from benchmark.resumes import make_resume
+    from main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+
+        async def analyze(index: int) -> bool:
+            # Offset the index so the API run does not reuse the graph run's resumes
+            response = await client.post(
+                "/analyze-resume",
+                json={"resume_text": make_resume(args.resumes + index, args.seed), "extraction_mode": args.extraction_mode},
+            )
+            return response.status_code == 200 and "error" not in response.json()
+
+        calls, tokens = stats.calls, stats.input_tokens + stats.output_tokens
+        run = await drive(args.resumes, args.concurrency, analyze)
+    return summarize(
+        run["latencies"], run["errors"], run["elapsed"],
+        stats.calls - calls, stats.input_tokens + stats.output_tokens - tokens,
+    )
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Lists regressions of `report` against `baseline`: p95 latency or LLM calls per resume
+    up, or throughput down, by more than `tolerance` (a fraction).
+    """
+    regressions = []
+    for target, current in report["results"].items():
+        previous = baseline.get("results", {}).get(target)
+        if not previous:
+            continue
+        checks = [
+            ("latency_ms.p95", current["latency_ms"]["p95"], previous["latency_ms"]["p95"], 1),
+            ("llm_calls_per_resume", current["llm_calls_per_resume"], previous["llm_calls_per_resume"], 1),
+            ("requests_per_second", current["requests_per_second"], previous["requests_per_second"], -1),
+        ]
+        for name, now, before, direction in checks:
+            if before and direction * (now - before) / before > tolerance:
+                regressions.append(f"{target}.{name}: {before} -> {now}")
+    return regressions
+
+
+def configure_environment(args: argparse.Namespace, workdir: str) -> None:
+    """
+    Sets the app's environment before any project module (and thus `settings`) is imported.
+
+    Rate limits are lifted (the fake model has no quota), the response cache is off unless
+    requested, and checkpoints, shared state and the candidate store go to throwaway SQLite
+    files, so synthetic resumes never reach the real candidate store.
+    """
+    os.environ["GROQ_API_KEY"] = os.environ.get("GROQ_API_KEY") or "benchmark"
+    os.environ["LLM_RPM"] = str(args.rpm)
+    os.environ["LLM_TPM"] = str(args.tpm)
+    os.environ["LLM_RETRY_BASE_DELAY"] = str(args.retry_base_delay)
+    os.environ["LLM_CACHE_ENABLED"] = "true" if args.cache else "false"
+    os.environ["LLM_CACHE_DB_PATH"] = ""
+    os.environ["RULE_EXTRACTION_ENABLED"] = "true" if args.rules else "false"
+    os.environ["CHECKPOINT_DB_PATH"] = os.path.join(workdir, "checkpoints.sqlite3")
+    os.environ["CHECKPOINT_TTL_SECONDS"] = "0"
+    os.environ["CHECKPOINT_MAX_THREADS"] = "0"
+    os.environ["STATE_BACKEND"] = "sqlite"
+    os.environ["STATE_DB_PATH"] = os.path.join(workdir, "state.sqlite3")
+    os.environ["CANDIDATE_DB_PATH"] = os.path.join(workdir, "candidates.sqlite3")
+    if args.topology != "both":
+        os.environ["GRAPH_TOPOLOGY"] = args.topology
+
+
+def _git_revision() -> Optional[str]:
+    """
+    Returns the current git commit, so reports can be matched to versions.
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline benchmark of the resume analysis pipeline.")
+    parser.add_argument("--mode", choices=["graph", "api", "both"], default="both")
+    parser.add_argument("--resumes", type=int, default=100, help="Resumes analyzed per target.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Analyses in flight at once.")
+    parser.add_argument("--extraction-mode", choices=["split", "combined"], default="split")
+    parser.add_argument(
+        "--topology", choices=["linear", "parallel", "both"], default="linear",
+        help="Graph topology; 'both' benchmarks the graph with each (API runs then use GRAPH_TOPOLOGY).",
+    )
+    parser.add_argument("--latency", type=float, default=0.2, help="Fake LLM time to first token (s).")
+    parser.add_argument("--jitter", type=float, default=0.05, help="Extra uniform random latency (s).")
+    parser.add_argument("--tokens-per-second", type=float, default=500.0, help="Fake LLM generation speed.")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of calls failing with --failure-status.")
+    parser.add_argument("--failure-status", type=int, default=429)
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="Fraction of JSON outputs truncated.")
+    parser.add_argument("--rpm", type=int, default=0, help="Scheduler request budget (0 = unlimited).")
+    parser.add_argument("--tpm", type=int, default=0, help="Scheduler token budget (0 = unlimited).")
+    parser.add_argument("--retry-base-delay", type=float, default=0.05)
+    parser.add_argument("--cache", action="store_true", help="Keep the LLM response cache enabled.")
+    parser.add_argument("--no-rules", dest="rules", action="store_false", help="Disable the rule-based fast path.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark_report.json", help="Where to write the JSON report.")
+    parser.add_argument("--compare", help="Baseline report to check for regressions.")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Allowed relative regression.")
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Installs the fake model and runs the selected targets.
+    """
+    from benchmark.fake_llm import FakeLLMConfig, install_fake_llm
+
+    stats = install_fake_llm(FakeLLMConfig(
+        latency_seconds=args.latency,
+        jitter_seconds=args.jitter,
+        output_tokens_per_second=args.tokens_per_second,
+        failure_rate=args.failure_rate,
+        failure_status=args.failure_status,
+        malformed_rate=args.malformed_rate,
+        seed=args.seed,
+    ))
+
+    results: Dict[str, Any] = {}
+    if args.mode in ("graph", "both"):
+        if args.topology == "both":
+            # Same resumes through each topology, so the reports are directly comparable
+            for topology in ("linear", "parallel"):
+                results[f"graph_{topology}"] = await bench_graph(args, stats, topology)
+        else:
+            results["graph"] = await bench_graph(args, stats, args.topology)
+    if args.mode in ("api", "both"):
+        results["api"] = await bench_api(args, stats)
+
+    return {
+        "revision": _git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "parameters": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "results": results,
+        "fake_llm": stats.as_dict(),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="resume-bench-") as workdir:
+        # Must happen before the app's modules read their settings
+        configure_environment(args, workdir)
+        report = asyncio.run(run(args))
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report["results"], indent=2))
+    print(f"Report written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            print("Regressions against baseline:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+        print("No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,283 @@
+"""
+Offline bulk analysis of many resumes, without the API.
+
+Reads a JSONL file (one {"id", "resume_text", ...} object per line) or a directory of
+PDF / DOCX / text resumes, runs each through the LangGraph workflow with a bounded number
+of concurrent pipelines and appends one JSON result per line to the output file as soon
+as each resume finishes.
+
+Progress is recorded in a ledger next to the output file (<output>.progress). Rerunning
+the same command after a crash or Ctrl-C skips every resume that already finished;
+failed resumes are retried only with --retry-failed.
+
+Usage:
+    python bulk.py resumes.jsonl --output results.jsonl --concurrency 8
+    python bulk.py ./resumes/ --output results.jsonl --include summary insights
+    python bulk.py resumes.jsonl --output results.jsonl --retry-failed
+"""
+from typing import Any, Dict, Iterator, List, Optional, Set
+import argparse
+import asyncio
+import json
+import os
+import sys
+import uuid
+
+from tqdm import tqdm
+
+from candidate_store import get_candidate_store
+from config import settings
+from file_ingest import DOCUMENT_TYPES, DocumentError, aextract_file_text, shutdown_extraction_pool
+from graph import ANALYSIS_OUTPUTS, build_graph, partial_errors
+from metrics import SUMMARY_ERROR_PREFIX, is_error_result
+
+
+def iter_inputs(source: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yields the resumes to analyze as {"id", "resume_text"} or {"id", "path", "kind"} items.
+
+    JSONL lines may carry "id" (defaults to "line-<n>"), "resume_text", "extraction_mode"
+    and "include". Directory entries are identified by their path relative to `source`.
+    """
+    if os.path.isdir(source):
+        for root, _, files in sorted(os.walk(source)):
+            for name in sorted(files):
+                kind = os.path.splitext(name)[1].lower().lstrip(".")
+                if kind in DOCUMENT_TYPES:
+                    path = os.path.join(root, name)
+                    yield {"id": os.path.relpath(path, source), "path": path, "kind": kind}
+        return
+
+    with open(source, encoding="utf-8") as f:
+        for number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                # Surface it as a failed item rather than aborting the whole run
+                yield {"id": f"line-{number}", "invalid": f"Invalid JSON: {e}"}
+                continue
+            record["id"] = str(record.get("id") or f"line-{number}")
+            yield record
+
+
+def _truncate_partial_line(path: str, block_size: int = 64 * 1024) -> None:
+    """
+    Drops a half-written last line left by a crash, so appended lines stay valid JSONL.
+
+    Only the tail of the file is read: it is scanned backwards from the end in blocks of
+    `block_size` bytes until the last newline is found.
+    """
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return
+    with open(path, "rb+") as f:
+        end = f.seek(0, os.SEEK_END)
+        f.seek(end - 1)
+        if f.read(1) == b"\n":
+            return
+        position = end
+        while position > 0:
+            start = max(0, position - block_size)
+            f.seek(start)
+            newline = f.read(position - start).rfind(b"\n")
+            if newline != -1:
+                f.truncate(start + newline + 1)
+                return
+            position = start
+        f.truncate(0)
+
+
+def load_progress(output: str, ledger: str, retry_failed: bool) -> Set[str]:
+    """
+    Returns the ids that must not be analyzed again.
+
+    Finished ids come from the ledger and, in case the process died between writing a
+    result and its ledger entry, from the output file itself. Failed ids are skipped too,
+    unless `retry_failed` is set.
+    """
+    skip: Set[str] = set()
+    for path in (ledger, output):
+        _truncate_partial_line(path)
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                entry = json.loads(line)
+                if path == output or entry.get("status") == "done" or not retry_failed:
+                    skip.add(entry["id"])
+    return skip
+
+
+def analysis_error(values: Dict[str, Any]) -> Optional[str]:
+    """
+    Returns why a finished run failed, or None if it succeeded.
+
+    Uses the same rule as the node error metric (a top-level "error", a section such as
+    "work" / "education" holding {"error": ...}, or a summary that is an error message),
+    so partially failed analyses are retried by --retry-failed instead of counted as done.
+    """
+    if not is_error_result(values):
+        return None
+    if values.get("error"):
+        return str(values["error"])
+    summary = values.get("summary")
+    if isinstance(summary, str) and summary.startswith(SUMMARY_ERROR_PREFIX):
+        return summary
+    return "; ".join(
+        f"{key}: {value['error']}" for key, value in values.items() if isinstance(value, dict) and "error" in value
+    )
+
+
+def build_result(item_id: str, thread_id: str, values: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Builds the output record of one resume from the final workflow state.
+    """
+    return {
+        "id": item_id,
+        "thread_id": thread_id,
+        "summary": values.get("summary"),
+        "insights": values.get("insights"),
+        "questions": values.get("questions"),
+        "work_experiences": (values.get("work") or {}).get("work_experiences"),
+        "education": (values.get("education") or {}).get("education"),
+        "extraction_mode": values.get("extraction_mode"),
+        "extraction_sources": values.get("extraction_sources"),
+        "partial_errors": partial_errors(values),
+    }
+
+
+async def analyze_item(graph_app: Any, item: Dict[str, Any], args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Runs one resume through the workflow and indexes it in the candidate store (if enabled).
+
+    Returns:
+        Dict[str, Any]: The result record, or {"id", "error"} if the resume failed.
+    """
+    if "invalid" in item:
+        return {"id": item["id"], "error": item["invalid"]}
+    try:
+        resume_text = item.get("resume_text")
+        if "path" in item:
+            resume_text = await aextract_file_text(item["path"], item["kind"])
+        if not resume_text or not str(resume_text).strip():
+            return {"id": item["id"], "error": "Missing 'resume_text'"}
+
+        state: Dict[str, Any] = {
+            "resume_text": resume_text,
+            "extraction_mode": item.get("extraction_mode") or args.extraction_mode or settings.extraction_mode,
+        }
+        include = item.get("include") or args.include
+        if include:
+            state["include"] = list(include)
+
+        thread_id = str(uuid.uuid4())
+        values = await graph_app.ainvoke(state, config={"thread_id": thread_id})
+        error = analysis_error(values)
+        if error:
+            return {"id": item["id"], "thread_id": thread_id, "error": error}
+        candidate_store = get_candidate_store()
+        if candidate_store is not None:
+            await candidate_store.arecord(thread_id, values)
+        return build_result(item["id"], thread_id, values)
+    except DocumentError as e:
+        return {"id": item["id"], "error": str(e)}
+    except Exception as e:
+        return {"id": item["id"], "error": f"{type(e).__name__}: {e}"}
+
+
+async def run(args: argparse.Namespace) -> Dict[str, int]:
+    """
+    Analyzes every pending resume with `args.concurrency` pipelines in flight.
+
+    Items are read lazily and handed to a fixed set of workers through a bounded queue, so
+    memory stays flat for inputs of any size. Each finished resume is appended to the
+    output (successes) and the ledger (every outcome) and flushed right away.
+    """
+    ledger_path = args.ledger or f"{args.output}.progress"
+    skip = load_progress(args.output, ledger_path, args.retry_failed)
+    total = sum(1 for _ in iter_inputs(args.input))
+
+    graph_app = build_graph()
+    queue: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue(maxsize=args.concurrency * 2)
+    counts = {"done": 0, "failed": 0, "skipped": 0}
+
+    with open(args.output, "a", encoding="utf-8") as output, \
+            open(ledger_path, "a", encoding="utf-8") as ledger, \
+            tqdm(total=total, unit="resume", desc="Analyzing", dynamic_ncols=True) as progress:
+
+        def record(result: Dict[str, Any]) -> None:
+            status = "failed" if "error" in result else "done"
+            counts[status] += 1
+            if status == "done":
+                output.write(json.dumps(result, ensure_ascii=False) + "\n")
+                output.flush()
+            entry = {"id": result["id"], "status": status}
+            if status == "failed":
+                entry["error"] = result["error"]
+            ledger.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            ledger.flush()
+            progress.update(1)
+            progress.set_postfix(failed=counts["failed"], refresh=False)
+
+        async def worker() -> None:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                record(await analyze_item(graph_app, item, args))
+
+        workers = [asyncio.create_task(worker()) for _ in range(args.concurrency)]
+        try:
+            seen: Set[str] = set()
+            for item in iter_inputs(args.input):
+                # Already finished in an earlier run, or a duplicate id within this input
+                if item["id"] in skip or item["id"] in seen:
+                    counts["skipped"] += 1
+                    progress.update(1)
+                    continue
+                seen.add(item["id"])
+                await queue.put(item)
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+            shutdown_extraction_pool()
+
+    return counts
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Analyze many resumes offline with resumable progress.")
+    parser.add_argument("input", help="JSONL file with one resume per line, or a directory of PDF / DOCX / TXT files.")
+    parser.add_argument("--output", "-o", required=True, help="JSONL file the results are appended to.")
+    parser.add_argument("--ledger", help="Progress ledger (default: <output>.progress).")
+    parser.add_argument("--concurrency", "-c", type=int, default=settings.batch_concurrency,
+                        help="Resumes analyzed at once.")
+    parser.add_argument("--extraction-mode", choices=["split", "combined"], help="Default: EXTRACTION_MODE.")
+    parser.add_argument("--include", nargs="+", choices=ANALYSIS_OUTPUTS, help="Outputs to produce (default: all).")
+    parser.add_argument("--retry-failed", action="store_true", help="Analyze resumes that failed in an earlier run again.")
+    args = parser.parse_args(argv)
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    try:
+        counts = asyncio.run(run(args))
+    except KeyboardInterrupt:
+        print("Interrupted; run the same command again to resume.", file=sys.stderr)
+        return 130
+    print(
+        f"{counts['done']} analyzed, {counts['failed']} failed, {counts['skipped']} skipped "
+        f"(finished in an earlier run or duplicate id). Results: {args.output}"
+    )
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,413 @@
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import datetime
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+
+from config import settings
+from nodes.chunking import split_sections
+from nodes.rule_extractor import normalize_date
+
+
+logger = logging.getLogger(__name__)
+
+# Searchable fields of the inverted index, with their BM25 weights (higher = more important)
+INDEX_FIELDS: Tuple[Tuple[str, float], ...] = (
+    ("skills", 3.0),
+    ("roles", 2.5),
+    ("companies", 2.0),
+    ("degrees", 1.5),
+    ("institutions", 1.5),
+    ("summary", 1.0),
+)
+
+# Candidates table. Years of experience are stored as finished months plus the start of the
+# ongoing stretch (see `experience_span`) and computed at query time, so they never go stale.
+_CANDIDATES_TABLE = """
+CREATE TABLE IF NOT EXISTS candidates (
+    id INTEGER PRIMARY KEY,
+    thread_id TEXT NOT NULL UNIQUE,
+    document_fingerprint TEXT UNIQUE,
+    summary TEXT,
+    insights TEXT,
+    work TEXT,
+    education TEXT,
+    experience_months INTEGER NOT NULL,
+    ongoing_since INTEGER,
+    updated_at REAL NOT NULL
+);
+"""
+
+# Words of a query; keeps tokens like "c++" and "c#" whole, like the index tokenizer
+_TERM_RE = re.compile(r"[\w+#]+")
+
+
+def _month_number(day: datetime.date) -> int:
+    """
+    Returns the month count of a date (see `_month`).
+    """
+    return day.year * 12 + day.month - 1
+
+
+def _month(value: Optional[str]) -> Optional[float]:
+    """
+    Converts a resume date ('YYYY-MM', 'YYYY', 'March 2020', ...) into a month count;
+    'Present' becomes infinity, as the role is still ongoing.
+    """
+    normalized = normalize_date(value) if isinstance(value, str) else None
+    if not normalized:
+        return None
+    if normalized == "Present":
+        return float("inf")
+    match = re.match(r"((?:19|20)\d{2})(?:-(\d{2}))?$", normalized)
+    if not match:
+        return None
+    month = int(match.group(2) or 1)
+    return int(match.group(1)) * 12 + min(max(month, 1), 12) - 1
+
+
+def experience_span(work_experiences: List[Dict[str, Any]]) -> Tuple[int, Optional[int]]:
+    """
+    Measures work experience in a form that does not go stale: the months of finished
+    experience, and the month the ongoing stretch (ending 'Present') started, if any.
+
+    Overlapping roles are merged, so two concurrent jobs count once. Entries without a
+    parseable start date, or without an end date, are ignored.
+
+    Args:
+        work_experiences (List[Dict[str, Any]]): Entries with 'start_date' / 'end_date'.
+
+    Returns:
+        Tuple[int, Optional[int]]: (finished months, month count the ongoing stretch started
+                                   or None); see `years_of_experience` for the total.
+    """
+    intervals = []
+    for entry in work_experiences:
+        start, end = _month(entry.get("start_date")), _month(entry.get("end_date"))
+        if start is not None and start != float("inf") and end is not None and end >= start:
+            intervals.append((int(start), end))
+
+    merged: List[List[Any]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    # Only the last stretch can be ongoing; it keeps growing until the role ends
+    ongoing_since = merged[-1][0] if merged and merged[-1][1] == float("inf") else None
+    months = sum(int(end) - start for start, end in merged if end != float("inf"))
+    return months, ongoing_since
+
+
+def years_at(months: int, ongoing_since: Optional[int], today: Optional[datetime.date] = None) -> float:
+    """
+    Total years of experience on `today` (defaults to today) from an `experience_span`.
+    """
+    if ongoing_since is not None:
+        months += max(0, _month_number(today or datetime.date.today()) - ongoing_since)
+    return round(months / 12, 1)
+
+
+def years_of_experience(work_experiences: List[Dict[str, Any]], today: Optional[datetime.date] = None) -> float:
+    """
+    Computes total years of experience from work entries' start / end dates.
+
+    Args:
+        work_experiences (List[Dict[str, Any]]): Entries with 'start_date' / 'end_date'.
+        today (Optional[datetime.date]): Reference date for 'Present' (defaults to today).
+
+    Returns:
+        float: Years, rounded to one decimal.
+    """
+    return years_at(*experience_span(work_experiences), today=today)
+
+
+def _join(values: List[Any]) -> str:
+    return "\n".join(str(value) for value in values if value)
+
+
+def index_document(values: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Builds the text of each index field from an analysis' final state.
+
+    Skills come from the resume's skills sections, the work descriptions, the fields
+    of study and the insights; the other fields from the matching record attributes.
+    """
+    work = (values.get("work") or {}).get("work_experiences") or []
+    education = (values.get("education") or {}).get("education") or []
+    skill_sections = [
+        body for heading, body in split_sections(values.get("resume_text") or "")
+        if "skill" in (heading or "").lower()
+    ]
+    return {
+        "skills": _join(
+            skill_sections
+            + [entry.get("description") for entry in work]
+            + [entry.get("field") for entry in education]
+            + list(values.get("insights") or [])
+        ),
+        "roles": _join([entry.get("role") for entry in work]),
+        "companies": _join([entry.get("company") for entry in work]),
+        "degrees": _join([entry.get("degree") for entry in education]),
+        "institutions": _join([entry.get("institution") for entry in education]),
+        "summary": values.get("summary") or "",
+    }
+
+
+def _phrase(text: str) -> Optional[str]:
+    """
+    Quotes text as an FTS5 phrase, dropping characters that are query syntax.
+    """
+    terms = _TERM_RE.findall(text.lower())
+    return '"' + " ".join(terms) + '"' if terms else None
+
+
+def build_match_expression(query: Optional[str] = None, filters: Optional[Dict[str, Optional[str]]] = None) -> Optional[str]:
+    """
+    Builds an FTS5 MATCH expression.
+
+    Free-text terms are OR-ed (BM25 ranks candidates matching more and rarer terms first);
+    each field filter is a required phrase in that field, e.g. companies : "goldman sachs".
+    """
+    parts = []
+    terms = [_phrase(term) for term in _TERM_RE.findall((query or "").lower())]
+    if any(terms):
+        parts.append("(" + " OR ".join(term for term in terms if term) + ")")
+    for field, value in (filters or {}).items():
+        phrase = _phrase(value or "")
+        if phrase:
+            parts.append(f"{field} : {phrase}")
+    return " AND ".join(parts) or None
+
+
+class CandidateStore:
+    """
+    Embedded, persistent store of analyzed candidates with ranked search.
+
+    Every finished analysis is saved in a SQLite file together with:
+        - an FTS5 inverted index over skills, roles, companies, degrees, institutions and
+          the summary, ranked with BM25 (per-field weights in INDEX_FIELDS);
+        - the work entries' finished months and the start of any ongoing role, from which
+          years of experience are computed when searching, so current roles keep counting.
+
+    Text queries touch only the posting lists of their terms, so they stay in the
+    millisecond range for hundreds of thousands of candidates and never call the LLM.
+    A resume analyzed again (same text, or re-analysis of an earlier thread) replaces
+    its previous entry.
+
+    Args:
+        db_path (str): Path of the SQLite file.
+    """
+
+    def __init__(self, db_path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.executescript(
+            f"""
+            PRAGMA journal_mode=WAL;
+            {_CANDIDATES_TABLE}
+            CREATE VIRTUAL TABLE IF NOT EXISTS candidate_index USING fts5(
+                {", ".join(field for field, _ in INDEX_FIELDS)},
+                tokenize = "unicode61 remove_diacritics 2 tokenchars '+#'"
+            );
+            """
+        )
+        self._upgrade_years_columns()
+        self._conn.commit()
+        self._weights = ", ".join(str(weight) for _, weight in INDEX_FIELDS)
+
+    def _upgrade_years_columns(self) -> None:
+        """
+        Converts a store that saved years of experience as of indexing time: the table is
+        rebuilt with the current columns, recomputed from the saved work entries.
+        """
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(candidates)")}
+        if "years_experience" not in columns:
+            return
+        self._conn.execute("DROP INDEX IF EXISTS candidates_years")
+        self._conn.execute("ALTER TABLE candidates RENAME TO candidates_old")
+        self._conn.executescript(_CANDIDATES_TABLE)
+        rows = self._conn.execute(
+            "SELECT id, thread_id, document_fingerprint, summary, insights, work, education, updated_at "
+            "FROM candidates_old"
+        ).fetchall()
+        for *fields, work, education, updated_at in rows:
+            self._conn.execute(
+                "INSERT INTO candidates VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (*fields, work, education, *experience_span(json.loads(work or "[]")), updated_at),
+            )
+        self._conn.execute("DROP TABLE candidates_old")
+
+    def add(self, thread_id: str, values: Dict[str, Any], replaces: Optional[str] = None) -> None:
+        """
+        Saves (or replaces) the candidate analyzed under `thread_id`.
+
+        Args:
+            thread_id (str): Thread of the analysis.
+            values (Dict[str, Any]): Final workflow state.
+            replaces (Optional[str]): Thread of an earlier analysis of the same candidate
+                                      (e.g. `previous_thread_id`), whose entry is removed.
+        """
+        work = (values.get("work") or {}).get("work_experiences") or []
+        education = (values.get("education") or {}).get("education") or []
+        fingerprint = (values.get("fingerprints") or {}).get("document")
+        document = index_document(values)
+
+        with self._lock:
+            try:
+                stale = self._conn.execute(
+                    "SELECT id FROM candidates WHERE thread_id IN (?, ?) OR document_fingerprint = ?",
+                    (thread_id, replaces or thread_id, fingerprint),
+                ).fetchall()
+                for (candidate_id,) in stale:
+                    self._conn.execute("DELETE FROM candidate_index WHERE rowid = ?", (candidate_id,))
+                    self._conn.execute("DELETE FROM candidates WHERE id = ?", (candidate_id,))
+                cursor = self._conn.execute(
+                    "INSERT INTO candidates (thread_id, document_fingerprint, summary, insights, work, education, "
+                    "experience_months, ongoing_since, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        thread_id,
+                        fingerprint,
+                        values.get("summary"),
+                        json.dumps(values.get("insights") or []),
+                        json.dumps(work),
+                        json.dumps(education),
+                        *experience_span(work),
+                        time.time(),
+                    ),
+                )
+                self._conn.execute(
+                    f"INSERT INTO candidate_index (rowid, {', '.join(document)}) "
+                    f"VALUES (?, {', '.join('?' for _ in document)})",
+                    (cursor.lastrowid, *document.values()),
+                )
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+
+    async def arecord(self, thread_id: str, values: Dict[str, Any], replaces: Optional[str] = None) -> None:
+        """
+        Saves a finished analysis without blocking the event loop. Analyses that failed or
+        produced nothing searchable are skipped, and store errors are logged rather than
+        raised, so they never fail the request that produced the analysis.
+        """
+        if values.get("error") or not (values.get("work") or values.get("education") or values.get("summary")):
+            return
+        try:
+            await asyncio.to_thread(self.add, thread_id, values, replaces)
+        except Exception:
+            logger.exception("Could not save analysis %s to the candidate store", thread_id)
+
+    def search(
+        self,
+        query: Optional[str] = None,
+        filters: Optional[Dict[str, Optional[str]]] = None,
+        min_years: Optional[float] = None,
+        max_years: Optional[float] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns candidates ranked by BM25 relevance (or by experience if there is no text query).
+
+        Args:
+            query (Optional[str]): Free-text terms, e.g. "python kubernetes"; any term may match.
+            filters (Optional[Dict[str, Optional[str]]]): Required phrases per index field,
+                                                          e.g. {"companies": "Goldman Sachs"}.
+            min_years (Optional[float]): Minimum years of experience.
+            max_years (Optional[float]): Maximum years of experience.
+            limit (int): Page size.
+            offset (int): Results to skip.
+
+        Returns:
+            List[Dict[str, Any]]: thread_id, score, years_experience, summary, roles,
+                                  companies, degrees and institutions of each candidate.
+
+        Raises:
+            ValueError: If a filter names an unknown field.
+        """
+        unknown = set(filters or {}) - {field for field, _ in INDEX_FIELDS}
+        if unknown:
+            raise ValueError(f"Unknown search fields: {', '.join(sorted(unknown))}")
+
+        # Years as of this month: ongoing roles count up to now
+        now = _month_number(datetime.date.today())
+        years = (
+            "ROUND((c.experience_months + CASE WHEN c.ongoing_since IS NULL THEN 0 "
+            f"ELSE MAX(0, {now} - c.ongoing_since) END) / 12.0, 1)"
+        )
+        clauses: List[str] = []
+        params: List[Any] = []
+        if min_years is not None:
+            clauses.append(f"{years} >= ?")
+            params.append(min_years)
+        if max_years is not None:
+            clauses.append(f"{years} <= ?")
+            params.append(max_years)
+
+        columns = f"c.thread_id, c.summary, c.work, c.education, {years} AS years_experience"
+        match = build_match_expression(query, filters)
+        if match:
+            sql = (
+                f"SELECT {columns}, bm25(candidate_index, {self._weights}) AS rank "
+                "FROM candidate_index JOIN candidates c ON c.id = candidate_index.rowid "
+                "WHERE candidate_index MATCH ?"
+                + "".join(f" AND {clause}" for clause in clauses)
+                + " ORDER BY rank LIMIT ? OFFSET ?"
+            )
+            params = [match, *params]
+        else:
+            # No text to rank by: most experienced first
+            sql = (
+                f"SELECT {columns}, 0 AS rank FROM candidates c"
+                + (" WHERE " + " AND ".join(clauses) if clauses else "")
+                + " ORDER BY years_experience DESC LIMIT ? OFFSET ?"
+            )
+
+        with self._lock:
+            rows = self._conn.execute(sql, (*params, limit, offset)).fetchall()
+
+        results = []
+        for thread_id, summary, work, education, years, rank in rows:
+            work, education = json.loads(work), json.loads(education)
+            results.append({
+                "thread_id": thread_id,
+                # bm25() is lower-is-better; report higher-is-better scores
+                "score": round(-rank, 6),
+                "years_experience": years,
+                "summary": summary,
+                "roles": [entry.get("role") for entry in work if entry.get("role")],
+                "companies": [entry.get("company") for entry in work if entry.get("company")],
+                "degrees": [entry.get("degree") for entry in education if entry.get("degree")],
+                "institutions": [entry.get("institution") for entry in education if entry.get("institution")],
+            })
+        return results
+
+    def count(self) -> int:
+        """
+        Returns the number of stored candidates.
+        """
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+
+
+_store: Optional[CandidateStore] = None
+_store_lock = threading.Lock()
+
+
+def get_candidate_store() -> Optional[CandidateStore]:
+    """
+    Returns the shared candidate store, or None if CANDIDATE_STORE_ENABLED is off.
+    """
+    global _store
+    if not settings.candidate_store_enabled:
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = CandidateStore(settings.candidate_db_path)
+        return _store
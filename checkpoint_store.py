@@ -0,0 +1,664 @@
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+import asyncio
+import base64
+import random
+import sqlite3
+import threading
+import time
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+)
+
+from state_backend import StateBackend
+
+
+class SQLiteCheckpointSaver(BaseCheckpointSaver):
+    """
+    Disk-backed LangGraph checkpointer with TTL and size-based eviction.
+
+    Every checkpoint and pending write is stored in a SQLite file, so workflow state
+    survives restarts. Threads that have not been written to for `ttl_seconds` are
+    deleted, and once more than `max_threads` threads exist the least recently
+    updated ones are evicted. Eviction runs at most once every `prune_interval_seconds`.
+    The file may be shared by several worker processes on one host.
+
+    Args:
+        db_path (str): Path of the SQLite file (":memory:" for a throwaway store).
+        ttl_seconds (float): Lifetime of an idle thread; 0 disables TTL eviction.
+        max_threads (int): Maximum number of threads kept; 0 disables size eviction.
+        prune_interval_seconds (float): Minimum time between two eviction passes.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        ttl_seconds: float = 7 * 24 * 3600,
+        max_threads: int = 10000,
+        prune_interval_seconds: float = 60,
+    ):
+        super().__init__()
+        self.ttl_seconds = ttl_seconds
+        self.max_threads = max_threads
+        self.prune_interval_seconds = prune_interval_seconds
+        self._last_prune = 0.0
+        self._lock = threading.Lock()
+        # Several worker processes may share the file; wait for each other's write locks
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS threads (
+                thread_id TEXT PRIMARY KEY,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS threads_updated_at ON threads (updated_at);
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                thread_id TEXT NOT NULL,
+                checkpoint_ns TEXT NOT NULL DEFAULT '',
+                checkpoint_id TEXT NOT NULL,
+                parent_checkpoint_id TEXT,
+                type TEXT,
+                checkpoint BLOB,
+                metadata_type TEXT,
+                metadata BLOB,
+                PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+            );
+            CREATE TABLE IF NOT EXISTS writes (
+                thread_id TEXT NOT NULL,
+                checkpoint_ns TEXT NOT NULL DEFAULT '',
+                checkpoint_id TEXT NOT NULL,
+                task_id TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                channel TEXT NOT NULL,
+                type TEXT,
+                value BLOB,
+                task_path TEXT NOT NULL DEFAULT '',
+                PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+            );
+            """
+        )
+        self._conn.commit()
+
+    # ------------------------------------------------------------------ helpers
+
+    def _is_expired(self, thread_id: str) -> bool:
+        """
+        Returns True if the thread exists but is older than the TTL (or does not exist).
+        """
+        row = self._conn.execute(
+            "SELECT updated_at FROM threads WHERE thread_id = ?", (thread_id,)
+        ).fetchone()
+        if row is None:
+            return True
+        return bool(self.ttl_seconds) and row[0] < time.time() - self.ttl_seconds
+
+    def _touch(self, thread_id: str) -> None:
+        """
+        Marks the thread as recently used and prunes old threads if it is time to.
+        """
+        now = time.time()
+        self._conn.execute(
+            "INSERT INTO threads (thread_id, updated_at) VALUES (?, ?) "
+            "ON CONFLICT(thread_id) DO UPDATE SET updated_at = excluded.updated_at",
+            (thread_id, now),
+        )
+        if now - self._last_prune >= self.prune_interval_seconds:
+            self._last_prune = now
+            self._prune(now)
+
+    def _prune(self, now: float) -> None:
+        """
+        Deletes threads past their TTL and the least recently updated threads beyond `max_threads`.
+        """
+        stale: List[str] = []
+        if self.ttl_seconds:
+            stale += [
+                row[0] for row in self._conn.execute(
+                    "SELECT thread_id FROM threads WHERE updated_at < ?", (now - self.ttl_seconds,)
+                )
+            ]
+        if self.max_threads:
+            stale += [
+                row[0] for row in self._conn.execute(
+                    "SELECT thread_id FROM threads ORDER BY updated_at DESC LIMIT -1 OFFSET ?",
+                    (self.max_threads,),
+                )
+            ]
+        for thread_id in set(stale):
+            self._delete(thread_id)
+
+    def _delete(self, thread_id: str) -> None:
+        """
+        Removes every row belonging to a thread.
+        """
+        for table in ("writes", "checkpoints", "threads"):
+            self._conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+
+    def _load_tuple(self, thread_id: str, checkpoint_ns: str, row: Tuple) -> CheckpointTuple:
+        """
+        Builds a CheckpointTuple from a `checkpoints` row plus its pending writes.
+        """
+        checkpoint_id, parent_checkpoint_id, type_, checkpoint, metadata_type, metadata = row
+        writes = self._conn.execute(
+            "SELECT task_id, channel, type, value FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint=self.serde.loads_typed((type_, checkpoint)),
+            metadata=self.serde.loads_typed((metadata_type, metadata)),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_checkpoint_id,
+                    }
+                }
+                if parent_checkpoint_id
+                else None
+            ),
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed((value_type, value)))
+                for task_id, channel, value_type, value in writes
+            ],
+        )
+
+    # ------------------------------------------------------------- sync API
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """
+        Returns the requested checkpoint, or the latest one for the thread.
+        """
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config)
+        with self._lock:
+            if self._is_expired(thread_id):
+                return None
+            query = (
+                "SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata "
+                "FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?"
+            )
+            params: Tuple = (thread_id, checkpoint_ns)
+            if checkpoint_id:
+                query += " AND checkpoint_id = ?"
+                params += (checkpoint_id,)
+            else:
+                query += " ORDER BY checkpoint_id DESC LIMIT 1"
+            row = self._conn.execute(query, params).fetchone()
+            if row is None:
+                return None
+            return self._load_tuple(thread_id, checkpoint_ns, row)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        """
+        Lists checkpoints, newest first, optionally restricted to one thread / namespace.
+        """
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, "
+            "metadata_type, metadata FROM checkpoints"
+        )
+        clauses: List[str] = []
+        params: List[Any] = []
+        if config is not None:
+            configurable = config["configurable"]
+            clauses.append("thread_id = ?")
+            params.append(configurable["thread_id"])
+            if configurable.get("checkpoint_ns") is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(configurable["checkpoint_ns"])
+            if get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(get_checkpoint_id(config))
+        if before is not None and get_checkpoint_id(before):
+            clauses.append("checkpoint_id < ?")
+            params.append(get_checkpoint_id(before))
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY checkpoint_id DESC"
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+            results: List[CheckpointTuple] = []
+            for thread_id, checkpoint_ns, *row in rows:
+                if self._is_expired(thread_id):
+                    continue
+                item = self._load_tuple(thread_id, checkpoint_ns, tuple(row))
+                if filter and not all(item.metadata.get(k) == v for k, v in filter.items()):
+                    continue
+                results.append(item)
+                if limit is not None and len(results) >= limit:
+                    break
+        yield from results
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """
+        Stores a checkpoint and returns the config pointing at it.
+        """
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        type_, serialized_checkpoint = self.serde.dumps_typed(checkpoint)
+        metadata_type, serialized_metadata = self.serde.dumps_typed(metadata)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (thread_id, checkpoint_ns, checkpoint_id, "
+                "parent_checkpoint_id, type, checkpoint, metadata_type, metadata) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint["id"],
+                    configurable.get("checkpoint_id"),
+                    type_,
+                    serialized_checkpoint,
+                    metadata_type,
+                    serialized_metadata,
+                ),
+            )
+            self._touch(thread_id)
+            self._conn.commit()
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """
+        Stores the intermediate writes produced by a task for a checkpoint.
+        """
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        checkpoint_id = configurable["checkpoint_id"]
+        # Special channels (errors, interrupts) replace earlier writes; regular ones are write-once
+        verb = "INSERT OR REPLACE" if all(w[0] in WRITES_IDX_MAP for w in writes) else "INSERT OR IGNORE"
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            value_type, serialized_value = self.serde.dumps_typed(value)
+            rows.append((
+                thread_id,
+                checkpoint_ns,
+                checkpoint_id,
+                task_id,
+                WRITES_IDX_MAP.get(channel, idx),
+                channel,
+                value_type,
+                serialized_value,
+                task_path,
+            ))
+        with self._lock:
+            self._conn.executemany(
+                f"{verb} INTO writes (thread_id, checkpoint_ns, checkpoint_id, task_id, idx, "
+                "channel, type, value, task_path) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def delete_thread(self, thread_id: str) -> None:
+        """
+        Deletes every checkpoint and write stored for a thread.
+        """
+        with self._lock:
+            self._delete(thread_id)
+            self._conn.commit()
+
+    def get_next_version(self, current: Optional[Any], channel: Any) -> str:
+        """
+        Returns a monotonically increasing, lexically sortable channel version.
+        """
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(str(current).split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    # ------------------------------------------------------------ async API
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+
+class KeyValueCheckpointSaver(BaseCheckpointSaver):
+    """
+    LangGraph checkpointer on top of a StateBackend, for deployments whose workers run on
+    several hosts (e.g. STATE_BACKEND=redis).
+
+    Layout, per thread and namespace:
+        checkpoint:{thread}:namespaces           JSON list of namespaces of the thread
+        checkpoint:{thread}:{ns}:index           JSON list of checkpoint ids, oldest first
+        checkpoint:{thread}:{ns}:{id}            the checkpoint, its metadata and parent id
+        checkpoint-writes:{thread}:{ns}:{id}     pending writes of that checkpoint
+
+    Every key expires `ttl_seconds` after it was last written, which bounds the store
+    (there is no thread-count limit; configure eviction on the server instead). Index
+    updates are read-modify-write: safe because one thread is only ever advanced by one
+    run at a time, and serialized within the process by a lock.
+
+    Args:
+        backend (StateBackend): Shared key-value store.
+        ttl_seconds (float): Lifetime of an idle thread; 0 keeps threads forever.
+    """
+
+    def __init__(self, backend: StateBackend, ttl_seconds: float = 7 * 24 * 3600):
+        super().__init__()
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------ helpers
+
+    @staticmethod
+    def _key(thread_id: str, checkpoint_ns: str, suffix: str, kind: str = "checkpoint") -> str:
+        return f"{kind}:{thread_id}:{checkpoint_ns}:{suffix}"
+
+    def _append(self, key: str, item: str) -> None:
+        """
+        Appends `item` to the JSON list under `key` unless it is already there.
+        """
+        items = self.backend.get_json(key) or []
+        if item not in items:
+            items.append(item)
+        self.backend.set_json(key, items, self.ttl_seconds)
+
+    def _load_tuple(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> Optional[CheckpointTuple]:
+        """
+        Builds a CheckpointTuple from the stored checkpoint and its pending writes.
+        """
+        stored = self.backend.get_json(self._key(thread_id, checkpoint_ns, checkpoint_id))
+        if stored is None:
+            return None
+        writes = self.backend.get_json(self._key(thread_id, checkpoint_ns, checkpoint_id, "checkpoint-writes")) or []
+        writes.sort(key=lambda write: (write["task_id"], write["idx"]))
+        parent_checkpoint_id = stored["parent_checkpoint_id"]
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint=self.serde.loads_typed((stored["type"], base64.b64decode(stored["checkpoint"]))),
+            metadata=self.serde.loads_typed((stored["metadata_type"], base64.b64decode(stored["metadata"]))),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_checkpoint_id,
+                    }
+                }
+                if parent_checkpoint_id
+                else None
+            ),
+            pending_writes=[
+                (write["task_id"], write["channel"], self.serde.loads_typed((write["type"], base64.b64decode(write["value"]))))
+                for write in writes
+            ],
+        )
+
+    # ------------------------------------------------------------- sync API
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """
+        Returns the requested checkpoint, or the latest one for the thread.
+        """
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config)
+        if not checkpoint_id:
+            index = self.backend.get_json(self._key(thread_id, checkpoint_ns, "index")) or []
+            if not index:
+                return None
+            checkpoint_id = max(index)
+        return self._load_tuple(thread_id, checkpoint_ns, checkpoint_id)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        """
+        Lists the checkpoints of one thread, newest first. Listing across all threads
+        would need a scan of the whole store and is not supported.
+        """
+        if config is None:
+            raise ValueError("KeyValueCheckpointSaver.list requires a config with a thread_id")
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        if configurable.get("checkpoint_ns") is not None:
+            namespaces = [configurable["checkpoint_ns"]]
+        else:
+            namespaces = self.backend.get_json(f"checkpoint:{thread_id}:namespaces") or []
+
+        candidates: List[Tuple[str, str]] = []
+        for checkpoint_ns in namespaces:
+            index = self.backend.get_json(self._key(thread_id, checkpoint_ns, "index")) or []
+            candidates += [(checkpoint_id, checkpoint_ns) for checkpoint_id in index]
+        if get_checkpoint_id(config):
+            candidates = [item for item in candidates if item[0] == get_checkpoint_id(config)]
+        if before is not None and get_checkpoint_id(before):
+            candidates = [item for item in candidates if item[0] < get_checkpoint_id(before)]
+
+        returned = 0
+        for checkpoint_id, checkpoint_ns in sorted(candidates, reverse=True):
+            item = self._load_tuple(thread_id, checkpoint_ns, checkpoint_id)
+            # Older checkpoints may have expired individually
+            if item is None:
+                continue
+            if filter and not all(item.metadata.get(k) == v for k, v in filter.items()):
+                continue
+            yield item
+            returned += 1
+            if limit is not None and returned >= limit:
+                break
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """
+        Stores a checkpoint and returns the config pointing at it.
+        """
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        type_, serialized_checkpoint = self.serde.dumps_typed(checkpoint)
+        metadata_type, serialized_metadata = self.serde.dumps_typed(metadata)
+        with self._lock:
+            self.backend.set_json(
+                self._key(thread_id, checkpoint_ns, checkpoint["id"]),
+                {
+                    "parent_checkpoint_id": configurable.get("checkpoint_id"),
+                    "type": type_,
+                    "checkpoint": _b64(serialized_checkpoint),
+                    "metadata_type": metadata_type,
+                    "metadata": _b64(serialized_metadata),
+                },
+                self.ttl_seconds,
+            )
+            # Index last, so readers never see an id whose checkpoint is not stored yet
+            self._append(self._key(thread_id, checkpoint_ns, "index"), checkpoint["id"])
+            self._append(f"checkpoint:{thread_id}:namespaces", checkpoint_ns)
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """
+        Stores the intermediate writes produced by a task for a checkpoint.
+        """
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        key = self._key(thread_id, checkpoint_ns, configurable["checkpoint_id"], "checkpoint-writes")
+        # Special channels (errors, interrupts) replace earlier writes; regular ones are write-once
+        replace = all(w[0] in WRITES_IDX_MAP for w in writes)
+        with self._lock:
+            stored = {(write["task_id"], write["idx"]): write for write in self.backend.get_json(key) or []}
+            for idx, (channel, value) in enumerate(writes):
+                write_idx = WRITES_IDX_MAP.get(channel, idx)
+                if (task_id, write_idx) in stored and not replace:
+                    continue
+                value_type, serialized_value = self.serde.dumps_typed(value)
+                stored[(task_id, write_idx)] = {
+                    "task_id": task_id,
+                    "idx": write_idx,
+                    "channel": channel,
+                    "type": value_type,
+                    "value": _b64(serialized_value),
+                    "task_path": task_path,
+                }
+            self.backend.set_json(key, list(stored.values()), self.ttl_seconds)
+
+    def delete_thread(self, thread_id: str) -> None:
+        """
+        Deletes every checkpoint and write stored for a thread.
+        """
+        with self._lock:
+            for checkpoint_ns in self.backend.get_json(f"checkpoint:{thread_id}:namespaces") or []:
+                for checkpoint_id in self.backend.get_json(self._key(thread_id, checkpoint_ns, "index")) or []:
+                    self.backend.delete(self._key(thread_id, checkpoint_ns, checkpoint_id))
+                    self.backend.delete(self._key(thread_id, checkpoint_ns, checkpoint_id, "checkpoint-writes"))
+                self.backend.delete(self._key(thread_id, checkpoint_ns, "index"))
+            self.backend.delete(f"checkpoint:{thread_id}:namespaces")
+
+    get_next_version = SQLiteCheckpointSaver.get_next_version
+
+    # ------------------------------------------------------------ async API
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
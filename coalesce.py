@@ -0,0 +1,150 @@
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+import asyncio
+import hashlib
+
+from nodes.chunking import normalize_whitespace
+from state_backend import StateBackend
+
+
+T = TypeVar("T")
+
+
+def coalesce_key(resume_text: str, *options: Any) -> str:
+    """
+    Builds the coalescing key for an analysis request.
+
+    The resume text is whitespace-normalized so trivially different uploads of the same
+    resume share one run; options that change the output (e.g. extraction mode) are part
+    of the key.
+    """
+    payload = "\x1f".join([normalize_whitespace(resume_text)] + [str(option) for option in options])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one in-flight execution.
+
+    The first caller (the leader) starts the work; callers arriving while it is running
+    (followers) await the same result. The work is shielded from cancellation, so a
+    leader whose client disconnects does not abort the run for its followers. Keys are
+    forgotten as soon as the run finishes, so this is not a result cache.
+
+    With a `backend`, runs are also coalesced across worker processes: the leader takes a
+    lease on the key in the shared store and renews it while running, then publishes its
+    result there for `result_ttl_seconds`. A caller in another process that finds the lease
+    taken polls for that result instead of starting its own run. If the lease lapses
+    without a result (the leader failed or died), the next caller to take it runs the work.
+
+    Args:
+        backend (Optional[StateBackend]): Shared store for cross-process leases; None coalesces in-process only.
+        lease_seconds (float): Lifetime of a lease between two renewals.
+        poll_interval_seconds (float): How often a remote follower checks for the result.
+        result_ttl_seconds (float): How long a published result stays available to followers.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[StateBackend] = None,
+        lease_seconds: float = 30,
+        poll_interval_seconds: float = 0.25,
+        result_ttl_seconds: float = 60,
+    ):
+        self.backend = backend
+        self.lease_seconds = lease_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self.result_ttl_seconds = result_ttl_seconds
+        self._in_flight: Dict[str, "asyncio.Future[Any]"] = {}
+        self._stats = {"leaders": 0, "followers": 0, "remote_followers": 0}
+
+    async def run(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[T]],
+        dumps: Optional[Callable[[T], str]] = None,
+        loads: Optional[Callable[[str], T]] = None,
+    ) -> Tuple[T, bool]:
+        """
+        Runs `factory()` once per key among concurrent callers.
+
+        Args:
+            key (str): Identity of the work (see `coalesce_key`).
+            factory (Callable[[], Awaitable[T]]): Starts the work; only called by the leader.
+            dumps (Optional[Callable[[T], str]]): Serializes the result for other processes.
+            loads (Optional[Callable[[str], T]]): Restores a result published by another process.
+                                                  Without dumps / loads, coalescing stays in-process.
+
+        Returns:
+            Tuple[T, bool]: The result and whether it was shared from another caller's run.
+        """
+        future = self._in_flight.get(key)
+        if future is not None:
+            self._stats["followers"] += 1
+            result, _ = await asyncio.shield(future)
+            return result, True
+
+        if self.backend is not None and dumps is not None and loads is not None:
+            future = asyncio.ensure_future(self._run_shared(key, factory, dumps, loads))
+        else:
+            self._stats["leaders"] += 1
+            future = asyncio.ensure_future(self._run_local(factory))
+        self._in_flight[key] = future
+
+        def forget(done: "asyncio.Future[Any]") -> None:
+            if self._in_flight.get(key) is done:
+                del self._in_flight[key]
+
+        future.add_done_callback(forget)
+        return await asyncio.shield(future)
+
+    @staticmethod
+    async def _run_local(factory: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        return await factory(), False
+
+    async def _run_shared(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[T]],
+        dumps: Callable[[T], str],
+        loads: Callable[[str], T],
+    ) -> Tuple[T, bool]:
+        """
+        Leads the run under a lease in the shared store, or waits for another process's result.
+        """
+        lease_key, result_key = f"coalesce:{key}:lease", f"coalesce:{key}:result"
+        while True:
+            if await self.backend.aadd(lease_key, "1", self.lease_seconds):
+                self._stats["leaders"] += 1
+                # A result left over from an earlier run must not be mistaken for this run's
+                await self.backend.adelete(result_key)
+                renew = asyncio.ensure_future(self._renew(lease_key))
+                try:
+                    result = await factory()
+                    await self.backend.aset(result_key, dumps(result), self.result_ttl_seconds)
+                    return result, False
+                finally:
+                    renew.cancel()
+                    await self.backend.adelete(lease_key)
+
+            # Another process holds the lease: wait for its result while the lease is alive
+            while await self.backend.aget(lease_key) is not None:
+                await asyncio.sleep(self.poll_interval_seconds)
+            published = await self.backend.aget(result_key)
+            if published is not None:
+                self._stats["remote_followers"] += 1
+                return loads(published), True
+
+    async def _renew(self, lease_key: str) -> None:
+        """
+        Keeps a lease alive while its run is in progress.
+        """
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            await self.backend.aset(lease_key, "1", self.lease_seconds)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the number of runs in flight in this process and how many callers led a run,
+        joined one in this process (followers) or in another process (remote_followers).
+        """
+        return {"in_flight": len(self._in_flight), **self._stats}
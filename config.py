@@ -0,0 +1,221 @@
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from dotenv import load_dotenv
+
+# Load variables from a local .env file (e.g. GROQ_API_KEY) before reading settings
+load_dotenv()
+
+
+def _env_str(name: str, default: str = "") -> str:
+    """
+    Reads a string setting from the environment, stripping surrounding whitespace.
+    """
+    return os.getenv(name, default).strip()
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """
+    Reads a boolean setting from the environment ("1", "true", "yes", "on" are truthy).
+    """
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_int(name: str, default: int) -> int:
+    """
+    Reads an integer setting from the environment.
+    """
+    value = os.getenv(name)
+    return int(value) if value and value.strip() else default
+
+
+def _env_float(name: str, default: float) -> float:
+    """
+    Reads a float setting from the environment.
+    """
+    value = os.getenv(name)
+    return float(value) if value and value.strip() else default
+
+
+def _env_list(name: str, default: str = "") -> List[str]:
+    """
+    Reads a comma-separated list setting from the environment.
+    """
+    return [item.strip() for item in os.getenv(name, default).split(",") if item.strip()]
+
+
+def _env_int_map(name: str, default: str = "") -> Dict[str, int]:
+    """
+    Reads a comma-separated list of key=integer pairs (e.g. "a=1,b=2") from the environment.
+    """
+    pairs = (item.split("=", 1) for item in _env_list(name, default) if "=" in item)
+    return {key.strip(): int(value) for key, value in pairs}
+
+
+def _env_str_map(name: str, default: str = "") -> Dict[str, str]:
+    """
+    Reads a comma-separated list of key=value pairs (e.g. "a=x,b=y") from the environment.
+    """
+    pairs = (item.split("=", 1) for item in _env_list(name, default) if "=" in item)
+    return {key.strip(): value.strip() for key, value in pairs}
+
+
+def _env_price_map(name: str, default: str = "") -> Dict[str, Tuple[float, float]]:
+    """
+    Reads per-model prices as comma-separated model=input/output pairs
+    (e.g. "model-a=0.05/0.08,model-b=0.2/0.2") from the environment.
+    """
+    prices = {}
+    for model, value in _env_str_map(name, default).items():
+        input_price, _, output_price = value.partition("/")
+        prices[model] = (float(input_price or 0), float(output_price or input_price or 0))
+    return prices
+
+
+@dataclass
+class Settings:
+    """
+    Central configuration for the resume analysis service.
+
+    Every value is read from the environment (or the .env file) once at import time,
+    so all modules share a single source of truth.
+
+    Attributes:
+        groq_api_key (str): API key for the Groq platform.
+        llm_model (str): Default (strong) model; the last tier of every node's routing.
+        llm_fast_model (str): Faster, cheaper model tried first by the nodes in `llm_fast_nodes`;
+                              its output is escalated to `llm_model` if it fails validation or the
+                              node's quality check. Empty (the default) disables tiered routing.
+        llm_fast_nodes (List[str]): Nodes routed through the fast model first.
+        llm_fast_streaming (bool): Also route streamed calls (SSE entries and summary tokens) through
+                                   the fast model. Its output is held back until accepted, so entries
+                                   then arrive only when the call ends; off by default, so streamed
+                                   calls go straight to `llm_model` and stream live.
+        llm_node_models (Dict[str, str]): Per-node model overrides; a node listed here always
+                                          uses that single model, without tiering.
+        llm_timeout_seconds (float): Per-request HTTP timeout for LLM calls.
+        llm_max_retries (int): Retries performed by the Groq client itself (the scheduler retries too).
+        llm_max_connections (int): Size of the shared HTTP connection pool.
+        llm_max_keepalive_connections (int): Idle connections kept open for reuse.
+        llm_keepalive_expiry_seconds (float): How long an idle connection is kept.
+        llm_rpm (float): Requests-per-minute budget for outbound LLM calls; 0 disables the limit.
+        llm_tpm (float): Tokens-per-minute budget for outbound LLM calls; 0 disables the limit.
+        llm_max_concurrency (int): Maximum LLM requests in flight at once.
+        llm_expected_output_tokens (int): Completion tokens reserved per call before usage is known.
+        llm_retry_attempts (int): Scheduler retries for 429 / 5xx / transient network errors.
+        llm_retry_base_delay (float): First backoff delay in seconds (doubled per attempt, jittered).
+        llm_retry_max_delay (float): Upper bound of a single backoff delay.
+        llm_cache_enabled (bool): Master switch for the LLM response cache.
+        llm_cache_max_entries (int): Maximum number of responses kept in the in-process LRU.
+        llm_cache_ttl_seconds (float): Lifetime of a cached response in both tiers.
+        llm_cache_db_path (str): SQLite file for the persistent tier; empty disables it.
+        llm_cache_disabled_nodes (List[str]): Node names that always bypass the cache.
+        batch_concurrency (int): Default number of resumes processed at once by /analyze-resumes.
+        batch_max_concurrency (int): Upper bound for a client-requested batch concurrency.
+        batch_max_items (int): Maximum number of resumes accepted in one batch request.
+        extraction_mode (str): Default extraction mode, "split" (two parallel calls) or "combined" (one call).
+        graph_topology (str): "linear" (insights from the summary) or "parallel" (insights from the
+                              structured data, generated alongside the summary).
+        extraction_chunk_tokens (int): Approximate token budget of one resume chunk sent to extraction.
+        rule_extraction_enabled (bool): Try the deterministic rule-based extractor before the LLM.
+        rule_extraction_min_confidence (float): Confidence at or above which rule results skip the LLM.
+        coalesce_enabled (bool): Let concurrent identical analyses share one pipeline run.
+        checkpoint_db_path (str): SQLite file holding LangGraph checkpoints.
+        checkpoint_ttl_seconds (float): Idle lifetime of a checkpointed thread; 0 keeps threads forever.
+        checkpoint_max_threads (int): Maximum number of checkpointed threads; 0 means unbounded.
+        state_backend (str): Store shared by all worker processes for checkpoints, the LLM cache,
+                             coalescing leases and deferred-run status: "sqlite" (one host) or "redis".
+        state_db_path (str): SQLite file of the "sqlite" state backend.
+        redis_url (str): Server of the "redis" state backend.
+        state_key_prefix (str): Prefix of every key the "redis" backend writes.
+        coalesce_lease_seconds (float): Lifetime of a cross-process coalescing lease; the leader
+                                        renews it while running, so it only matters if the leader dies.
+        llm_cost_per_1k_input_tokens (float): Price of 1,000 prompt tokens, used for the cost metric.
+        llm_cost_per_1k_output_tokens (float): Price of 1,000 completion tokens, used for the cost metric.
+        llm_model_prices (Dict[str, Tuple[float, float]]): Per-model (input, output) prices of 1,000
+                                                           tokens; models not listed use the two
+                                                           settings above.
+        request_timing_log (bool): Log one structured JSON line with per-node timings for each request.
+        upload_max_bytes (int): Largest file accepted by /analyze-resume-file.
+        upload_max_pages (int): Largest PDF page count accepted by /analyze-resume-file.
+        file_extraction_workers (int): Processes that extract text from uploaded files.
+        file_extraction_timeout_seconds (float): Time limit for extracting the text of one file.
+        candidate_store_enabled (bool): Save every finished analysis to the searchable candidate store.
+        candidate_db_path (str): SQLite file of the candidate store.
+        prompt_token_budgets (Dict[str, int]): Per-node token budget for the data embedded in a prompt
+                                               (structured records, insights); descriptions are
+                                               truncated by priority to fit.
+    """
+    groq_api_key: str = field(default_factory=lambda: _env_str("GROQ_API_KEY"))
+    llm_model: str = field(default_factory=lambda: _env_str("LLM_MODEL", "gemma2-9b-it"))
+    llm_fast_model: str = field(default_factory=lambda: _env_str("LLM_FAST_MODEL", ""))
+    llm_fast_nodes: List[str] = field(default_factory=lambda: _env_list(
+        "LLM_FAST_NODES", "extract_work,extract_education,extract_combined,extract_insights,generate_questions"
+    ))
+    llm_fast_streaming: bool = field(default_factory=lambda: _env_bool("LLM_FAST_STREAMING", False))
+    llm_node_models: Dict[str, str] = field(default_factory=lambda: _env_str_map("LLM_NODE_MODELS"))
+    llm_timeout_seconds: float = field(default_factory=lambda: _env_float("LLM_TIMEOUT_SECONDS", 60))
+    llm_max_retries: int = field(default_factory=lambda: _env_int("LLM_MAX_RETRIES", 0))
+    llm_max_connections: int = field(default_factory=lambda: _env_int("LLM_MAX_CONNECTIONS", 50))
+    llm_max_keepalive_connections: int = field(default_factory=lambda: _env_int("LLM_MAX_KEEPALIVE_CONNECTIONS", 20))
+    llm_keepalive_expiry_seconds: float = field(default_factory=lambda: _env_float("LLM_KEEPALIVE_EXPIRY_SECONDS", 30))
+
+    llm_rpm: float = field(default_factory=lambda: _env_float("LLM_RPM", 30))
+    llm_tpm: float = field(default_factory=lambda: _env_float("LLM_TPM", 15000))
+    llm_max_concurrency: int = field(default_factory=lambda: _env_int("LLM_MAX_CONCURRENCY", 16))
+    llm_expected_output_tokens: int = field(default_factory=lambda: _env_int("LLM_EXPECTED_OUTPUT_TOKENS", 512))
+    llm_retry_attempts: int = field(default_factory=lambda: _env_int("LLM_RETRY_ATTEMPTS", 4))
+    llm_retry_base_delay: float = field(default_factory=lambda: _env_float("LLM_RETRY_BASE_DELAY", 1.0))
+    llm_retry_max_delay: float = field(default_factory=lambda: _env_float("LLM_RETRY_MAX_DELAY", 30.0))
+
+    llm_cache_enabled: bool = field(default_factory=lambda: _env_bool("LLM_CACHE_ENABLED", True))
+    llm_cache_max_entries: int = field(default_factory=lambda: _env_int("LLM_CACHE_MAX_ENTRIES", 1024))
+    llm_cache_ttl_seconds: float = field(default_factory=lambda: _env_float("LLM_CACHE_TTL_SECONDS", 24 * 3600))
+    llm_cache_db_path: str = field(default_factory=lambda: _env_str("LLM_CACHE_DB_PATH"))
+    llm_cache_disabled_nodes: List[str] = field(default_factory=lambda: _env_list("LLM_CACHE_DISABLED_NODES"))
+
+    batch_concurrency: int = field(default_factory=lambda: _env_int("BATCH_CONCURRENCY", 4))
+    batch_max_concurrency: int = field(default_factory=lambda: _env_int("BATCH_MAX_CONCURRENCY", 16))
+    batch_max_items: int = field(default_factory=lambda: _env_int("BATCH_MAX_ITEMS", 500))
+
+    extraction_mode: str = field(default_factory=lambda: _env_str("EXTRACTION_MODE", "split"))
+    graph_topology: str = field(default_factory=lambda: _env_str("GRAPH_TOPOLOGY", "linear"))
+    extraction_chunk_tokens: int = field(default_factory=lambda: _env_int("EXTRACTION_CHUNK_TOKENS", 3000))
+    rule_extraction_enabled: bool = field(default_factory=lambda: _env_bool("RULE_EXTRACTION_ENABLED", True))
+    rule_extraction_min_confidence: float = field(default_factory=lambda: _env_float("RULE_EXTRACTION_MIN_CONFIDENCE", 0.9))
+    coalesce_enabled: bool = field(default_factory=lambda: _env_bool("COALESCE_ENABLED", True))
+
+    checkpoint_db_path: str = field(default_factory=lambda: _env_str("CHECKPOINT_DB_PATH", "checkpoints.sqlite3"))
+    checkpoint_ttl_seconds: float = field(default_factory=lambda: _env_float("CHECKPOINT_TTL_SECONDS", 7 * 24 * 3600))
+    checkpoint_max_threads: int = field(default_factory=lambda: _env_int("CHECKPOINT_MAX_THREADS", 10000))
+
+    state_backend: str = field(default_factory=lambda: _env_str("STATE_BACKEND", "sqlite"))
+    state_db_path: str = field(default_factory=lambda: _env_str("STATE_DB_PATH", "state.sqlite3"))
+    redis_url: str = field(default_factory=lambda: _env_str("REDIS_URL", "redis://localhost:6379/0"))
+    state_key_prefix: str = field(default_factory=lambda: _env_str("STATE_KEY_PREFIX", "resume-analysis:"))
+    coalesce_lease_seconds: float = field(default_factory=lambda: _env_float("COALESCE_LEASE_SECONDS", 30))
+
+    llm_cost_per_1k_input_tokens: float = field(default_factory=lambda: _env_float("LLM_COST_PER_1K_INPUT_TOKENS", 0.0))
+    llm_cost_per_1k_output_tokens: float = field(default_factory=lambda: _env_float("LLM_COST_PER_1K_OUTPUT_TOKENS", 0.0))
+    llm_model_prices: Dict[str, Tuple[float, float]] = field(default_factory=lambda: _env_price_map("LLM_MODEL_PRICES"))
+    request_timing_log: bool = field(default_factory=lambda: _env_bool("REQUEST_TIMING_LOG", False))
+
+    upload_max_bytes: int = field(default_factory=lambda: _env_int("UPLOAD_MAX_BYTES", 10 * 1024 * 1024))
+    upload_max_pages: int = field(default_factory=lambda: _env_int("UPLOAD_MAX_PAGES", 20))
+    file_extraction_workers: int = field(default_factory=lambda: _env_int("FILE_EXTRACTION_WORKERS", 2))
+    file_extraction_timeout_seconds: float = field(default_factory=lambda: _env_float("FILE_EXTRACTION_TIMEOUT_SECONDS", 30))
+
+    candidate_store_enabled: bool = field(default_factory=lambda: _env_bool("CANDIDATE_STORE_ENABLED", True))
+    candidate_db_path: str = field(default_factory=lambda: _env_str("CANDIDATE_DB_PATH", "candidates.sqlite3"))
+
+    prompt_token_budgets: Dict[str, int] = field(default_factory=lambda: _env_int_map(
+        "PROMPT_TOKEN_BUDGETS", "generate_summary=1500,extract_insights=1500,generate_questions=600"
+    ))
+
+
+# Shared settings instance used across the application
+settings = Settings()
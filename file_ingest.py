@@ -0,0 +1,294 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+import asyncio
+import multiprocessing
+import os
+import tempfile
+import threading
+import weakref
+
+from config import settings
+
+
+# Supported upload formats, by file extension
+DOCUMENT_TYPES = ("pdf", "docx", "txt")
+
+# Content types accepted when the file name has no usable extension
+_CONTENT_TYPES = {
+    "application/pdf": "pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": "docx",
+    "text/plain": "txt",
+}
+
+# Size of the pieces an upload is copied to disk in
+_COPY_CHUNK_BYTES = 1024 * 1024
+
+
+class DocumentError(ValueError):
+    """
+    An upload that cannot be turned into resume text. Carries the HTTP status code to
+    answer with (413 for size / page limits, 415 for unsupported formats, 422 otherwise).
+    """
+
+    def __init__(self, message: str, status_code: int = 422):
+        super().__init__(message)
+        self.status_code = status_code
+
+    def __reduce__(self):
+        # Keep the status code when the error is pickled back from an extraction worker
+        return type(self), (str(self), self.status_code)
+
+
+def detect_document_type(filename: Optional[str], content_type: Optional[str]) -> str:
+    """
+    Works out the document type from the file extension, falling back to the content type.
+
+    Raises:
+        DocumentError: If neither names a supported format.
+    """
+    extension = os.path.splitext(filename or "")[1].lower().lstrip(".")
+    if extension in DOCUMENT_TYPES:
+        return extension
+    kind = _CONTENT_TYPES.get((content_type or "").split(";")[0].strip().lower())
+    if kind:
+        return kind
+    raise DocumentError(
+        f"Unsupported file type '{extension or content_type}', expected one of {', '.join(DOCUMENT_TYPES)}",
+        status_code=415,
+    )
+
+
+def _pdf_text(path: str, max_pages: int) -> str:
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    if len(reader.pages) > max_pages:
+        raise DocumentError(f"PDF has {len(reader.pages)} pages, at most {max_pages} are accepted", status_code=413)
+    return "\n\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+def _docx_text(path: str) -> str:
+    from docx import Document
+
+    document = Document(path)
+    parts = [paragraph.text for paragraph in document.paragraphs]
+    # Many resume templates lay sections out in tables
+    for table in document.tables:
+        for row in table.rows:
+            parts.append(" | ".join(cell.text for cell in row.cells))
+    return "\n".join(parts)
+
+
+def extract_document_text(path: str, kind: str, max_pages: int) -> str:
+    """
+    Extracts the plain text of a PDF, DOCX or text document.
+
+    CPU-bound; runs in a worker process of the extraction pool, so it must stay a
+    module-level function and only receive picklable arguments.
+
+    Args:
+        path (str): Path of the document on disk.
+        kind (str): One of DOCUMENT_TYPES.
+        max_pages (int): Largest accepted PDF page count.
+
+    Returns:
+        str: The document text.
+
+    Raises:
+        DocumentError: If the document exceeds the page limit or cannot be read.
+    """
+    try:
+        if kind == "pdf":
+            return _pdf_text(path, max_pages)
+        if kind == "docx":
+            return _docx_text(path)
+        with open(path, "rb") as handle:
+            return handle.read().decode("utf-8", errors="replace")
+    except DocumentError:
+        raise
+    except Exception as e:
+        # Parser exceptions may not survive pickling back to the parent; send a plain message
+        raise DocumentError(f"Could not read {kind.upper()} file: {e}") from None
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+# Pools whose workers were killed on purpose (after a timeout); their other jobs are retried
+_killed_pools: "weakref.WeakSet[ProcessPoolExecutor]" = weakref.WeakSet()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """
+    Returns the shared extraction pool, creating it on first use.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a process that runs an event loop and threads is not safe
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.file_extraction_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def _kill_workers(pool: ProcessPoolExecutor) -> None:
+    """
+    Kills the worker processes of `pool`, stopping whatever they are parsing.
+    """
+    kill_workers = getattr(pool, "kill_workers", None)
+    if kill_workers is not None:
+        # Python 3.14+
+        kill_workers()
+        return
+    for process in list((getattr(pool, "_processes", None) or {}).values()):
+        process.kill()
+
+
+def _retire_pool(pool: ProcessPoolExecutor, kill: bool) -> None:
+    """
+    Replaces `pool` with a fresh one on next use (if it is still the current pool).
+
+    With `kill`, its workers are killed first; jobs still queued or running in it then
+    fail with BrokenProcessPool and are retried on the new pool (see `_run_in_pool`).
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    if kill:
+        _killed_pools.add(pool)
+        _kill_workers(pool)
+    pool.shutdown(wait=False)
+
+
+def shutdown_extraction_pool() -> None:
+    """
+    Stops the extraction worker processes (called when the server stops).
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+async def _run_in_pool(func: Callable[..., str], *args: Any) -> str:
+    """
+    Runs `func(*args)` in the extraction pool within FILE_EXTRACTION_TIMEOUT_SECONDS.
+
+    Timing out the await does not stop the worker, so on a timeout the pool's workers are
+    killed and the pool is replaced; a slow or hostile document can therefore never hold
+    a pool slot past the limit. Other jobs caught in that pool are retried once on the new
+    pool. A worker that dies on its own (e.g. out of memory) fails only the current job.
+
+    Raises:
+        DocumentError: On a timeout (422) or a crashed worker (500), or as raised by `func`.
+    """
+    loop = asyncio.get_running_loop()
+    for attempt in range(2):
+        pool = _get_pool()
+        future = loop.run_in_executor(pool, func, *args)
+        try:
+            return await asyncio.wait_for(future, timeout=settings.file_extraction_timeout_seconds)
+        except asyncio.TimeoutError:
+            _retire_pool(pool, kill=True)
+            raise DocumentError(
+                f"Text extraction took longer than {settings.file_extraction_timeout_seconds:g} seconds",
+                status_code=422,
+            ) from None
+        except BrokenProcessPool:
+            if pool in _killed_pools and attempt == 0:
+                # Killed because another job timed out, not because of this document
+                continue
+            _retire_pool(pool, kill=False)
+            raise DocumentError("Text extraction failed: the extraction worker crashed", status_code=500) from None
+    raise DocumentError("Text extraction failed: the extraction pool was restarted", status_code=500)
+
+
+async def spool_upload(upload: Any, max_bytes: int) -> str:
+    """
+    Copies an upload to a temporary file chunk by chunk, enforcing the size cap.
+
+    Only one chunk is held in memory at a time, and the extraction worker then opens the
+    file by name instead of receiving the content.
+
+    Args:
+        upload: Async file-like object with `read(size)` (e.g. a FastAPI UploadFile).
+        max_bytes (int): Largest accepted upload.
+
+    Returns:
+        str: Path of the temporary file; the caller deletes it.
+
+    Raises:
+        DocumentError: If the upload exceeds `max_bytes`.
+    """
+    handle = tempfile.NamedTemporaryFile(prefix="resume-upload-", delete=False)
+    size = 0
+    try:
+        while True:
+            chunk = await upload.read(_COPY_CHUNK_BYTES)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_bytes:
+                raise DocumentError(f"File exceeds the {max_bytes} byte upload limit", status_code=413)
+            await asyncio.to_thread(handle.write, chunk)
+    except BaseException:
+        handle.close()
+        os.unlink(handle.name)
+        raise
+    handle.close()
+    return handle.name
+
+
+async def aextract_file_text(path: str, kind: str) -> str:
+    """
+    Extracts the text of a file on disk in the extraction process pool.
+
+    Args:
+        path (str): Path of the document.
+        kind (str): One of DOCUMENT_TYPES (see `detect_document_type`).
+
+    Returns:
+        str: The extracted text.
+
+    Raises:
+        DocumentError: Page limit exceeded, unreadable or textless document (e.g. a
+                       scanned PDF), or extraction timeout.
+    """
+    text = await _run_in_pool(extract_document_text, path, kind, settings.upload_max_pages)
+    if not text.strip():
+        raise DocumentError("No extractable text found (scanned documents need OCR first)")
+    return text
+
+
+async def aextract_upload_text(upload: Any, filename: Optional[str], content_type: Optional[str]) -> str:
+    """
+    Turns an uploaded PDF / DOCX / text file into resume text without blocking the event loop.
+
+    The upload is copied to a temporary file in chunks (size-capped; the request size was
+    already capped at ingress) and parsed from there in the bounded extraction process
+    pool, so the document is never held in memory as a whole. A large or slow document
+    only occupies a pool worker, for at most FILE_EXTRACTION_TIMEOUT_SECONDS.
+
+    Args:
+        upload: The uploaded file (async `read(size)`).
+        filename (Optional[str]): Client-side file name, used to detect the format.
+        content_type (Optional[str]): Declared content type, the fallback for detection.
+
+    Returns:
+        str: The extracted text.
+
+    Raises:
+        DocumentError: Unsupported format, size / page limit exceeded, unreadable or
+                       textless document (e.g. a scanned PDF), or extraction timeout.
+    """
+    kind = detect_document_type(filename, content_type)
+    path = await spool_upload(upload, settings.upload_max_bytes)
+    try:
+        return await aextract_file_text(path, kind)
+    finally:
+        os.unlink(path)
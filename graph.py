@@ -1,64 +1,469 @@
-from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import InMemorySaver
+from typing import Annotated, Any, Callable, Dict, List, Optional, Tuple, TypedDict
+import asyncio
+import operator
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.config import get_stream_writer
+from langgraph.graph import StateGraph, START, END
+
+from checkpoint_store import KeyValueCheckpointSaver, SQLiteCheckpointSaver
+from config import settings
+from metrics import SUMMARY_ERROR_PREFIX, instrument_node
+from state_backend import get_state_backend
 
 # Custom node functions for each processing step
-from nodes.extract_work import extract_work_experience
-from nodes.extract_education import extract_education
-from nodes.generate_summary import generate_summary
-from nodes.extract_insights import extract_insights
-from nodes.generate_questions import generate_interview_questions
+from nodes.chunking import chunk_resume, normalize_whitespace
+from nodes.fingerprint import fingerprint, section_fingerprints
+from nodes.prompt_encoding import encode_structured
+from nodes.extract_work import aextract_work_experience, merge_work_experiences
+from nodes.extract_education import aextract_education, merge_education
+from nodes.extract_combined import aextract_work_and_education
+from nodes.rule_extractor import rule_extract
+from nodes.generate_summary import agenerate_summary
+from nodes.extract_insights import aextract_insights
+from nodes.generate_questions import agenerate_interview_questions
+from nodes.llm_call import track_usage
+
+
+def _merge_usage(left: Dict[str, int], right: Dict[str, int]) -> Dict[str, int]:
+    """
+    Reducer that sums token usage reported by parallel extraction branches.
+    """
+    merged = dict(left or {})
+    for key, value in (right or {}).items():
+        merged[key] = merged.get(key, 0) + value
+    return merged
+
+
+def _merge_dicts(left: Dict[str, Any], right: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reducer that merges dicts written by parallel branches.
+    """
+    return {**(left or {}), **(right or {})}
+
+
+# Outputs a caller can request; each one depends on all the ones before it
+ANALYSIS_OUTPUTS = ("summary", "insights", "questions")
+
+
+class State(TypedDict, total=False):
+    """
+    Shared state for the LangGraph workflow.
+
+    Each key is its own channel, so parallel branches can write different
+    keys in the same step without overwriting each other.
+
+    For incremental re-analysis, 'previous' holds the outputs and fingerprints of an
+    earlier run; 'fingerprints' holds this run's section and stage-input fingerprints,
+    and 'reused_stages' lists the nodes whose previous output was reused.
+
+    'include' lists the requested outputs (see ANALYSIS_OUTPUTS); stages that no
+    requested output depends on are skipped. A missing 'include' runs everything.
+    """
+    resume_text: str
+    resume_chunks: List[str]
+    extraction_mode: str
+    include: List[str]
+    extraction_usage: Annotated[Dict[str, int], _merge_usage]
+    extraction_sources: Annotated[Dict[str, str], _merge_dicts]
+    rule_extraction: Dict[str, Any]
+    work: Dict[str, Any]
+    education: Dict[str, Any]
+    summary: str
+    insights: List[str]
+    questions: List[str]
+    error: str
+    previous: Dict[str, Any]
+    fingerprints: Annotated[Dict[str, str], _merge_dicts]
+    reused_stages: Annotated[List[str], operator.add]
+
+# Checkpoints are shared by every worker process, so a thread_id from one worker works on all
+# of them: a SQLite file on a single host (idle threads expire and the store is size-bounded),
+# otherwise the network state backend (idle threads expire)
+if settings.state_backend == "sqlite":
+    checkpointer = SQLiteCheckpointSaver(
+        settings.checkpoint_db_path,
+        ttl_seconds=settings.checkpoint_ttl_seconds,
+        max_threads=settings.checkpoint_max_threads,
+    )
+else:
+    checkpointer = KeyValueCheckpointSaver(get_state_backend(), ttl_seconds=settings.checkpoint_ttl_seconds)
+
 
-# Define the shared state type for LangGraph
-State = dict
+def _require_resume_text(state: State, node_name: str) -> str:
+    """
+    Returns the raw resume text from the state, or raises if it is missing.
+    """
+    resume_text = state.get("resume_text")
+    if not resume_text:
+        raise ValueError(f"Missing 'resume_text' in state for {node_name}")
+    return resume_text
 
-# Memory-based checkpointing for resuming workflows (in-memory only, not persistent across sessions)
-checkpointer = InMemorySaver()
 
+def _resume_chunks(state: State, node_name: str) -> List[str]:
+    """
+    Returns the preprocessed resume chunks, falling back to the raw text as a single chunk.
+    """
+    return state.get("resume_chunks") or [_require_resume_text(state, node_name)]
 
-def extract_work_and_education(state: State) -> State:
+
+async def preprocess_node(state: State) -> State:
     """
-    Node Function: Extracts work experience and education information from the resume text.
+    Node Function: Normalizes whitespace and splits the resume into section-aware chunks.
+
+    Each chunk stays within `settings.extraction_chunk_tokens`, so extraction latency
+    depends on chunk size rather than on the length of the whole document. Resumes that
+    fit the budget produce a single chunk.
+
+    When rule-based extraction is enabled, the deterministic extractor also runs here
+    (it takes microseconds) so the extraction nodes can skip the LLM for sections it
+    handled with enough confidence.
+
+    The work and education sections are also fingerprinted, so an incremental run can
+    tell which of them changed since the previous analysis.
 
     Parameters:
         state (dict): The shared state containing the raw resume text under 'resume_text'.
 
+    Returns:
+        dict: Updates state with:
+            - 'resume_chunks': The chunks in document order
+            - 'rule_extraction': Rule-based results and confidences (if enabled)
+            - 'fingerprints': Fingerprints of the document and its work / education sections
+    """
+    resume_text = normalize_whitespace(_require_resume_text(state, "preprocess_resume"))
+    if not resume_text:
+        raise ValueError("Resume text is empty after whitespace normalization")
+    update: State = {
+        "resume_chunks": chunk_resume(resume_text, settings.extraction_chunk_tokens),
+        "fingerprints": section_fingerprints(resume_text),
+    }
+    if settings.rule_extraction_enabled:
+        update["rule_extraction"] = rule_extract(resume_text)
+    return update
+
+
+def _reusable(state: State, key: str, fingerprint_key: str, current: Optional[str]) -> Optional[Any]:
+    """
+    Returns the previous run's value of `key` if the input it was computed from is unchanged,
+    i.e. the previous run's fingerprint under `fingerprint_key` equals `current`.
+
+    Missing or failed previous values are never reused, nor are extractions where some
+    chunks failed ('partial_errors'), so a rerun gets another chance at the missing entries.
+    """
+    previous = state.get("previous") or {}
+    value = previous.get(key)
+    if not current or (previous.get("fingerprints") or {}).get(fingerprint_key) != current:
+        return None
+    if not value or isinstance(value, dict) and ("error" in value or "partial_errors" in value):
+        return None
+    return value
+
+
+def _known_section(state: State, section: str) -> Optional[Tuple[Dict[str, Any], str]]:
+    """
+    Returns a 'work' or 'education' result that needs no LLM call, with its source:
+    the previous run's result if the section is unchanged ("reused"), or a confident
+    rule-based result ("rules").
+    """
+    previous = _reusable(state, section, section, (state.get("fingerprints") or {}).get(section))
+    if previous is not None:
+        return previous, "reused"
+    fast = _confident_rule_result(state, section)
+    if fast is not None:
+        return fast, "rules"
+    return None
+
+
+def _confident_rule_result(state: State, section: str) -> Optional[Dict[str, Any]]:
+    """
+    Returns the rule-based result for 'work' or 'education' if its confidence clears the threshold.
+    """
+    rules = state.get("rule_extraction")
+    if rules and rules[f"{section}_confidence"] >= settings.rule_extraction_min_confidence:
+        return rules[section]
+    return None
+
+
+def _with_rule_fallback(state: State, section: str, result: Dict[str, Any]) -> tuple:
+    """
+    Degraded mode: if the LLM extraction failed but the rules found entries, use those instead.
+
+    Returns:
+        tuple: (result, source) where source is "llm" or "rules_fallback".
+    """
+    rules = state.get("rule_extraction")
+    if "error" in result and rules and any(rules[section].values()):
+        return rules[section], "rules_fallback"
+    return result, "llm"
+
+
+def _entry_emitter(config: RunnableConfig, node: str) -> Optional[Callable[[str, Dict[str, Any]], None]]:
+    """
+    Returns an `on_entry` callback that emits each extracted entry on the "custom" stream
+    as {"event": "entry", "node", "section", "entry"}, if the run was configured with
+    `stream_entries=True`; otherwise None (extraction then uses a plain, non-streaming call).
+    """
+    if not config.get("configurable", {}).get("stream_entries"):
+        return None
+    writer = get_stream_writer()
+
+    def on_entry(key: str, entry: Dict[str, Any]) -> None:
+        section = "work" if key == "work_experiences" else "education"
+        writer({"event": "entry", "node": node, "section": section, "entry": entry})
+
+    return on_entry
+
+
+async def work_node(state: State, config: RunnableConfig) -> State:
+    """
+    Node Function: Extracts work experience information from the resume text.
+
+    Runs as a parallel branch next to `education_node`; errors are reported
+    under 'work' without affecting the education branch. Chunks are extracted
+    concurrently and their entries merged and deduplicated. An unchanged work section
+    (incremental run) or a confident rule-based result skips the LLM entirely; the
+    rule-based result is also used as a fallback if the LLM call fails.
+
+    With `stream_entries=True`, each entry is emitted on the "custom" stream as soon
+    as the model has finished writing it (see `_entry_emitter`).
+
+    Parameters:
+        state (dict): The shared state containing 'resume_chunks' (or 'resume_text').
+        config (RunnableConfig): Run configuration; reads 'stream_entries' from 'configurable'.
+
     Returns:
         dict: Updates state with:
             - 'work': Extracted work experience data
+    """
+    known = _known_section(state, "work")
+    if known is not None:
+        work, source = known
+        return {"work": work, "extraction_sources": {"work": source}}
+
+    chunks = _resume_chunks(state, "extract_work")
+    with track_usage() as usage:
+        on_entry = _entry_emitter(config, "extract_work")
+        results = await asyncio.gather(*(aextract_work_experience(chunk, on_entry) for chunk in chunks))
+    work, source = _with_rule_fallback(state, "work", merge_work_experiences(list(results)))
+    return {"work": work, "extraction_usage": usage, "extraction_sources": {"work": source}}
+
+
+async def education_node(state: State, config: RunnableConfig) -> State:
+    """
+    Node Function: Extracts education information from the resume text.
+
+    Runs as a parallel branch next to `work_node`; errors are reported
+    under 'education' without affecting the work branch. Chunks are extracted
+    concurrently and their entries merged and deduplicated. An unchanged education
+    section (incremental run) or a confident rule-based result skips the LLM entirely;
+    the rule-based result is also used as a fallback if the LLM call fails.
+
+    With `stream_entries=True`, each entry is emitted on the "custom" stream as soon
+    as the model has finished writing it.
+
+    Parameters:
+        state (dict): The shared state containing 'resume_chunks' (or 'resume_text').
+        config (RunnableConfig): Run configuration; reads 'stream_entries' from 'configurable'.
+
+    Returns:
+        dict: Updates state with:
             - 'education': Extracted education data
     """
-    resume_text = state.get("resume_text")
-    if not resume_text:
-        raise ValueError("Missing 'resume_text' in state for extract_work_and_education")
+    known = _known_section(state, "education")
+    if known is not None:
+        education, source = known
+        return {"education": education, "extraction_sources": {"education": source}}
 
+    chunks = _resume_chunks(state, "extract_education")
+    with track_usage() as usage:
+        on_entry = _entry_emitter(config, "extract_education")
+        results = await asyncio.gather(*(aextract_education(chunk, on_entry) for chunk in chunks))
+    education, source = _with_rule_fallback(state, "education", merge_education(list(results)))
+    return {"education": education, "extraction_usage": usage, "extraction_sources": {"education": source}}
+
+
+async def combined_extraction_node(state: State, config: RunnableConfig) -> State:
+    """
+    Node Function: Extracts work experience and education with a single LLM call.
+
+    Used instead of the two parallel branches when 'extraction_mode' is "combined".
+    Fills the same 'work' and 'education' keys, so downstream nodes are unchanged.
+    Sections that are unchanged since the previous run or already handled by the
+    rule-based extractor are not sent to the model. With `stream_entries=True`, entries
+    of both sections are emitted on the "custom" stream as they complete.
+
+    Parameters:
+        state (dict): The shared state containing 'resume_chunks' (or 'resume_text').
+        config (RunnableConfig): Run configuration; reads 'stream_entries' from 'configurable'.
+
+    Returns:
+        dict: Updates state with:
+            - 'work': Extracted work experience data
+            - 'education': Extracted education data
+            - 'extraction_usage': Token usage of the extraction call(s)
+    """
+    known_work = _known_section(state, "work")
+    known_education = _known_section(state, "education")
+    if known_work is not None and known_education is not None:
+        return {
+            "work": known_work[0],
+            "education": known_education[0],
+            "extraction_sources": {"work": known_work[1], "education": known_education[1]},
+        }
+
+    chunks = _resume_chunks(state, "extract_combined")
+    on_entry = _entry_emitter(config, "extract_combined")
+    with track_usage() as usage:
+        if known_work is not None:
+            # Only education still needs the model
+            results = await asyncio.gather(*(aextract_education(chunk, on_entry) for chunk in chunks))
+            extracted = {"work": known_work[0], "education": merge_education(list(results))}
+        elif known_education is not None:
+            # Only work experience still needs the model
+            results = await asyncio.gather(*(aextract_work_experience(chunk, on_entry) for chunk in chunks))
+            extracted = {"work": merge_work_experiences(list(results)), "education": known_education[0]}
+        else:
+            results = await asyncio.gather(*(aextract_work_and_education(chunk, on_entry) for chunk in chunks))
+            extracted = {
+                "work": merge_work_experiences([result["work"] for result in results]),
+                "education": merge_education([result["education"] for result in results]),
+            }
+
+    update: State = {"extraction_usage": usage, "extraction_sources": {}}
+    for section, known in (("work", known_work), ("education", known_education)):
+        if known is not None:
+            update[section], update["extraction_sources"][section] = known
+        else:
+            update[section], update["extraction_sources"][section] = _with_rule_fallback(
+                state, section, extracted[section]
+            )
+    return update
+
+
+def route_extraction(state: State) -> List[str]:
+    """
+    Edge Function: Chooses the extraction branch(es) from the 'extraction_mode' state key,
+    falling back to the configured default mode.
+
+    Returns:
+        List[str]: Names of the extraction nodes to run next.
+    """
+    mode = state.get("extraction_mode") or settings.extraction_mode
+    if mode == "combined":
+        return ["extract_combined"]
+    return ["extract_work", "extract_education"]
+
+
+def _requested(state: State, output: str) -> bool:
+    """
+    True if `output` (or an output that depends on it) was requested via 'include'.
+    """
+    include = state.get("include")
+    if not include:
+        return True
+    needed = ANALYSIS_OUTPUTS.index(output)
+    return any(ANALYSIS_OUTPUTS.index(name) >= needed for name in include if name in ANALYSIS_OUTPUTS)
+
+
+def route_after_summary(state: State) -> str:
+    """
+    Edge Function: Continues to insight extraction only if insights or questions were requested.
+    """
+    return "extract_insights" if _requested(state, "insights") else END
+
+
+def route_after_insights(state: State) -> str:
+    """
+    Edge Function: Continues to question generation only if questions were requested.
+    """
+    return "generate_questions" if _requested(state, "questions") else END
+
+
+def _structured(state: State) -> Dict[str, Any]:
+    """
+    Returns the extracted work and education records in the shape sent to the summary / insight prompts.
+    """
     return {
-        "work": extract_work_experience(resume_text),
-        "education": extract_education(resume_text)
+        "work_experiences": state.get("work", {}).get("work_experiences", []),
+        "education": state.get("education", {}).get("education", [])
     }
 
 
-def summary_node(state: State) -> State:
+def partial_errors(values: Dict[str, Any]) -> Optional[Dict[str, List[str]]]:
+    """
+    Returns the error messages of failed chunks per section ('work' / 'education') whose
+    other chunks succeeded, or None if no section is incomplete.
+    """
+    errors = {
+        section: values[section]["partial_errors"]
+        for section in ("work", "education")
+        if isinstance(values.get(section), dict) and values[section].get("partial_errors")
+    }
+    return errors or None
+
+
+def _token_emitter(config: RunnableConfig, node: str) -> Optional[Callable[[str], None]]:
+    """
+    Returns an `on_token` callback that emits each generated text chunk on the "custom"
+    stream as {"event": "token", "node", "token"}, if the run was configured with
+    `stream_tokens=True`; otherwise None (the node then uses a plain, non-streaming call).
+    """
+    if not config.get("configurable", {}).get("stream_tokens"):
+        return None
+    writer = get_stream_writer()
+
+    def on_token(token: str) -> None:
+        writer({"event": "token", "node": node, "token": token})
+
+    return on_token
+
+
+async def summary_node(state: State, config: RunnableConfig) -> State:
     """
     Node Function: Generates a summary based on structured work and education data.
 
+    When the run is configured with `stream_tokens=True`, the summary is generated
+    through the model's streaming API and every chunk is emitted on the "custom"
+    stream as {"event": "token", "node": "generate_summary", "token": ...}.
+
+    If the structured data is identical to the previous run's, the previous summary is
+    reused without calling the LLM (and streamed as a single token).
+
     Parameters:
         state (dict): State containing 'work' and 'education' dicts.
+        config (RunnableConfig): Run configuration; reads 'stream_tokens' from 'configurable'.
 
     Returns:
         dict: Updates state with:
             - 'summary': A generated summary string describing work and education background
     """
-    structured = {
-        "work_experiences": state.get("work", {}).get("work_experiences", []),
-        "education": state.get("education", {}).get("education", [])
-    }
-    return {"summary": generate_summary(structured)}
+    structured = _structured(state)
+    summary_input = fingerprint(structured)
+
+    on_token = _token_emitter(config, "generate_summary")
+
+    # Unchanged structured data: the previous summary still applies
+    previous = _reusable(state, "summary", "summary_input", summary_input)
+    if previous is not None and not previous.startswith(SUMMARY_ERROR_PREFIX):
+        if on_token is not None:
+            on_token(previous)
+        return {
+            "summary": previous,
+            "fingerprints": {"summary_input": summary_input},
+            "reused_stages": ["generate_summary"],
+        }
 
+    summary = await agenerate_summary(structured, on_token=on_token)
+    return {"summary": summary, "fingerprints": {"summary_input": summary_input}}
 
-def insight_node(state: State) -> State:
+
+async def insight_node(state: State) -> State:
     """
     Node Function: Extracts insights from the generated summary.
 
+    Reuses the previous run's insights if the summary is unchanged.
+
     Parameters:
         state (dict): State containing the 'summary' string.
 
@@ -66,54 +471,164 @@ def insight_node(state: State) -> State:
         dict: Updates state with:
             - 'insights': Key points or takeaways extracted from the summary
     """
-    return extract_insights(state["summary"])
+    insights_input = fingerprint(state["summary"])
+    previous = _reusable(state, "insights", "insights_input", insights_input)
+    if previous is not None:
+        return {
+            "insights": previous,
+            "fingerprints": {"insights_input": insights_input},
+            "reused_stages": ["extract_insights"],
+        }
+    return {**await aextract_insights(state["summary"]), "fingerprints": {"insights_input": insights_input}}
 
 
-def question_node(state: State) -> State:
+async def structured_insight_node(state: State) -> State:
+    """
+    Node Function: Extracts insights directly from the structured work and education data.
+
+    Used by the "parallel" topology in place of `insight_node`, so insights no longer
+    wait for the summary and the two LLM calls run in the same step. Does nothing if
+    neither insights nor questions were requested. Reuses the previous run's insights
+    if the structured data is unchanged.
+
+    Parameters:
+        state (dict): State containing 'work' and 'education' dicts.
+
+    Returns:
+        dict: Updates state with:
+            - 'insights': Key points or takeaways extracted from the structured data
+    """
+    if not _requested(state, "insights"):
+        return {}
+
+    structured = _structured(state)
+    insights_input = fingerprint(structured)
+    previous = _reusable(state, "insights", "insights_structured_input", insights_input)
+    if previous is not None:
+        return {
+            "insights": previous,
+            "fingerprints": {"insights_structured_input": insights_input},
+            "reused_stages": ["extract_insights"],
+        }
+    return {
+        **await aextract_insights(encode_structured(structured, "extract_insights")),
+        "fingerprints": {"insights_structured_input": insights_input},
+    }
+
+
+async def question_node(state: State) -> State:
     """
     Node Function: Generates interview questions from the extracted insights.
 
+    Reuses the previous run's questions if the insights are unchanged. If insight
+    extraction failed, no questions are generated and the error is reported instead,
+    so the sections that did succeed are still returned.
+
     Parameters:
         state (dict): State containing 'insights'.
 
     Returns:
         dict: Updates state with:
             - 'questions': A list of tailored interview questions
+            - 'error': Instead of 'questions', if there are no insights to work from
     """
-    return generate_interview_questions(state["insights"])
+    if not state.get("insights"):
+        reason = state.get("error") or "no insights were extracted"
+        return {"error": f"Error generating interview questions: {reason}"}
+
+    questions_input = fingerprint(state["insights"])
+    previous = _reusable(state, "questions", "questions_input", questions_input)
+    if previous is not None:
+        return {
+            "questions": previous,
+            "fingerprints": {"questions_input": questions_input},
+            "reused_stages": ["generate_questions"],
+        }
+    return {
+        **await agenerate_interview_questions(state["insights"]),
+        "fingerprints": {"questions_input": questions_input},
+    }
+
+
+# Supported values of `settings.graph_topology` / `build_graph(topology=...)`
+GRAPH_TOPOLOGIES = ("linear", "parallel")
 
 
-def build_graph():
+def build_graph(topology: Optional[str] = None):
     """
     Constructs and compiles the LangGraph DAG for resume analysis.
 
     Nodes:
-        - extract_resume_data: Extract work and education from resume text
+        - preprocess_resume: Normalize whitespace and split the resume into chunks
+        - extract_work: Extract work experience from resume text
+        - extract_education: Extract education from resume text
+        - extract_combined: Extract both in one call (extraction_mode="combined")
         - generate_summary: Generate a summary from extracted data
         - extract_insights: Extract insights from the summary
         - generate_questions: Generate interview questions from insights
 
     Edges:
-        extract_resume_data -> generate_summary -> extract_insights -> generate_questions -> END
+        START -> preprocess_resume
+        preprocess_resume -> extract_work, extract_education (in parallel)   [extraction_mode="split"]
+        preprocess_resume -> extract_combined                                 [extraction_mode="combined"]
+        [extract_work, extract_education] | extract_combined -> generate_summary
+        generate_summary -> extract_insights | END                            [per 'include']
+        extract_insights -> generate_questions | END                          [per 'include']
+        generate_questions -> END
+
+        In split mode the two extraction nodes run in the same step, so the first stage
+        costs the slower of the two LLM calls rather than their sum.
+
+    Topology "parallel" replaces the last two lines: insights are extracted from the
+    structured records in the same step as the summary, cutting the sequential LLM
+    round trips from four to three:
+        [extract_work, extract_education] | extract_combined -> generate_summary, extract_insights
+        generate_summary -> END
+        extract_insights -> generate_questions | END                          [per 'include']
+
+    All nodes are coroutines, so the compiled app must be driven with
+    `ainvoke` / `astream` from async code. Every node is wrapped with
+    `metrics.instrument_node`, which records its latency and error count.
+
+    Args:
+        topology (Optional[str]): "linear" or "parallel"; defaults to `settings.graph_topology`.
 
     Returns:
         Runnable DAG app with checkpointing enabled.
     """
+    topology = topology or settings.graph_topology
+    if topology not in GRAPH_TOPOLOGIES:
+        raise ValueError(f"Unknown graph topology '{topology}', expected one of {GRAPH_TOPOLOGIES}")
+
     # Initialize the DAG builder with state type
     builder = StateGraph(State)
 
-    # Add processing nodes to the graph
-    builder.add_node("extract_resume_data", extract_work_and_education)
-    builder.add_node("generate_summary", summary_node)
-    builder.add_node("extract_insights", insight_node)
-    builder.add_node("generate_questions", question_node)
+    # Add processing nodes to the graph (each wrapped to record latency and errors)
+    builder.add_node("preprocess_resume", instrument_node("preprocess_resume", preprocess_node))
+    builder.add_node("extract_work", instrument_node("extract_work", work_node))
+    builder.add_node("extract_education", instrument_node("extract_education", education_node))
+    builder.add_node("extract_combined", instrument_node("extract_combined", combined_extraction_node))
+    builder.add_node("generate_summary", instrument_node("generate_summary", summary_node))
+    insights = structured_insight_node if topology == "parallel" else insight_node
+    builder.add_node("extract_insights", instrument_node("extract_insights", insights))
+    builder.add_node("generate_questions", instrument_node("generate_questions", question_node))
 
     # Define the flow of the graph
-    builder.set_entry_point("extract_resume_data")
-    builder.add_edge("extract_resume_data", "generate_summary")
-    builder.add_edge("generate_summary", "extract_insights")
-    builder.add_edge("extract_insights", "generate_questions")
+    # Chunk the resume, then fan out to the extraction branch(es) for the selected mode
+    builder.add_edge(START, "preprocess_resume")
+    builder.add_conditional_edges("preprocess_resume", route_extraction, ["extract_work", "extract_education", "extract_combined"])
+    builder.add_edge(["extract_work", "extract_education"], "generate_summary")
+    builder.add_edge("extract_combined", "generate_summary")
+    if topology == "parallel":
+        # Insights read the structured data too, so they start alongside the summary
+        builder.add_edge(["extract_work", "extract_education"], "extract_insights")
+        builder.add_edge("extract_combined", "extract_insights")
+        builder.add_edge("generate_summary", END)
+    else:
+        # Stop early when the caller did not ask for insights / questions
+        builder.add_conditional_edges("generate_summary", route_after_summary, ["extract_insights", END])
+    builder.add_conditional_edges("extract_insights", route_after_insights, ["generate_questions", END])
     builder.add_edge("generate_questions", END)
 
-    # Compile and return the graph with in-memory checkpointing
+    # Compile and return the graph with persistent checkpointing
     return builder.compile(checkpointer=checkpointer)
@@ -1,15 +1,53 @@
-from fastapi import FastAPI, Request
-from fastapi.responses import StreamingResponse, JSONResponse
-from pydantic import BaseModel
-from typing import Optional
+from fastapi import FastAPI, File, Form, Query, Request, UploadFile
+from fastapi.responses import StreamingResponse, JSONResponse, PlainTextResponse
+from pydantic import BaseModel, Field, ValidationError
+from typing import Dict, List, Literal, Optional
 import uuid
 import asyncio
+import json
+import logging
+import time
 
-# Import the function to generate interview questions
-from nodes.generate_questions import generate_interview_questions
+# Shared application settings
+from config import settings
+
+# Import the functions used to (re)generate interview questions
+from nodes.extract_insights import aextract_insights
+from nodes.generate_questions import agenerate_interview_questions
 
 # Import the LangGraph-based DAG builder
-from graph import build_graph
+from graph import ANALYSIS_OUTPUTS, build_graph, partial_errors
+
+# Shared LLM response cache (exposes hit/miss counters)
+from nodes.llm_cache import llm_cache
+
+# Per-node counters of malformed LLM output
+from nodes.response_parser import parse_stats
+from nodes.model_router import routing_stats
+
+# Per-node token savings of the compact prompt encoding
+from nodes.prompt_encoding import prompt_savings
+
+# Outbound LLM scheduler (rate limits, priorities, queue statistics)
+from nodes.scheduler import PRIORITY_BATCH, llm_priority, scheduler
+
+# Single-flight coalescing of identical in-flight analyses
+from coalesce import SingleFlight, coalesce_key
+
+# Key-value store shared by all worker processes (SQLite file or Redis)
+from state_backend import get_state_backend
+
+# Shared, lazily constructed LLM clients
+from nodes.llm_client import aclose_clients
+
+# Searchable store of analyzed candidates
+from candidate_store import get_candidate_store
+
+# PDF / DOCX text extraction in a process pool
+from file_ingest import DocumentError, aextract_upload_text, shutdown_extraction_pool
+
+# Prometheus metrics (node / endpoint latency, tokens, errors)
+from metrics import HTTP_LATENCY, Gauge, registry, start_request_timings
 
 
 # Initialize FastAPI app
@@ -20,12 +58,192 @@ app = FastAPI(
 # Compile and load the LangGraph graph
 graph_app = build_graph()
 
+# State every worker must see: coalescing leases and results, deferred-run status
+state_backend = get_state_backend()
+
+# Every finished analysis is indexed for /search (None if CANDIDATE_STORE_ENABLED is off)
+candidate_store = get_candidate_store()
+
+# Identical resumes analyzed concurrently share one pipeline run, across worker processes too
+single_flight = SingleFlight(state_backend, lease_seconds=settings.coalesce_lease_seconds)
+
+# Structured per-request timing lines (enabled with REQUEST_TIMING_LOG)
+timing_logger = logging.getLogger("resume_analysis.timing")
+if settings.request_timing_log:
+    # Uvicorn leaves the root logger at WARNING, so give the timing lines their own INFO handler
+    _timing_handler = logging.StreamHandler()
+    _timing_handler.setFormatter(logging.Formatter("%(message)s"))
+    timing_logger.addHandler(_timing_handler)
+    timing_logger.setLevel(logging.INFO)
+    timing_logger.propagate = False
+
+# Point-in-time gauges, read from the scheduler / cache / coalescer at scrape time
+registry.register(Gauge(
+    "resume_llm_scheduler_queue_depth", "LLM calls waiting for a rate-limit slot.", [],
+    lambda: [((), scheduler.stats()["queue_depth"])],
+))
+registry.register(Gauge(
+    "resume_llm_scheduler_in_flight", "LLM requests currently in flight.", [],
+    lambda: [((), scheduler.stats()["in_flight"])],
+))
+registry.register(Gauge(
+    "resume_llm_cache_hits", "LLM cache lookups per node and outcome since start.", ["node", "outcome"],
+    lambda: [
+        ((node, outcome), count)
+        for node, counters in llm_cache.stats()["nodes"].items()
+        for outcome, count in counters.items()
+    ],
+))
+registry.register(Gauge(
+    "resume_coalesced_runs_in_flight", "Coalesced analysis runs currently in flight.", [],
+    lambda: [((), single_flight.stats()["in_flight"])],
+))
+
+
+@app.on_event("shutdown")
+async def close_llm_clients():
+    """
+    Closes the shared LLM HTTP connection pools when the server stops.
+    """
+    await aclose_clients()
+
+
+@app.on_event("shutdown")
+def stop_extraction_pool():
+    """
+    Stops the file text-extraction worker processes when the server stops.
+    """
+    shutdown_extraction_pool()
+
+
+# Room for the multipart boundaries and the other form fields on top of the file itself
+UPLOAD_FORM_OVERHEAD_BYTES = 64 * 1024
+
+
+class UploadSizeLimit:
+    """
+    ASGI middleware that enforces UPLOAD_MAX_BYTES on /analyze-resume-file at ingress.
+
+    A request whose Content-Length is over the limit is answered with 413 before any of
+    its body is read. A body without Content-Length (chunked) is counted as it arrives
+    and cut off with 413 as soon as it passes the limit, so the form parser never spools
+    an oversized upload to disk.
+    """
+
+    def __init__(self, app, path: str, max_bytes: int):
+        self.app = app
+        self.path = path
+        self.max_bytes = max_bytes
+
+    def _too_large(self) -> JSONResponse:
+        return JSONResponse(
+            content={"error": f"File exceeds the {settings.upload_max_bytes} byte upload limit"},
+            status_code=413
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] != self.path:
+            await self.app(scope, receive, send)
+            return
+
+        length = dict(scope["headers"]).get(b"content-length")
+        if length is not None and length.isdigit() and int(length) > self.max_bytes:
+            await self._too_large()(scope, receive, send)
+            return
+
+        received = 0
+        exceeded = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Stop the form parser as if the client had gone away
+                    exceeded = True
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message):
+            # Once over the limit, the app's own (error) response is replaced by the 413
+            if not exceeded:
+                await send(message)
+
+        await self.app(scope, limited_receive, guarded_send)
+        if exceeded:
+            await self._too_large()(scope, receive, send)
+
+
+app.add_middleware(
+    UploadSizeLimit,
+    path="/analyze-resume-file",
+    max_bytes=settings.upload_max_bytes + UPLOAD_FORM_OVERHEAD_BYTES,
+)
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """
+    Records the latency of every HTTP request per endpoint and, if REQUEST_TIMING_LOG is
+    set, logs one JSON line with the request's total time and the time spent in each node.
+
+    Latency is measured until the last byte of the body is sent, so streaming endpoints
+    report the full run rather than the time to the first event.
+    """
+    started = time.perf_counter()
+    timings = start_request_timings() if settings.request_timing_log else None
+    response = await call_next(request)
+
+    # Label by route template (e.g. /analysis/{thread_id}) to keep label cardinality bounded
+    route = request.scope.get("route")
+    path = getattr(route, "path", request.url.path)
+
+    def finish() -> None:
+        elapsed = time.perf_counter() - started
+        HTTP_LATENCY.observe(elapsed, method=request.method, path=path, status=response.status_code)
+        if timings is not None:
+            timing_logger.info(json.dumps({
+                "method": request.method,
+                "path": path,
+                "status": response.status_code,
+                "duration_seconds": round(elapsed, 4),
+                "nodes": [{"node": node, "seconds": seconds} for node, seconds in timings],
+            }))
+
+    body = response.body_iterator
+
+    async def body_then_record():
+        try:
+            async for chunk in body:
+                yield chunk
+        finally:
+            finish()
+
+    response.body_iterator = body_then_record()
+    return response
+
 
 class ResumeRequest(BaseModel):
     """
     Request model for analyzing a resume.
+
+    `extraction_mode` selects two parallel extraction calls ("split") or a single
+    combined call ("combined"); it defaults to the EXTRACTION_MODE setting.
+
+    `previous_thread_id` enables incremental re-analysis: sections and stages whose
+    inputs are unchanged since that analysis reuse its results instead of calling the LLM.
+
+    `include` limits the run to the stages needed for the listed outputs (all by default);
+    e.g. ["summary"] skips insight and question generation. With `deferred`, the response
+    is returned as soon as the summary exists and the remaining stages finish in the
+    background; fetch them with GET /analysis/{thread_id}.
     """
     resume_text: str
+    extraction_mode: Optional[Literal["split", "combined"]] = None
+    previous_thread_id: Optional[str] = None
+    include: Optional[List[Literal["summary", "insights", "questions"]]] = None
+    deferred: bool = False
 
 
 class ResumeAnalysisResponse(BaseModel):
@@ -35,20 +253,235 @@ class ResumeAnalysisResponse(BaseModel):
         - thread_id: A UUID used to track the workflow session
         - summary: Summary generated from resume (optional)
         - question: First generated interview question (optional)
+        - extraction_mode: Extraction mode used for this run
+        - extraction_usage: Calls and tokens spent on work/education extraction
+        - extraction_sources: Where each section came from ("llm", "rules", "rules_fallback" or "reused")
+        - partial_errors: Per section, errors of resume chunks whose entries are missing
+        - reused_stages: Later stages whose previous output was reused (incremental runs)
+        - insights: Extracted insights (only if requested via `include`)
+        - status: "complete", or "pending" while a deferred run is still finishing
     """
     thread_id: str
     summary: Optional[str]
     question: Optional[str]
+    extraction_mode: Optional[str] = None
+    extraction_usage: Optional[Dict[str, int]] = None
+    extraction_sources: Optional[Dict[str, str]] = None
+    partial_errors: Optional[Dict[str, List[str]]] = None
+    reused_stages: Optional[List[str]] = None
+    insights: Optional[List[str]] = None
+    status: str = "complete"
+
+
+class BatchResumeRequest(BaseModel):
+    """
+    Request model for analyzing several resumes in one call.
+    """
+    resumes: List[ResumeRequest]
+    concurrency: Optional[int] = Field(default=None, ge=1, description="Maximum resumes processed at once")
 
 
 class ResumeCheckpointRequest(BaseModel):
     """
-    Request model for generating interview questions from a checkpointed summary.
+    Request model for generating interview questions from a checkpointed analysis.
+
+    Only `thread_id` is needed; `resume_summary` is a fallback for threads that
+    are no longer in the checkpoint store.
     """
     thread_id: str
     resume_summary: Optional[str] = None
 
 
+# Outputs of an earlier analysis that an incremental run may reuse
+PREVIOUS_KEYS = ("work", "education", "summary", "insights", "questions", "fingerprints")
+
+
+async def initial_state(request: ResumeRequest) -> dict:
+    """
+    Builds the initial workflow state for a resume request.
+
+    With `previous_thread_id`, the earlier analysis is loaded from the checkpoint store
+    into 'previous'. An unknown or expired thread simply results in a full analysis.
+    """
+    state = {
+        "resume_text": request.resume_text,
+        "extraction_mode": request.extraction_mode or settings.extraction_mode,
+    }
+    if request.include:
+        state["include"] = list(request.include)
+    if request.previous_thread_id:
+        snapshot = await graph_app.aget_state({"configurable": {"thread_id": request.previous_thread_id}})
+        values = snapshot.values or {}
+        state["previous"] = {key: values[key] for key in PREVIOUS_KEYS if key in values}
+    return state
+
+
+async def run_analysis(request: ResumeRequest, thread_id: str) -> ResumeAnalysisResponse:
+    """
+    Runs one resume through the LangGraph workflow and collects the response fields.
+
+    Args:
+        request (ResumeRequest): Raw resume text and per-request options.
+        thread_id (str): Checkpoint thread under which the run is stored.
+
+    Returns:
+        ResumeAnalysisResponse: Summary, first interview question and thread_id.
+    """
+    # Initial workflow state containing the resume text (and the previous analysis, if any)
+    state = await initial_state(request)
+
+    # Stream workflow execution step-by-step without blocking the event loop
+    stream = graph_app.astream(
+        state,
+        stream_mode="values",  # Only returns updated values from each node
+        config={"thread_id": thread_id}
+    )
+
+    # Every step carries the full state, so the last one holds all outputs
+    values = state
+    async for step in stream:
+        values = step
+
+    await record_candidate(thread_id, values, request)
+    return build_response(thread_id, values, request)
+
+
+async def record_candidate(thread_id: str, values: dict, request: ResumeRequest) -> None:
+    """
+    Indexes a finished analysis in the candidate store; a re-analysis replaces the entry
+    of its `previous_thread_id`.
+    """
+    if candidate_store is not None:
+        await candidate_store.arecord(thread_id, values, replaces=request.previous_thread_id)
+
+
+def build_response(thread_id: str, values: dict, request: ResumeRequest, status: str = "complete") -> ResumeAnalysisResponse:
+    """
+    Builds the /analyze-resume response from a workflow state.
+    """
+    questions = values.get("questions")
+    return ResumeAnalysisResponse(
+        thread_id=thread_id,
+        summary=values.get("summary"),
+        question=questions[0] if questions else None,  # Only return the first question
+        extraction_mode=values.get("extraction_mode"),
+        extraction_usage=values.get("extraction_usage"),
+        extraction_sources=values.get("extraction_sources"),
+        partial_errors=partial_errors(values),
+        reused_stages=values.get("reused_stages"),
+        insights=values.get("insights") if request.include and "insights" in request.include else None,
+        status=status
+    )
+
+
+# Deferred runs still finishing in the background in this process, by thread_id
+deferred_runs: Dict[str, asyncio.Task] = {}
+
+# Upper bound on how long a deferred run is reported as pending if its worker dies mid-run
+PENDING_RUN_TTL_SECONDS = 3600
+
+
+def _pending_key(thread_id: str) -> str:
+    """
+    Key of the shared marker that tells every worker a deferred run is still in progress.
+    """
+    return f"pending-run:{thread_id}"
+
+
+async def run_analysis_deferred(request: ResumeRequest, thread_id: str) -> ResumeAnalysisResponse:
+    """
+    Starts the analysis in a background task and returns as soon as the summary exists.
+
+    The remaining stages (insights, questions) keep running after the response is sent
+    and are checkpointed under `thread_id` like any other run. If they fail, the error
+    is written to the thread's state so GET /analysis/{thread_id} can report it. A marker
+    in the shared state backend lets any worker report the run as pending.
+
+    Args:
+        request (ResumeRequest): Raw resume text and per-request options.
+        thread_id (str): Checkpoint thread under which the run is stored.
+
+    Returns:
+        ResumeAnalysisResponse: Summary and thread_id, with status "pending" if work remains.
+    """
+    state = await initial_state(request)
+    config = {"configurable": {"thread_id": thread_id}}
+    summary_ready: asyncio.Future = asyncio.get_running_loop().create_future()
+
+    async def complete() -> None:
+        values = state
+        try:
+            async for step in graph_app.astream(state, stream_mode="values", config=config):
+                values = step
+                if "summary" in step and not summary_ready.done():
+                    summary_ready.set_result(step)
+            await record_candidate(thread_id, values, request)
+        except Exception as e:
+            if not summary_ready.done():
+                summary_ready.set_exception(e)
+            else:
+                # The caller already has the summary; record the failure for GET /analysis
+                await graph_app.aupdate_state(config, {"error": str(e)}, as_node="generate_questions")
+        finally:
+            deferred_runs.pop(thread_id, None)
+            await state_backend.adelete(_pending_key(thread_id))
+            # The run may end without a summary (e.g. extraction failed)
+            if not summary_ready.done():
+                summary_ready.set_result(values)
+
+    await state_backend.aset(_pending_key(thread_id), "1", PENDING_RUN_TTL_SECONDS)
+    deferred_runs[thread_id] = asyncio.create_task(complete())
+    values = await summary_ready
+    status = "pending" if thread_id in deferred_runs else "complete"
+    return build_response(thread_id, values, request, status=status)
+
+
+async def run_analysis_coalesced(request: ResumeRequest, thread_id: str) -> ResumeAnalysisResponse:
+    """
+    Runs the analysis, attaching to an identical in-flight run if there is one.
+
+    Requests with the same normalized resume text and options share a single pipeline
+    run. Callers that joined another run still get their own `thread_id`: the finished
+    state is copied into their thread so /resume-question works for every caller.
+    Runs are shared across worker processes through the state backend. Deferred
+    requests are not coalesced.
+
+    Args:
+        request (ResumeRequest): Raw resume text and per-request options.
+        thread_id (str): Checkpoint thread for this caller.
+
+    Returns:
+        ResumeAnalysisResponse: Summary, first interview question and this caller's thread_id.
+    """
+    if request.deferred:
+        return await run_analysis_deferred(request, thread_id)
+    if not settings.coalesce_enabled:
+        return await run_analysis(request, thread_id)
+
+    key = coalesce_key(
+        request.resume_text,
+        request.extraction_mode or settings.extraction_mode,
+        request.previous_thread_id,
+        sorted(request.include or ANALYSIS_OUTPUTS),
+    )
+    result, shared = await single_flight.run(
+        key,
+        lambda: run_analysis(request, thread_id),
+        dumps=lambda response: response.json(),
+        loads=ResumeAnalysisResponse.parse_raw,
+    )
+    if not shared:
+        return result
+
+    # Give this caller its own checkpoint thread holding the shared run's final state
+    snapshot = await graph_app.aget_state({"configurable": {"thread_id": result.thread_id}})
+    if snapshot.values:
+        await graph_app.aupdate_state(
+            {"configurable": {"thread_id": thread_id}}, snapshot.values, as_node="generate_questions"
+        )
+    return result.copy(update={"thread_id": thread_id})
+
+
 @app.post("/analyze-resume", response_model=ResumeAnalysisResponse, tags=["Resume analysis"])
 async def analyze_resume(request: ResumeRequest):
     """
@@ -69,41 +502,190 @@ async def analyze_resume(request: ResumeRequest):
     # Generate a unique ID for tracking workflow execution
     thread_id = str(uuid.uuid4())
 
-    # Initial workflow state containing the resume text
-    state = {"resume_text": request.resume_text}
+    return await run_analysis_coalesced(request, thread_id)
 
-    # Stream workflow execution step-by-step
-    stream = graph_app.stream(
-        state,
-        stream_mode="values",  # Only returns updated values from each node
-        config={"thread_id": thread_id}
-    )
 
-    # Initialize response variables
-    summary = None
-    question = None
+@app.post("/analyze-resume-file", response_model=ResumeAnalysisResponse, tags=["Resume analysis"])
+async def analyze_resume_file(
+    file: UploadFile = File(..., description="Resume as PDF, DOCX or plain text"),
+    extraction_mode: Optional[str] = Form(None),
+    include: Optional[List[str]] = Form(None),
+    deferred: bool = Form(False),
+):
+    """
+    POST /analyze-resume-file
 
-    # Iterate through streamed steps and extract summary and question
-    for step in stream:
-        if "summary" in step:
-            summary = step["summary"]
-        if "questions" in step:
-            question = step["questions"][0]  # Only return the first question
+    Description:
+        Accepts a resume file (multipart/form-data) instead of raw text. Requests over
+        UPLOAD_MAX_BYTES are rejected at ingress (see `UploadSizeLimit`), and the text is
+        extracted in a separate process pool (PDF via pypdf with an UPLOAD_MAX_PAGES limit,
+        DOCX via python-docx) with a FILE_EXTRACTION_TIMEOUT_SECONDS limit, so parsing
+        a large or hostile document never stalls other requests. The
+        text then runs through the same workflow as /analyze-resume; the optional form
+        fields mirror its request options.
 
-    return ResumeAnalysisResponse(
-        thread_id=thread_id,
-        summary=summary,
-        question=question
+    Args:
+        file (UploadFile): The resume document.
+        extraction_mode (Optional[str]): "split" or "combined".
+        include (Optional[List[str]]): Outputs to produce ("summary", "insights", "questions").
+        deferred (bool): Return once the summary exists (see /analyze-resume).
+
+    Returns:
+        ResumeAnalysisResponse: Same as /analyze-resume; 413 if the file or page count is
+        too large, 415 for unsupported formats, 422 if no text could be extracted.
+    """
+    # The request fit the ingress cap; the file itself must fit UPLOAD_MAX_BYTES
+    if file.size is not None and file.size > settings.upload_max_bytes:
+        return JSONResponse(
+            content={"error": f"File exceeds the {settings.upload_max_bytes} byte upload limit"},
+            status_code=413
+        )
+
+    try:
+        resume_text = await aextract_upload_text(file, file.filename, file.content_type)
+    except DocumentError as e:
+        return JSONResponse(content={"error": str(e)}, status_code=e.status_code)
+    finally:
+        await file.close()
+
+    try:
+        request = ResumeRequest(
+            resume_text=resume_text, extraction_mode=extraction_mode, include=include, deferred=deferred
+        )
+    except ValidationError as e:
+        return JSONResponse(content={"error": e.errors()}, status_code=422)
+
+    thread_id = str(uuid.uuid4())
+    return await run_analysis_coalesced(request, thread_id)
+
+
+def _sse(event: str, data: dict) -> str:
+    """
+    Formats one server-sent event.
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post("/analyze-resume/stream", tags=["Resume analysis"])
+async def analyze_resume_stream(request: ResumeRequest):
+    """
+    POST /analyze-resume/stream
+
+    Description:
+        Streaming variant of /analyze-resume using server-sent events (text/event-stream).
+        Events:
+            - start: {"thread_id"} as soon as the run begins
+            - node:  {"node", "update"} whenever a graph node completes
+                     (extract_work, extract_education, generate_summary, extract_insights,
+                     generate_questions)
+            - entry: {"node", "section", "entry"} for each work / education entry as soon as
+                     the model has finished writing it (provisional; the node event that
+                     follows carries the merged, authoritative result)
+            - token: {"node": "generate_summary", "token"} for each summary text chunk
+            - done:  {"thread_id"} once the workflow has finished
+            - error: {"error"} if the workflow fails
+
+    Args:
+        request (ResumeRequest): Incoming resume text from the client.
+
+    Returns:
+        StreamingResponse: The event stream.
+    """
+    thread_id = str(uuid.uuid4())
+    state = await initial_state(request)
+
+    async def events():
+        yield _sse("start", {"thread_id": thread_id})
+        try:
+            # "updates" reports each finished node, "custom" carries extracted entries and summary tokens
+            stream = graph_app.astream(
+                state,
+                stream_mode=["updates", "custom"],
+                config={"thread_id": thread_id, "stream_tokens": True, "stream_entries": True}
+            )
+            async for mode, chunk in stream:
+                if mode == "updates":
+                    for node, update in chunk.items():
+                        yield _sse("node", {"node": node, "update": update})
+                elif mode == "custom":
+                    payload = dict(chunk)
+                    yield _sse(payload.pop("event", "custom"), payload)
+            snapshot = await graph_app.aget_state({"configurable": {"thread_id": thread_id}})
+            await record_candidate(thread_id, snapshot.values or {}, request)
+            yield _sse("done", {"thread_id": thread_id})
+        except Exception as e:
+            yield _sse("error", {"thread_id": thread_id, "error": str(e)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 
+@app.post("/analyze-resumes", tags=["Resume analysis"])
+async def analyze_resumes(request: BatchResumeRequest):
+    """
+    POST /analyze-resumes
+
+    Description:
+        Runs a list of resumes through the LangGraph workflow with bounded concurrency
+        and streams one JSON object per line (NDJSON) as each resume finishes.
+        Lines arrive in completion order; `index` points back into the request list.
+        A failing resume produces an `error` line and does not affect the others.
+
+    Args:
+        request (BatchResumeRequest): The resumes and an optional concurrency limit.
+
+    Returns:
+        StreamingResponse: `application/x-ndjson` stream of per-resume results.
+    """
+    if len(request.resumes) > settings.batch_max_items:
+        return JSONResponse(
+            content={"error": f"At most {settings.batch_max_items} resumes per batch"},
+            status_code=413
+        )
+
+    # Clamp the requested concurrency to the configured ceiling
+    concurrency = min(request.concurrency or settings.batch_concurrency, settings.batch_max_concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(index: int, item: ResumeRequest) -> dict:
+        async with semaphore:
+            thread_id = str(uuid.uuid4())
+            try:
+                # Batch work yields to interactive /analyze-resume traffic in the LLM scheduler
+                with llm_priority(PRIORITY_BATCH):
+                    result = await run_analysis_coalesced(item, thread_id)
+                return {"index": index, **result.dict()}
+            except Exception as e:
+                return {"index": index, "thread_id": thread_id, "error": str(e)}
+
+    async def ndjson_lines():
+        tasks = [asyncio.create_task(run_one(i, item)) for i, item in enumerate(request.resumes)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield json.dumps(await next_done) + "\n"
+        finally:
+            # Stop outstanding work if the client disconnects mid-stream
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
 @app.post("/resume-question", tags=["Generate question"])
 async def resume_question(req: ResumeCheckpointRequest):
     """
     POST /resume-question
 
     Description:
-        Resumes question generation based on an already generated resume summary.
+        Regenerates interview questions for an earlier analysis. The insights saved
+        under `thread_id` are loaded from the checkpoint store and only the question
+        node is re-run; the new questions are written back to the same thread.
+        If the thread has no insights yet (analyzed with include=["summary"]), they are
+        first extracted from its saved summary; if the thread is unknown (e.g. expired)
+        and `resume_summary` is provided, from that summary.
 
     Args:
         req (ResumeCheckpointRequest): Includes `thread_id` and optionally the `resume_summary`.
@@ -111,14 +693,178 @@ async def resume_question(req: ResumeCheckpointRequest):
     Returns:
         JSONResponse: Contains generated interview questions or error message.
     """
-    # Prepare initial state from existing summary
-    state = {}
-    if req.resume_summary:
-        state["summary"] = req.resume_summary
+    config = {"configurable": {"thread_id": req.thread_id}}
 
-    # Attempt to generate interview questions directly from the summary
     try:
-        result = generate_interview_questions({"summary": req.resume_summary})
+        # Load the checkpointed state for this thread
+        snapshot = await graph_app.aget_state(config)
+        insights = (snapshot.values or {}).get("insights")
+
+        if not insights:
+            # Threads analyzed with include=["summary"] have a summary but no insights yet
+            summary = (snapshot.values or {}).get("summary") or req.resume_summary
+            if not summary:
+                return JSONResponse(
+                    content={"error": f"No saved insights for thread_id '{req.thread_id}'"},
+                    status_code=404
+                )
+            # Fall back to deriving insights from the saved or client-supplied summary
+            extracted = await aextract_insights(summary)
+            if "insights" not in extracted:
+                return JSONResponse(content=extracted, status_code=500)
+            insights = extracted["insights"]
+
+        result = await agenerate_interview_questions(insights)
+
+        # Keep the checkpoint in sync with the latest insights and questions
+        if "questions" in result and snapshot.values:
+            await graph_app.aupdate_state(
+                config, {"insights": insights, "questions": result["questions"]}, as_node="generate_questions"
+            )
+
         return JSONResponse(content=result)
     except Exception as e:
         return JSONResponse(content={"error": str(e)}, status_code=500)
+
+
+@app.get("/analysis/{thread_id}", tags=["Resume analysis"])
+async def get_analysis(thread_id: str):
+    """
+    GET /analysis/{thread_id}
+
+    Description:
+        Returns the checkpointed outputs of an analysis, e.g. to collect the insights
+        and questions of a deferred run once they are ready. `status` is "pending"
+        while a deferred run is still in progress, "error" if its remaining stages
+        failed, and "complete" otherwise.
+
+    Args:
+        thread_id (str): The thread_id returned by /analyze-resume.
+
+    Returns:
+        JSONResponse: status, summary, insights, questions and extraction details.
+    """
+    snapshot = await graph_app.aget_state({"configurable": {"thread_id": thread_id}})
+    values = snapshot.values or {}
+    if not values:
+        return JSONResponse(content={"error": f"Unknown thread_id '{thread_id}'"}, status_code=404)
+
+    if thread_id in deferred_runs or await state_backend.aget(_pending_key(thread_id)) is not None:
+        status = "pending"
+    elif values.get("error"):
+        status = "error"
+    else:
+        status = "complete"
+
+    return JSONResponse(content={
+        "thread_id": thread_id,
+        "status": status,
+        "summary": values.get("summary"),
+        "insights": values.get("insights"),
+        "questions": values.get("questions"),
+        "extraction_mode": values.get("extraction_mode"),
+        "extraction_sources": values.get("extraction_sources"),
+        "partial_errors": partial_errors(values),
+        "error": values.get("error"),
+    })
+
+
+@app.get("/search", tags=["Candidate search"])
+async def search_candidates(
+    q: Optional[str] = None,
+    skills: Optional[str] = None,
+    role: Optional[str] = None,
+    company: Optional[str] = None,
+    degree: Optional[str] = None,
+    institution: Optional[str] = None,
+    min_years: Optional[float] = Query(None, ge=0),
+    max_years: Optional[float] = Query(None, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+):
+    """
+    GET /search
+
+    Description:
+        Ranked search over every analyzed candidate, answered from the candidate store's
+        inverted index (BM25 over skills, roles, companies, degrees, institutions and
+        summary), with years of experience computed from the work entries' dates at
+        query time. No LLM calls are made.
+        - q: free-text terms; candidates matching more / rarer terms rank higher
+        - skills, role, company, degree, institution: required phrase in that field
+        - min_years / max_years: range on years of experience (from work entry dates)
+        Without any text, candidates in the years range are listed most experienced first.
+
+    Returns:
+        JSONResponse: {"results": [{thread_id, score, years_experience, summary, roles,
+        companies, degrees, institutions}], "took_ms"}; 404 if the store is disabled.
+    """
+    if candidate_store is None:
+        return JSONResponse(content={"error": "The candidate store is disabled"}, status_code=404)
+
+    filters = {"skills": skills, "roles": role, "companies": company, "degrees": degree, "institutions": institution}
+    started = time.perf_counter()
+    results = await asyncio.to_thread(
+        candidate_store.search,
+        q,
+        {field: value for field, value in filters.items() if value},
+        min_years,
+        max_years,
+        limit,
+        offset,
+    )
+    return JSONResponse(content={
+        "results": results,
+        "took_ms": round((time.perf_counter() - started) * 1000, 2),
+    })
+
+
+@app.get("/llm-stats", tags=["Monitoring"])
+async def llm_stats():
+    """
+    GET /llm-stats
+
+    Description:
+        Reports the state of the shared LLM response cache (number of in-memory
+        entries, whether the SQLite tier is enabled, hit/miss counters per node) and
+        per-node counters of malformed LLM output (salvaged locally, repaired with a
+        repair prompt, or failed), and the outbound scheduler's queue depth, requests
+        in flight, remaining RPM/TPM budget, retries and wait times, how many
+        analyses led or joined a coalesced run, the estimated input tokens saved
+        per node by the compact prompt encoding, and how often each node's fast-model
+        output was escalated to the strong model (and why).
+
+    Returns:
+        JSONResponse: Cache, parse, routing, scheduler, coalescing and prompt encoding statistics.
+    """
+    return JSONResponse(content={
+        "cache": llm_cache.stats(),
+        "parsing": parse_stats(),
+        "routing": routing_stats(),
+        "scheduler": scheduler.stats(),
+        "coalescing": single_flight.stats(),
+        "prompt_encoding": prompt_savings(),
+    })
+
+
+@app.get("/metrics", tags=["Monitoring"])
+async def metrics():
+    """
+    GET /metrics
+
+    Description:
+        Exposes metrics in the Prometheus text format:
+        - resume_node_duration_seconds: latency histogram per graph node
+        - resume_http_request_duration_seconds: latency histogram per endpoint and status
+        - resume_llm_call_duration_seconds / resume_llm_calls_total: LLM latency and calls per node and model
+        - resume_llm_tokens_total: prompt / completion tokens per node and model (from response metadata)
+        - resume_llm_cost_total: estimated spend per node and model (LLM_MODEL_PRICES, else LLM_COST_PER_1K_*)
+        - resume_node_errors_total / resume_llm_errors_total: errors per node
+        - resume_llm_parse_events_total: structured-output parse outcomes per node
+        - resume_llm_routing_total: fast-model results accepted / escalated per node
+        - scheduler queue depth, requests in flight, cache hits and coalesced runs in flight
+
+    Returns:
+        PlainTextResponse: The metrics in text exposition format 0.0.4.
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
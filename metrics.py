@@ -0,0 +1,275 @@
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import bisect
+import functools
+import threading
+import time
+
+from config import settings
+
+
+# Latency buckets in seconds (LLM-bound stages take from ~100 ms to tens of seconds)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+
+
+def _escape(value: str) -> str:
+    """
+    Escapes a label value for the Prometheus text format.
+    """
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    """
+    Renders a `{name="value",...}` label set.
+    """
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter:
+    """
+    Monotonically increasing counter with optional labels.
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class Histogram:
+    """
+    Cumulative histogram with optional labels.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            # Per series: one count per bucket, then +Inf count, then sum
+            series = self._series.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            series[bisect.bisect_left(self.buckets, value)] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0.0
+                for bound, count in zip(self.buckets, series):
+                    cumulative += count
+                    bucket_labels = _labels(self.labelnames, key, 'le="%s"' % bound)
+                    lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+                cumulative += series[len(self.buckets)]
+                bucket_labels = _labels(self.labelnames, key, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+                lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {series[-1]}")
+                lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """
+    Gauge whose samples are read from a callback at scrape time.
+
+    The callback returns a list of (label values, value) pairs.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str],
+        collect: Callable[[], List[Tuple[Tuple[str, ...], float]]],
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.collect = collect
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        for key, value in self.collect():
+            lines.append(f"{self.name}{_labels(self.labelnames, tuple(map(str, key)))} {value}")
+        return lines
+
+
+class Registry:
+    """
+    Holds metrics and renders them in the Prometheus text exposition format.
+    """
+
+    def __init__(self):
+        self._metrics: List[Any] = []
+
+    def register(self, metric: Any) -> Any:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+NODE_LATENCY = registry.register(Histogram(
+    "resume_node_duration_seconds", "Wall-clock latency of each graph node.", ["node"]
+))
+NODE_ERRORS = registry.register(Counter(
+    "resume_node_errors_total", "Graph node runs that raised or returned an error.", ["node"]
+))
+HTTP_LATENCY = registry.register(Histogram(
+    "resume_http_request_duration_seconds", "Latency of HTTP requests per endpoint.", ["method", "path", "status"]
+))
+LLM_LATENCY = registry.register(Histogram(
+    "resume_llm_call_duration_seconds", "Latency of LLM calls (including scheduler queueing).", ["node", "model"]
+))
+LLM_CALLS = registry.register(Counter(
+    "resume_llm_calls_total", "LLM calls per node and model; cached=true calls were served from the cache.",
+    ["node", "model", "cached"],
+))
+LLM_ERRORS = registry.register(Counter(
+    "resume_llm_errors_total", "LLM calls that failed after retries.", ["node"]
+))
+LLM_TOKENS = registry.register(Counter(
+    "resume_llm_tokens_total", "Tokens sent to / generated by the LLM, from response metadata.", ["node", "model", "kind"]
+))
+LLM_COST = registry.register(Counter(
+    "resume_llm_cost_total", "Estimated LLM spend, from token counts and the configured per-1k prices of each model.",
+    ["node", "model"],
+))
+PARSE_EVENTS = registry.register(Counter(
+    "resume_llm_parse_events_total",
+    "Structured-output parsing outcomes per node (parsed, salvaged, repair_prompts, repair_succeeded, failed).",
+    ["node", "outcome"],
+))
+MODEL_ROUTING = registry.register(Counter(
+    "resume_llm_routing_total",
+    "Fast-model attempts per node: accepted, or escalated to the strong model (validation, quality, error).",
+    ["node", "outcome"],
+))
+PROMPT_TOKENS_SAVED = registry.register(Counter(
+    "resume_prompt_tokens_saved_total",
+    "Estimated input tokens saved by compact prompt encoding, versus the repr-based prompts.",
+    ["node"],
+))
+
+
+# Per-request list of (node, seconds), collected when timing logs are enabled
+_request_timings: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("request_timings", default=None)
+
+
+def start_request_timings() -> List[Tuple[str, float]]:
+    """
+    Starts collecting node timings for the current request and returns the (shared) list.
+    """
+    timings: List[Tuple[str, float]] = []
+    _request_timings.set(timings)
+    return timings
+
+
+# Start of the summary text generate_summary returns when generation fails
+SUMMARY_ERROR_PREFIX = "Error generating summary"
+
+
+def is_error_result(result: Any) -> bool:
+    """
+    True if a node update carries an error: a top-level 'error', a section dict with
+    'error', or a 'summary' that is the summary node's error message.
+    """
+    if not isinstance(result, dict):
+        return False
+    if "error" in result:
+        return True
+    summary = result.get("summary")
+    if isinstance(summary, str) and summary.startswith(SUMMARY_ERROR_PREFIX):
+        return True
+    return any(isinstance(value, dict) and "error" in value for value in result.values())
+
+
+def instrument_node(name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wraps an async graph node to record its latency and errors.
+
+    The wrapper keeps the node's signature (via functools.wraps), so LangGraph still
+    passes `config` to nodes that accept it.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            result = await func(*args, **kwargs)
+        except Exception:
+            NODE_ERRORS.inc(node=name)
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            NODE_LATENCY.observe(elapsed, node=name)
+            timings = _request_timings.get()
+            if timings is not None:
+                timings.append((name, round(elapsed, 4)))
+        if is_error_result(result):
+            NODE_ERRORS.inc(node=name)
+        return result
+
+    return wrapper
+
+
+def model_prices(model: str) -> Tuple[float, float]:
+    """
+    Returns the (input, output) price of 1,000 tokens of `model`, falling back to the default pair.
+    """
+    return settings.llm_model_prices.get(
+        model, (settings.llm_cost_per_1k_input_tokens, settings.llm_cost_per_1k_output_tokens)
+    )
+
+
+def record_llm_call(node: str, model: str, seconds: float, usage: Dict[str, int], cached: bool) -> None:
+    """
+    Records one LLM call: latency, call count and (for uncached calls) token usage and cost,
+    labelled with the node and the model that served it.
+    """
+    LLM_CALLS.inc(node=node, model=model, cached=str(cached).lower())
+    if cached:
+        return
+    LLM_LATENCY.observe(seconds, node=node, model=model)
+    LLM_TOKENS.inc(usage.get("input_tokens", 0), node=node, model=model, kind="prompt")
+    LLM_TOKENS.inc(usage.get("output_tokens", 0), node=node, model=model, kind="completion")
+    input_price, output_price = model_prices(model)
+    cost = (usage.get("input_tokens", 0) * input_price + usage.get("output_tokens", 0) * output_price) / 1000
+    if cost:
+        LLM_COST.inc(cost, node=node, model=model)
@@ -0,0 +1,151 @@
+from typing import List, Tuple
+import re
+
+
+# Common resume section headings (matched case-insensitively on their own line)
+SECTION_HEADINGS = (
+    "summary", "profile", "professional summary", "objective", "about me",
+    "experience", "work experience", "professional experience", "employment",
+    "employment history", "work history", "career history", "relevant experience",
+    "education", "academic background", "academic history", "qualifications",
+    "skills", "technical skills", "core competencies",
+    "projects", "publications", "research", "research experience", "teaching", "teaching experience",
+    "certifications", "certificates", "awards", "honors", "honours", "grants",
+    "languages", "interests", "volunteer", "volunteering", "references", "activities",
+    "presentations", "talks", "patents", "memberships", "affiliations",
+)
+
+_HEADING_RE = re.compile(
+    r"^\s*(?:#+\s*)?(?P<title>" + "|".join(re.escape(h) for h in sorted(SECTION_HEADINGS, key=len, reverse=True))
+    + r")\s*:?\s*$",
+    re.IGNORECASE,
+)
+
+# Short all-caps lines such as "WORK EXPERIENCE" are treated as headings too
+_CAPS_HEADING_RE = re.compile(r"^\s*[A-Z][A-Z &/\-]{2,40}:?\s*$")
+
+
+def normalize_whitespace(text: str) -> str:
+    """
+    Normalizes whitespace in raw resume text.
+
+    - Unifies line endings and converts tabs / non-breaking spaces to spaces.
+    - Collapses runs of spaces and strips each line.
+    - Collapses three or more consecutive newlines into a single blank line.
+
+    Args:
+        text (str): Raw resume text.
+
+    Returns:
+        str: The normalized text.
+    """
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    text = text.replace("\t", " ").replace("\u00a0", " ")
+    lines = [re.sub(r" {2,}", " ", line).strip() for line in text.split("\n")]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token estimate (about four characters per token for English text).
+    """
+    return len(text) // 4 + 1
+
+
+def is_heading(line: str) -> bool:
+    """
+    Returns True if a line looks like a resume section heading.
+    """
+    return bool(_HEADING_RE.match(line) or _CAPS_HEADING_RE.match(line))
+
+
+def split_sections(text: str) -> List[Tuple[str, str]]:
+    """
+    Splits resume text into (heading, body) sections.
+
+    Text before the first detected heading is returned with an empty heading.
+
+    Args:
+        text (str): Normalized resume text.
+
+    Returns:
+        List[Tuple[str, str]]: Sections in document order.
+    """
+    sections: List[Tuple[str, List[str]]] = [("", [])]
+    for line in text.split("\n"):
+        if is_heading(line):
+            sections.append((line.strip().rstrip(":"), []))
+        else:
+            sections[-1][1].append(line)
+    return [
+        (heading, "\n".join(body).strip())
+        for heading, body in sections
+        if heading or "\n".join(body).strip()
+    ]
+
+
+def _split_oversized(heading: str, body: str, max_tokens: int) -> List[str]:
+    """
+    Splits one section that exceeds the budget into paragraph- (then line-) sized pieces,
+    repeating the heading on every piece so each chunk keeps its context.
+    """
+    prefix = f"{heading}\n" if heading else ""
+    units: List[str] = []
+    for paragraph in body.split("\n\n"):
+        if estimate_tokens(prefix + paragraph) <= max_tokens:
+            units.append(paragraph)
+        else:
+            units.extend(line for line in paragraph.split("\n") if line)
+
+    pieces: List[str] = []
+    current = ""
+    for unit in units:
+        candidate = f"{current}\n\n{unit}" if current else unit
+        if current and estimate_tokens(prefix + candidate) > max_tokens:
+            pieces.append(prefix + current)
+            current = unit
+        else:
+            current = candidate
+    if current:
+        pieces.append(prefix + current)
+    return pieces
+
+
+def chunk_resume(text: str, max_tokens: int) -> List[str]:
+    """
+    Splits resume text into section-aware chunks that each fit a token budget.
+
+    Whole sections are packed together greedily; a section that is larger than the
+    budget on its own is split on paragraph and line boundaries. Text that fits the
+    budget is returned as a single chunk.
+
+    Args:
+        text (str): Normalized resume text.
+        max_tokens (int): Approximate token budget per chunk.
+
+    Returns:
+        List[str]: The chunks in document order.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return [text]
+
+    blocks: List[str] = []
+    for heading, body in split_sections(text):
+        block = f"{heading}\n{body}" if heading else body
+        if estimate_tokens(block) <= max_tokens:
+            blocks.append(block)
+        else:
+            blocks.extend(_split_oversized(heading, body, max_tokens))
+
+    chunks: List[str] = []
+    current = ""
+    for block in blocks:
+        candidate = f"{current}\n\n{block}" if current else block
+        if current and estimate_tokens(candidate) > max_tokens:
+            chunks.append(current)
+            current = block
+        else:
+            current = candidate
+    if current:
+        chunks.append(current)
+    return chunks
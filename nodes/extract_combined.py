@@ -0,0 +1,134 @@
+from typing import Callable, Dict, Any, Optional
+from nodes.model_router import acall_routed
+from nodes.stream_parser import entry_streamer
+from nodes.prompt_encoding import tidy_prompt
+from nodes.extract_work import WorkExperience, WorkExperienceList, check_work_experience
+from nodes.extract_education import Education, EducationList, check_education
+import asyncio
+
+
+class ResumeExtraction(WorkExperienceList, EducationList):
+    """
+    A Pydantic model combining both extraction schemas, so work experience and
+    education can be extracted from a single LLM call.
+
+    Attributes:
+        work_experiences (List[WorkExperience]): Structured work experience records.
+        education (List[Education]): Structured education records.
+    """
+
+
+# Same deterministic settings as the individual extraction nodes
+TEMPERATURE = 0
+
+
+def _build_prompt(resume_text: str) -> str:
+    """
+    Builds the prompt instructing the LLM to output work experience and education as one JSON object.
+    """
+    return tidy_prompt(f"""
+    Extract all work experience and education details from the following resume in this JSON format:
+    {{
+    "work_experiences": [
+        {{
+        "company": "...",
+        "role": "...",
+        "start_date": "YYYY-MM",
+        "end_date": "YYYY-MM or Present",
+        "description": "..."
+        }}
+    ],
+    "education": [
+        {{
+        "institution": "...",
+        "degree": "...",
+        "field": "...",
+        "start_date": "YYYY-MM",
+        "end_date": "YYYY-MM or Present"
+        }}
+    ]
+    }}
+    Resume:
+    \"\"\"
+    {resume_text}
+    \"\"\"
+
+    Only return valid JSON. No explanations or formatting. No markdown or triple backticks.
+    """, "extract_combined")
+
+
+def _split_sections(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Splits a validated ResumeExtraction dict into the shapes the individual nodes return.
+    """
+    return {
+        "work": {"work_experiences": data["work_experiences"]},
+        "education": {"education": data["education"]},
+    }
+
+
+def check_extraction(parsed: Dict[str, Any]) -> Optional[str]:
+    """
+    Quality check for fast-model output, combining the work and education checks.
+    """
+    return check_work_experience(parsed) or check_education(parsed)
+
+
+async def aextract_work_and_education(
+    resume_text: str,
+    on_entry: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Extracts work experience and education from resume text with a single LLM call.
+
+    The resume is sent to the model once instead of twice, halving input tokens and
+    the number of requests counted against the provider's rate limit.
+
+    Args:
+        resume_text (str): Raw resume content as a string.
+        on_entry (Optional[Callable[[str, Dict[str, Any]], None]]): If given, the completion is
+            streamed and ("work_experiences" | "education", entry) is passed on as soon as
+            each entry is complete.
+
+    Returns:
+        Dict[str, Any]: A dictionary with:
+            - 'work': {"work_experiences": [...]} or an error message
+            - 'education': {"education": [...]} or an error message
+    """
+    prompt = _build_prompt(resume_text)
+
+    try:
+        # Send the prompt to the LLM once for both sections and validate against the combined schema
+        on_token = (
+            entry_streamer({"work_experiences": WorkExperience, "education": Education}, on_entry)
+            if on_entry else None
+        )
+        response = await acall_routed(
+            prompt, node="extract_combined", temperature=TEMPERATURE, model_cls=ResumeExtraction,
+            quality_check=check_extraction, on_token=on_token,
+        )
+
+        # Return both sections in the shapes expected by the rest of the graph
+        return _split_sections(response.parsed)
+
+    except Exception as e:
+        # Report the failure under both keys so downstream nodes see the same error shape
+        return {
+            "work": {"error": f"Work experience extraction failed: {str(e)}"},
+            "education": {"error": f"Education extraction failed: {str(e)}"},
+        }
+
+
+def extract_work_and_education(resume_text: str) -> Dict[str, Any]:
+    """
+    Synchronous wrapper around `aextract_work_and_education`.
+
+    Must not be called from inside a running event loop; use the async variant there.
+
+    Args:
+        resume_text (str): Raw resume content as a string.
+
+    Returns:
+        Dict[str, Any]: 'work' and 'education' results or error messages.
+    """
+    return asyncio.run(aextract_work_and_education(resume_text))
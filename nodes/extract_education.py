@@ -1,9 +1,10 @@
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional
 from pydantic import BaseModel, Field
-from langchain_groq import ChatGroq
-from langchain.schema import HumanMessage
-import json
-import os
+from nodes.model_router import acall_routed, check_entries
+from nodes.stream_parser import entry_streamer
+from nodes.prompt_encoding import tidy_prompt
+import asyncio
+import re
 
 class Education(BaseModel):
     """
@@ -24,35 +25,16 @@ class EducationList(BaseModel):
 
 
 
-# Initialize the Groq model using LangChain's ChatGroq class.
-llm = ChatGroq(
-    api_key=os.getenv("GROQ_API_KEY"), # Fetch API key securely from environment variable
-    model="gemma2-9b-it",# Use the fine-tuned gemma2-9b-it model from Groq
-    temperature=0 # Set temperature to 0 for deterministic outputs
-)
+# Temperature 0 for deterministic outputs
+TEMPERATURE = 0
 
 
 
-def extract_education(resume_text: str) -> Dict[str, Any]:
+def _build_prompt(resume_text: str) -> str:
     """
-    Extracts structured education history from unstructured resume text using a language model.
-
-    Args:
-        resume_text (str): Raw resume content as a string.
-
-    Returns:
-        Dict[str, Any]: A dictionary representation of the extracted education data,
-                        or an error message if extraction or validation fails.
-    
-    Workflow:
-    - Prompt the language model with specific instructions to extract education data in JSON format.
-    - Parse the model's JSON response into a Python dictionary.
-    - Validate the parsed data against the defined Pydantic models.
-    - Return the structured and validated data.
+    Builds the prompt instructing the LLM to extract education details and return only valid JSON.
     """
-
-    # Prompt to instruct the LLM to extract education details and return only valid JSON
-    prompt = f"""
+    return tidy_prompt(f"""
     Extract all education details from the following resume in this JSON format:
     {{
     "education": [
@@ -69,21 +51,110 @@ def extract_education(resume_text: str) -> Dict[str, Any]:
     \"\"\"
     {resume_text}
     \"\"\"
-    Only return valid JSON. No explanations or formatting. No markdown or triple backticks."""
+    Only return valid JSON. No explanations or formatting. No markdown or triple backticks.""", "extract_education")
 
-    try:
-        # Send prompt to the LLM and get the raw response
-        response = llm.invoke([HumanMessage(content=prompt)])
 
-        # Parse the LLM response from string to Python dictionary
-        parsed = json.loads(response.content.strip())
+def check_education(parsed: Dict[str, Any]) -> Optional[str]:
+    """
+    Quality check for fast-model output: every entry names its institution and degree and
+    uses normalized dates. An empty list is accepted, since a chunk may hold no education.
+    """
+    return check_entries(parsed["education"], ("institution", "degree"))
+
+
+async def aextract_education(
+    resume_text: str,
+    on_entry: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Extracts structured education history from unstructured resume text using a language model.
+
+    Args:
+        resume_text (str): Raw resume content as a string.
+        on_entry (Optional[Callable[[str, Dict[str, Any]], None]]): If given, the completion is
+            streamed and ("education", entry) is passed on as soon as each entry is complete.
+
+    Returns:
+        Dict[str, Any]: A dictionary representation of the extracted education data,
+                        or an error message if extraction or validation fails.
+    
+    Workflow:
+    - Prompt the language model with specific instructions to extract education data in JSON format.
+    - Await the model's response with `ainvoke` so the event loop is not blocked.
+    - Parse the model's JSON response into a Python dictionary.
+    - Validate the parsed data against the defined Pydantic models.
+    - Return the structured and validated data.
+    """
+    prompt = _build_prompt(resume_text)
 
-        # Validate the parsed dictionary against Pydantic schema
-        validated = EducationList(**parsed)
+    try:
+        # Send prompt to the LLM and get the raw response (parsed tolerantly, with one repair retry)
+        on_token = entry_streamer({"education": Education}, on_entry) if on_entry else None
+        response = await acall_routed(
+            prompt, node="extract_education", temperature=TEMPERATURE, model_cls=EducationList,
+            quality_check=check_education, on_token=on_token,
+        )
 
         # Return the validated data as a standard dictionary
-        return validated.dict()
+        return response.parsed
 
     except Exception as e:
         # Handle any exceptions and return an error message
         return {"error": f"Education extraction failed: {str(e)}"}
+
+
+def _dedupe_key(entry: Dict[str, Any]) -> tuple:
+    """
+    Normalized identity of an education entry (institution, degree).
+    """
+    normalize = lambda value: re.sub(r"[^a-z0-9]", "", (value or "").lower())
+    return (normalize(entry.get("institution")), normalize(entry.get("degree")))
+
+
+def merge_education(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merges extraction results from several resume chunks into one result.
+
+    Entries for the same institution and degree are deduplicated, preferring the one
+    with the most filled-in fields. An error is returned if every chunk failed; if only
+    some did, their entries are missing, so the merged result lists the failed chunks'
+    error messages under "partial_errors".
+
+    Args:
+        results (List[Dict[str, Any]]): Per-chunk outputs of `aextract_education`.
+
+    Returns:
+        Dict[str, Any]: {"education": [...]} (plus "partial_errors" if some chunks failed)
+                        or the first error message.
+    """
+    successful = [result for result in results if "education" in result]
+    if not successful:
+        return results[0] if results else {"education": []}
+    failed = [result.get("error", "Education extraction failed") for result in results if "education" not in result]
+
+    filled = lambda entry: sum(1 for value in entry.values() if value)
+    merged: Dict[tuple, Dict[str, Any]] = {}
+    for result in successful:
+        for entry in result["education"]:
+            key = _dedupe_key(entry)
+            kept = merged.get(key)
+            if kept is None or filled(entry) > filled(kept):
+                merged[key] = entry
+    if failed:
+        return {"education": list(merged.values()), "partial_errors": failed}
+    return {"education": list(merged.values())}
+
+
+def extract_education(resume_text: str) -> Dict[str, Any]:
+    """
+    Synchronous wrapper around `aextract_education`.
+
+    Must not be called from inside a running event loop; use the async variant there.
+
+    Args:
+        resume_text (str): Raw resume content as a string.
+
+    Returns:
+        Dict[str, Any]: Extracted education data or an error message.
+    """
+    return asyncio.run(aextract_education(resume_text))
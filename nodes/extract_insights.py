@@ -1,9 +1,8 @@
-from typing import Dict, Any, List
-from langchain_groq import ChatGroq
+from typing import Dict, Any, List, Optional
 from pydantic import BaseModel
-from langchain.schema import HumanMessage
-import os
-import json
+from nodes.model_router import acall_routed
+from nodes.prompt_encoding import tidy_prompt
+import asyncio
 
 
 
@@ -18,42 +17,15 @@ class ResumeInsights(BaseModel):
     insights: List[str]
 
 
-# The 'gemma2-9b-it' model is optimized for instruction-following tasks.
-llm = ChatGroq(
-    api_key=os.getenv("GROQ_API_KEY"),# Securely load the API key from environment variables
-    model="gemma2-9b-it",# Use the Gemma 2 9B instruction-tuned model
-    temperature=0 # Controls randomness; 0 allows some flexibility
-)
+# Temperature 0 for deterministic outputs
+TEMPERATURE = 0
 
 
-def extract_insights(summary_or_data: str) -> Dict[str, List[str]]:
+def _build_prompt(summary_or_data: str) -> str:
     """
-    Extracts meaningful career-related insights from a resume summary or structured resume data.
-
-    This function uses a language model to process raw or summarized resume content and extract
-    bullet-point style insights. These insights can include:
-        - Total years of experience
-        - Technical skills or achievements
-        - Leadership roles
-        - Education level and relevance
-
-    Args:
-        summary_or_data (str): A text summary or structured resume content.
-
-    Returns:
-        Dict[str, List[str]]: A dictionary containing a list of insights under the key "insights",
-                              or an error message if extraction or validation fails.
-
-    Workflow:
-        1. Build a natural language prompt that instructs the model to extract specific insights.
-        2. Send the prompt to the language model.
-        3. Parse the response string into a Python dictionary using `json.loads()`.
-        4. Validate the parsed data against the ResumeInsights Pydantic model.
-        5. Return the structured dictionary or an error message if any step fails.
+    Builds the prompt instructing the LLM to return a JSON list of bullet-point insights.
     """
-
-    # Prompt to instruct the LLM to return a JSON list of bullet-point insights
-    prompt = f"""
+    return tidy_prompt(f"""
     From the resume below, extract a JSON list of insights like:
     - Total years of experience
     - Key technical skills or achievements
@@ -75,21 +47,73 @@ def extract_insights(summary_or_data: str) -> Dict[str, List[str]]:
     \"\"\"
 
     Only return valid JSON. No explanations or formatting. No markdown or triple backticks.
+    """, "extract_insights")
+
+
+# Fewer insights than this from the fast model suggests it skimmed the resume
+MIN_INSIGHTS = 3
+
+
+def check_insights(parsed: Dict[str, Any]) -> Optional[str]:
     """
+    Quality check for fast-model output: at least MIN_INSIGHTS non-empty insights.
+    """
+    count = sum(1 for insight in parsed["insights"] if insight.strip())
+    return f"only {count} insights" if count < MIN_INSIGHTS else None
 
-    try:
-        # Send the prompt to the LLM and get the response
-        response = llm.invoke([HumanMessage(content=prompt)])
 
-        # Convert the raw JSON response string into a Python dictionary
-        parsed = json.loads(response.content.strip())
+async def aextract_insights(summary_or_data: str) -> Dict[str, List[str]]:
+    """
+    Extracts meaningful career-related insights from a resume summary or structured resume data.
+
+    This function uses a language model to process raw or summarized resume content and extract
+    bullet-point style insights. These insights can include:
+        - Total years of experience
+        - Technical skills or achievements
+        - Leadership roles
+        - Education level and relevance
+
+    Args:
+        summary_or_data (str): A text summary or structured resume content.
 
-        # Validate and enforce structure using Pydantic
-        validated = ResumeInsights(**parsed)
+    Returns:
+        Dict[str, List[str]]: A dictionary containing a list of insights under the key "insights",
+                              or an error message if extraction or validation fails.
+
+    Workflow:
+        1. Build a natural language prompt that instructs the model to extract specific insights.
+        2. Send the prompt to the language model with `ainvoke`.
+        3. Parse the response string tolerantly (fences, trailing text, truncation are repaired).
+        4. Validate the parsed data against the ResumeInsights Pydantic model.
+        5. Return the structured dictionary or an error message if any step fails.
+    """
+    prompt = _build_prompt(summary_or_data)
+
+    try:
+        # Send the prompt to the LLM and get the response (parsed tolerantly, with one repair retry)
+        response = await acall_routed(
+            prompt, node="extract_insights", temperature=TEMPERATURE, model_cls=ResumeInsights,
+            quality_check=check_insights,
+        )
 
         # Return the final validated dictionary
-        return validated.dict()
+        return response.parsed
 
     except Exception as e:
         # Handle errors (e.g., bad JSON, missing keys, etc.)
         return {"error": f"Error extracting insights: {str(e)}"}
+
+
+def extract_insights(summary_or_data: str) -> Dict[str, List[str]]:
+    """
+    Synchronous wrapper around `aextract_insights`.
+
+    Must not be called from inside a running event loop; use the async variant there.
+
+    Args:
+        summary_or_data (str): A text summary or structured resume content.
+
+    Returns:
+        Dict[str, List[str]]: Extracted insights or an error message.
+    """
+    return asyncio.run(aextract_insights(summary_or_data))
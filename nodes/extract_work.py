@@ -1,9 +1,10 @@
-from typing import Dict, Any, Optional, List
-from langchain_groq import ChatGroq
-from langchain.schema import HumanMessage
+from typing import Callable, Dict, Any, Optional, List
+from nodes.model_router import acall_routed, check_entries
+from nodes.stream_parser import entry_streamer
+from nodes.prompt_encoding import tidy_prompt
 from pydantic import BaseModel, Field
-import json
-import os
+import asyncio
+import re
 
 
 class WorkExperience(BaseModel):
@@ -34,35 +35,15 @@ class WorkExperienceList(BaseModel):
     work_experiences: List[WorkExperience]
 
 
-# Initialize the language model using the Groq API via LangChain.
-# This model will generate JSON-structured work experience information from raw resume text.
-llm = ChatGroq(
-    api_key=os.getenv("GROQ_API_KEY"),
-    model="gemma2-9b-it",               
-    temperature=0
-)
+# Temperature 0 for deterministic outputs
+TEMPERATURE = 0
 
 
-def extract_work_experience(resume_text: str) -> Dict[str, Any]:
+def _build_prompt(resume_text: str) -> str:
     """
-    Extracts structured work experience data from unstructured resume text using an LLM.
-
-    This function:
-    - Prompts a language model to extract work experience in a specific JSON format.
-    - Parses the model's output.
-    - Validates the parsed JSON against the defined Pydantic schema.
-    - Returns structured data or an error message if the process fails.
-
-    Args:
-        resume_text (str): Raw resume content as a string.
-
-    Returns:
-        Dict[str, Any]: A dictionary containing extracted work experience in a structured format,
-                        or an error message if parsing/validation fails.
+    Builds the prompt instructing the LLM to output only JSON-formatted work experience data.
     """
-
-    # Craft a prompt to instruct the LLM to output only JSON-formatted work experience data
-    prompt = f"""
+    return tidy_prompt(f"""
     Extract all work experience details from the following resume in this JSON format:
     {{
     "work_experiences": [
@@ -81,21 +62,113 @@ def extract_work_experience(resume_text: str) -> Dict[str, Any]:
     \"\"\"
 
     Only return valid JSON. No explanations or formatting. No markdown or triple backticks.
+    """, "extract_work")
+
+
+def check_work_experience(parsed: Dict[str, Any]) -> Optional[str]:
     """
+    Quality check for fast-model output: every entry names its company and role and uses
+    normalized dates. An empty list is accepted, since a chunk may hold no work history.
+    """
+    return check_entries(parsed["work_experiences"], ("company", "role"))
 
-    try:
-        # Send the crafted prompt to the LLM and receive a response
-        response = llm.invoke([HumanMessage(content=prompt)])
 
-        # Convert the LLM's string output to a Python dictionary
-        parsed = json.loads(response.content)
+async def aextract_work_experience(
+    resume_text: str,
+    on_entry: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Extracts structured work experience data from unstructured resume text using an LLM.
+
+    This function:
+    - Prompts a language model to extract work experience in a specific JSON format.
+    - Parses the model's output.
+    - Validates the parsed JSON against the defined Pydantic schema.
+    - Returns structured data or an error message if the process fails.
+
+    The LLM call is awaited with `ainvoke`, so the event loop stays free while
+    the request is in flight. With `on_entry`, the completion is streamed instead and
+    every WorkExperience is validated and passed on as soon as its JSON object is
+    complete; the returned dict (from the full output) remains the authoritative result.
+
+    Args:
+        resume_text (str): Raw resume content as a string.
+        on_entry (Optional[Callable[[str, Dict[str, Any]], None]]): Receives
+            ("work_experiences", entry) for each entry while the model is still generating.
+
+    Returns:
+        Dict[str, Any]: A dictionary containing extracted work experience in a structured format,
+                        or an error message if parsing/validation fails.
+    """
+    prompt = _build_prompt(resume_text)
 
-        # Validate the parsed JSON against the Pydantic schema
-        validated = WorkExperienceList(**parsed)
+    try:
+        # Send the crafted prompt to the LLM and receive a response (parsed tolerantly, with one repair retry)
+        on_token = entry_streamer({"work_experiences": WorkExperience}, on_entry) if on_entry else None
+        response = await acall_routed(
+            prompt, node="extract_work", temperature=TEMPERATURE, model_cls=WorkExperienceList,
+            quality_check=check_work_experience, on_token=on_token,
+        )
 
         # Return the structured data as a dictionary
-        return validated.dict()
+        return response.parsed
 
     except Exception as e:
         # If any error occurs during parsing or validation, return a structured error
         return {"error": f"Work experience extraction failed: {str(e)}"}
+
+
+def _dedupe_key(entry: Dict[str, Any]) -> tuple:
+    """
+    Normalized identity of a work experience entry (company, role, start date).
+    """
+    normalize = lambda value: re.sub(r"[^a-z0-9]", "", (value or "").lower())
+    return (normalize(entry.get("company")), normalize(entry.get("role")), entry.get("start_date") or "")
+
+
+def merge_work_experiences(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merges extraction results from several resume chunks into one result.
+
+    Entries describing the same job (same company, role and start date) are deduplicated,
+    keeping the one with the longest description. An error is returned if every chunk
+    failed; if only some did, their entries are missing, so the merged result lists the
+    failed chunks' error messages under "partial_errors".
+
+    Args:
+        results (List[Dict[str, Any]]): Per-chunk outputs of `aextract_work_experience`.
+
+    Returns:
+        Dict[str, Any]: {"work_experiences": [...]} (plus "partial_errors" if some chunks
+                        failed) or the first error message.
+    """
+    successful = [result for result in results if "work_experiences" in result]
+    if not successful:
+        return results[0] if results else {"work_experiences": []}
+    failed = [result.get("error", "Work experience extraction failed") for result in results if "work_experiences" not in result]
+
+    merged: Dict[tuple, Dict[str, Any]] = {}
+    for result in successful:
+        for entry in result["work_experiences"]:
+            key = _dedupe_key(entry)
+            kept = merged.get(key)
+            if kept is None or len(entry.get("description") or "") > len(kept.get("description") or ""):
+                merged[key] = entry
+    if failed:
+        return {"work_experiences": list(merged.values()), "partial_errors": failed}
+    return {"work_experiences": list(merged.values())}
+
+
+def extract_work_experience(resume_text: str) -> Dict[str, Any]:
+    """
+    Synchronous wrapper around `aextract_work_experience`.
+
+    Must not be called from inside a running event loop; use the async variant there.
+
+    Args:
+        resume_text (str): Raw resume content as a string.
+
+    Returns:
+        Dict[str, Any]: Extracted work experience or an error message.
+    """
+    return asyncio.run(aextract_work_experience(resume_text))
@@ -0,0 +1,53 @@
+from typing import Any, Dict, List
+import hashlib
+import json
+
+from nodes.chunking import normalize_whitespace, split_sections
+from nodes.rule_extractor import EDUCATION_HEADINGS, WORK_HEADINGS
+
+
+def fingerprint(value: Any) -> str:
+    """
+    Returns a short, stable hash of a string or JSON-serializable value.
+
+    Strings are whitespace-normalized first, so re-wrapped text keeps its fingerprint;
+    other values are serialized with sorted keys.
+    """
+    if isinstance(value, str):
+        payload = normalize_whitespace(value)
+    else:
+        payload = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def section_fingerprints(resume_text: str) -> Dict[str, str]:
+    """
+    Fingerprints the parts of a resume that each extraction node depends on.
+
+    Sections are found with the same heading detection used for chunking. The work
+    fingerprint covers every work-experience section and the education fingerprint
+    every education section, so an edit elsewhere (e.g. skills or contact details)
+    leaves both unchanged. If a resume has no recognizable section of a kind, that
+    kind falls back to the fingerprint of the whole document, so any edit re-runs it.
+
+    Args:
+        resume_text (str): Normalized resume text.
+
+    Returns:
+        Dict[str, str]: Fingerprints under 'document', 'work' and 'education'.
+    """
+    work: List[str] = []
+    education: List[str] = []
+    for heading, body in split_sections(resume_text):
+        lowered = (heading or "").lower()
+        if any(keyword in lowered for keyword in WORK_HEADINGS):
+            work.append(body)
+        elif any(keyword in lowered for keyword in EDUCATION_HEADINGS):
+            education.append(body)
+
+    document = fingerprint(resume_text)
+    return {
+        "document": document,
+        "work": fingerprint(work) if work else document,
+        "education": fingerprint(education) if education else document,
+    }
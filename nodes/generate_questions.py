@@ -1,9 +1,8 @@
-from typing import List, Dict, Any
-from langchain_groq import ChatGroq
+from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
-from langchain.schema import HumanMessage
-import os
-import json
+from nodes.model_router import acall_routed
+from nodes.prompt_encoding import encode_list, tidy_prompt
+import asyncio
 
 
 class InterviewQuestions(BaseModel):
@@ -16,35 +15,19 @@ class InterviewQuestions(BaseModel):
     questions: List[str]
 
 
-# Initialize the Groq-hosted large language model (LLM) via LangChain
-llm = ChatGroq(
-    api_key=os.getenv("GROQ_API_KEY"),
-    model="gemma2-9b-it",
-    temperature=0.3
-)
+# A little randomness gives more varied questions
+TEMPERATURE = 0.3
 
+# Number of questions the prompt asks for
+QUESTION_COUNT = 5
 
-def generate_interview_questions(insights: List[str]) -> Dict[str, List[str]]:
-    """
-    Generates a list of personalized interview questions based on candidate insights.
-
-    This function:
-    - Accepts a list of candidate-specific insights (skills, roles, achievements, etc.).
-    - Sends a prompt to an LLM to generate five tailored interview questions.
-    - Parses and validates the LLM response using a Pydantic schema.
-    - Returns the validated questions or an error message.
-
-    Args:
-        insights (List[str]): A list of bullet-pointed insights about the candidate.
 
-    Returns:
-        Dict[str, List[str]]: A dictionary with key `"questions"` containing the list of questions,
-                              or an error message if generation fails.
+def _build_prompt(insights: List[str]) -> str:
     """
-
-    # Prompt instructs the model to convert candidate insights into relevant interview questions
-    prompt = f"""
-    Given the candidate insights below, generate a JSON list of 5 interview questions tailored to their profile.
+    Builds the prompt instructing the model to convert candidate insights into interview questions.
+    """
+    return tidy_prompt(f"""
+    Given the candidate insights below, generate a JSON list of {QUESTION_COUNT} interview questions tailored to their profile.
 
     Return:
     {{
@@ -55,24 +38,64 @@ def generate_interview_questions(insights: List[str]) -> Dict[str, List[str]]:
     }}
 
     Insights:
-    {insights}
+    {encode_list(insights, "generate_questions")}
 
     Only return valid JSON. No explanations or formatting. No markdown or triple backticks.
+    """, "generate_questions")
+
+
+def check_questions(parsed: Dict[str, Any]) -> Optional[str]:
     """
+    Quality check for fast-model output: the requested number of non-empty questions.
+    """
+    count = sum(1 for question in parsed["questions"] if question.strip())
+    return f"{count} questions instead of {QUESTION_COUNT}" if count < QUESTION_COUNT else None
 
-    try:
-        # Invoke the LLM with the constructed prompt
-        response = llm.invoke([HumanMessage(content=prompt)])
 
-        # Parse the JSON response string into a Python dictionary
-        parsed = json.loads(response.content.strip())
+async def agenerate_interview_questions(insights: List[str]) -> Dict[str, List[str]]:
+    """
+    Generates a list of personalized interview questions based on candidate insights.
 
-        # Validate the dictionary using the InterviewQuestions Pydantic model
-        validated = InterviewQuestions(**parsed)
+    This function:
+    - Accepts a list of candidate-specific insights (skills, roles, achievements, etc.).
+    - Sends a prompt to an LLM (awaited with `ainvoke`) to generate five tailored interview questions.
+    - Parses and validates the LLM response using a Pydantic schema.
+    - Returns the validated questions or an error message.
+
+    Args:
+        insights (List[str]): A list of bullet-pointed insights about the candidate.
+
+    Returns:
+        Dict[str, List[str]]: A dictionary with key `"questions"` containing the list of questions,
+                              or an error message if generation fails.
+    """
+    prompt = _build_prompt(insights)
+
+    try:
+        # Invoke the LLM with the constructed prompt (parsed tolerantly, with one repair retry)
+        response = await acall_routed(
+            prompt, node="generate_questions", temperature=TEMPERATURE, model_cls=InterviewQuestions,
+            quality_check=check_questions,
+        )
 
         # Return the validated data as a dictionary
-        return validated.dict()
+        return response.parsed
 
     except Exception as e:
         # Catch any parsing/validation/LLM errors and return a structured error message
         return {"error": f"Error generating interview questions: {str(e)}"}
+
+
+def generate_interview_questions(insights: List[str]) -> Dict[str, List[str]]:
+    """
+    Synchronous wrapper around `agenerate_interview_questions`.
+
+    Must not be called from inside a running event loop; use the async variant there.
+
+    Args:
+        insights (List[str]): A list of bullet-pointed insights about the candidate.
+
+    Returns:
+        Dict[str, List[str]]: Generated questions or an error message.
+    """
+    return asyncio.run(agenerate_interview_questions(insights))
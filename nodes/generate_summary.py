@@ -1,17 +1,48 @@
-from typing import Dict, Any
-from langchain_groq import ChatGroq
-from langchain.schema import HumanMessage
-import os
+from typing import Callable, Dict, Any, Optional
+from metrics import SUMMARY_ERROR_PREFIX
+from nodes.model_router import acall_routed
+from nodes.prompt_encoding import encode_structured, tidy_prompt
+import asyncio
 
-# Instantiate a ChatGroq model with the following parameters:
-llm = ChatGroq(
-    api_key=os.getenv("GROQ_API_KEY"),
-    model="gemma2-9b-it",
-    temperature=0.3
-)
+# A little randomness gives more natural prose
+TEMPERATURE = 0.3
 
+# A shorter answer from the fast model is treated as a truncated or refused summary
+MIN_SUMMARY_WORDS = 40
 
-def generate_summary(structured_data: Dict[str, Any]) -> str:
+
+def _build_prompt(structured_data: Dict[str, Any]) -> str:
+    """
+    Builds the prompt asking the LLM to generate only summary text (not JSON or additional formatting).
+
+    The records are embedded in the compact one-line-per-entry encoding, within the
+    node's token budget (see `encode_structured`).
+    """
+    return tidy_prompt(f"""
+    Generate a professional, concise summary of this candidate's work experience and education:
+
+    Structured Resume Data (one line per entry):
+    {encode_structured(structured_data, "generate_summary")}
+
+    Return only the summary text.
+    """, "generate_summary")
+
+
+def check_summary(summary: str) -> Optional[str]:
+    """
+    Quality check for fast-model output: a prose paragraph of at least MIN_SUMMARY_WORDS words.
+    """
+    text = summary.strip()
+    if text.startswith(("{", "[", "```")):
+        return "summary is not prose"
+    words = len(text.split())
+    return f"summary has only {words} words" if words < MIN_SUMMARY_WORDS else None
+
+
+async def agenerate_summary(
+    structured_data: Dict[str, Any],
+    on_token: Optional[Callable[[str], None]] = None,
+) -> str:
     """
     Generates a professional summary paragraph from structured resume data.
 
@@ -21,9 +52,15 @@ def generate_summary(structured_data: Dict[str, Any]) -> str:
       - Education,
       - Key skills and achievements.
 
+    The LLM call is awaited with `ainvoke`, so the event loop stays free while
+    the request is in flight.
+
     Args:
         structured_data (Dict[str, Any]): Dictionary containing parsed resume components
                                           like education, work experience, and skills.
+        on_token (Optional[Callable[[str], None]]): If given, the summary is generated through
+                                                     the model's streaming API and each text
+                                                     chunk is passed here as it arrives.
 
     Returns:
         str: A single string containing the generated summary, or an error message if the
@@ -36,23 +73,32 @@ def generate_summary(structured_data: Dict[str, Any]) -> str:
         "skills": [...]
     }
     """
-
-    # Prompt asks the LLM to generate only summary text (not JSON or additional formatting)
-    prompt = f"""
-    Generate a professional, concise summary of this candidate's work experience and education:
-
-    Structured Resume Data:
-    {structured_data}
-
-    Return only the summary text.
-    """
+    prompt = _build_prompt(structured_data)
 
     try:
-        # Send prompt to the LLM and receive a response
-        response = llm.invoke([HumanMessage(content=prompt)])
+        # Send prompt to the LLM and receive a response (cached unless the node opts out)
+        response = await acall_routed(
+            prompt, node="generate_summary", temperature=TEMPERATURE, quality_check=check_summary, on_token=on_token
+        )
 
         # Return clean, stripped summary text
         return response.content.strip()
     except Exception as e:
         # In case of failure (LLM issues, parsing errors, etc.), return a readable error string
-        return f"Error generating summary: {str(e)}"
+        # Starts with SUMMARY_ERROR_PREFIX, so metrics and bulk runs count it as a failure
+        return f"{SUMMARY_ERROR_PREFIX}: {str(e)}"
+
+
+def generate_summary(structured_data: Dict[str, Any]) -> str:
+    """
+    Synchronous wrapper around `agenerate_summary`.
+
+    Must not be called from inside a running event loop; use the async variant there.
+
+    Args:
+        structured_data (Dict[str, Any]): Dictionary containing parsed resume components.
+
+    Returns:
+        str: The generated summary, or an error message if the generation fails.
+    """
+    return asyncio.run(agenerate_summary(structured_data))
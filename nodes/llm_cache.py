@@ -0,0 +1,201 @@
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+import json
+import threading
+import time
+
+from config import settings
+from state_backend import SQLiteStateBackend, StateBackend, get_state_backend
+
+
+def make_cache_key(model: str, temperature: float, prompt: str) -> str:
+    """
+    Builds a content-addressed cache key from the model, temperature and prompt.
+
+    Args:
+        model (str): Name of the LLM model.
+        temperature (float): Sampling temperature used for the call.
+        prompt (str): The full prompt sent to the model.
+
+    Returns:
+        str: A SHA-256 hex digest identifying the request.
+    """
+    payload = json.dumps([model, float(temperature), prompt], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    Two-tier cache for LLM responses.
+
+    Tiers:
+        - An in-process LRU bounded by `max_entries`, with per-entry TTL.
+        - An optional shared tier (`backend`) that survives restarts and is seen by every
+          worker process, with the same TTL.
+
+    Values are plain JSON-serializable dicts. Hit and miss counters are tracked per node.
+    The lock only guards the memory tier and the counters; shared-tier I/O happens outside
+    it, and async callers (`aget` / `aset`) run that I/O in a worker thread, so a slow
+    Redis or SQLite round trip never blocks the event loop or other lookups.
+    """
+
+    # Namespace of cache entries in the shared backend
+    KEY_PREFIX = "llm-cache:"
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 24 * 3600, backend: Optional[StateBackend] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._backend = backend
+
+    def _count(self, node: str, event: str) -> None:
+        """
+        Increments the counter for `event` (memory_hits, disk_hits, misses) on `node`.
+        """
+        node_counters = self._counters.setdefault(node, {"memory_hits": 0, "disk_hits": 0, "misses": 0})
+        node_counters[event] += 1
+
+    def _get_memory(self, key: str, node: str) -> Optional[Dict[str, Any]]:
+        """
+        Looks a key up in the memory tier, counting a hit; expired entries are dropped.
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at >= time.time():
+                    self._memory.move_to_end(key)
+                    self._count(node, "memory_hits")
+                    return value
+                del self._memory[key]
+            return None
+
+    def _shared_result(self, key: str, node: str, stored: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Records the outcome of a shared-tier lookup, promoting a hit into the memory tier.
+        """
+        with self._lock:
+            if stored is None:
+                self._count(node, "misses")
+                return None
+            self._put_memory(key, stored["value"], stored["expires_at"])
+            self._count(node, "disk_hits")
+            return stored["value"]
+
+    def get(self, key: str, node: str = "default") -> Optional[Dict[str, Any]]:
+        """
+        Looks up a cached value, checking memory first and then the shared tier.
+
+        Blocks on shared-tier I/O; use `aget` from async code.
+
+        Args:
+            key (str): Cache key produced by `make_cache_key`.
+            node (str): Name of the calling node, used for hit/miss counters.
+
+        Returns:
+            Optional[Dict[str, Any]]: The cached value, or None on a miss.
+        """
+        value = self._get_memory(key, node)
+        if value is not None:
+            return value
+        stored = self._backend.get_json(self.KEY_PREFIX + key) if self._backend is not None else None
+        return self._shared_result(key, node, stored)
+
+    async def aget(self, key: str, node: str = "default") -> Optional[Dict[str, Any]]:
+        """
+        Async variant of `get`; the shared-tier lookup runs in a worker thread.
+        """
+        value = self._get_memory(key, node)
+        if value is not None:
+            return value
+        stored = await self._backend.aget_json(self.KEY_PREFIX + key) if self._backend is not None else None
+        return self._shared_result(key, node, stored)
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        Stores a value in both tiers.
+
+        Blocks on shared-tier I/O; use `aset` from async code.
+
+        Args:
+            key (str): Cache key produced by `make_cache_key`.
+            value (Dict[str, Any]): JSON-serializable value to store.
+        """
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._put_memory(key, value, expires_at)
+        if self._backend is not None:
+            self._backend.set_json(self.KEY_PREFIX + key, {"value": value, "expires_at": expires_at}, self.ttl_seconds)
+
+    async def aset(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        Async variant of `set`; the shared-tier write runs in a worker thread.
+        """
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._put_memory(key, value, expires_at)
+        if self._backend is not None:
+            await self._backend.aset_json(
+                self.KEY_PREFIX + key, {"value": value, "expires_at": expires_at}, self.ttl_seconds
+            )
+
+    def _put_memory(self, key: str, value: Dict[str, Any], expires_at: float) -> None:
+        """
+        Inserts into the LRU tier and evicts the least recently used entries beyond capacity.
+        """
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Removes every entry from both tiers and resets the counters.
+        """
+        with self._lock:
+            self._memory.clear()
+            self._counters.clear()
+        if self._backend is not None:
+            self._backend.delete_prefix(self.KEY_PREFIX)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the current cache size and hit/miss counters per node.
+        """
+        with self._lock:
+            return {
+                "memory_entries": len(self._memory),
+                "persistent": self._backend is not None,
+                "backend": type(self._backend).__name__ if self._backend is not None else None,
+                "nodes": {node: dict(counters) for node, counters in self._counters.items()},
+            }
+
+
+def _shared_tier() -> Optional[StateBackend]:
+    """
+    Picks the cache's shared tier: the LLM_CACHE_DB_PATH file if set, otherwise the network
+    state backend if one is configured, otherwise none (memory only).
+    """
+    if settings.llm_cache_db_path:
+        return SQLiteStateBackend(settings.llm_cache_db_path, table="llm_cache_entries")
+    if settings.state_backend != "sqlite":
+        return get_state_backend()
+    return None
+
+
+# Shared cache instance used by every node
+llm_cache = LLMCache(
+    max_entries=settings.llm_cache_max_entries,
+    ttl_seconds=settings.llm_cache_ttl_seconds,
+    backend=_shared_tier(),
+)
+
+
+def cache_enabled_for(node: str) -> bool:
+    """
+    Returns True if responses for `node` may be served from / stored in the cache.
+    """
+    return settings.llm_cache_enabled and node not in settings.llm_cache_disabled_nodes
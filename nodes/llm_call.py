@@ -0,0 +1,176 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, Optional
+from langchain.schema import HumanMessage
+import time
+
+from config import settings
+from metrics import LLM_ERRORS, record_llm_call
+from nodes.chunking import estimate_tokens
+from nodes.llm_cache import llm_cache, make_cache_key, cache_enabled_for
+from nodes.scheduler import scheduler
+
+
+@dataclass
+class LLMResponse:
+    """
+    Result of a single LLM call made through `call_llm`.
+
+    Attributes:
+        content (str): Raw text returned by the model.
+        parsed (Any): Output of the caller's parser, if one was given.
+        usage (Dict[str, int]): Token counts (input_tokens, output_tokens, total_tokens).
+        cached (bool): True if the response was served from the cache.
+    """
+    content: str
+    parsed: Any = None
+    usage: Dict[str, int] = field(default_factory=dict)
+    cached: bool = False
+
+
+# Usage accumulator for the current task (see `track_usage`)
+_usage_tracker: ContextVar[Optional[Dict[str, int]]] = ContextVar("llm_usage_tracker", default=None)
+
+
+@contextmanager
+def track_usage() -> Iterator[Dict[str, int]]:
+    """
+    Collects token usage of every `call_llm` made inside the block.
+
+    Calls made by tasks spawned inside the block (e.g. via asyncio.gather) are included,
+    because they inherit the context. Cached responses count as calls but add no tokens.
+
+    Yields:
+        Dict[str, int]: Running totals (calls, cached_calls, input_tokens, output_tokens, total_tokens).
+    """
+    usage = {"calls": 0, "cached_calls": 0, "input_tokens": 0, "output_tokens": 0, "total_tokens": 0}
+    token = _usage_tracker.set(usage)
+    try:
+        yield usage
+    finally:
+        _usage_tracker.reset(token)
+
+
+def _record_usage(usage: Dict[str, int], cached: bool) -> None:
+    """
+    Adds one call's usage to the active tracker, if any.
+    """
+    tracker = _usage_tracker.get()
+    if tracker is None:
+        return
+    tracker["calls"] += 1
+    if cached:
+        tracker["cached_calls"] += 1
+        return
+    for key in ("input_tokens", "output_tokens", "total_tokens"):
+        tracker[key] += usage.get(key, 0)
+
+
+def extract_usage(message: Any) -> Dict[str, int]:
+    """
+    Reads token usage from a LangChain chat message.
+
+    Prefers the standard `usage_metadata` and falls back to the provider's
+    `token_usage` block in `response_metadata`.
+    """
+    usage = getattr(message, "usage_metadata", None)
+    if usage:
+        return {
+            "input_tokens": int(usage.get("input_tokens", 0)),
+            "output_tokens": int(usage.get("output_tokens", 0)),
+            "total_tokens": int(usage.get("total_tokens", 0)),
+        }
+    token_usage = (getattr(message, "response_metadata", None) or {}).get("token_usage") or {}
+    return {
+        "input_tokens": int(token_usage.get("prompt_tokens", 0)),
+        "output_tokens": int(token_usage.get("completion_tokens", 0)),
+        "total_tokens": int(token_usage.get("total_tokens", 0)),
+    }
+
+
+async def call_llm(
+    llm: Any,
+    prompt: str,
+    *,
+    node: str,
+    parser: Optional[Callable[[str], Any]] = None,
+    on_token: Optional[Callable[[str], None]] = None,
+) -> LLMResponse:
+    """
+    Sends a single-message prompt to `llm`, going through the shared response cache
+    and, on a cache miss, the shared rate-limiting scheduler.
+
+    The cache key is a hash of model + temperature + prompt. A response is only
+    stored once `parser` accepts it (or, without a parser, once it is non-empty),
+    so malformed output is never replayed from the cache.
+
+    Args:
+        llm (Any): A LangChain chat model (e.g. ChatGroq).
+        prompt (str): The prompt text.
+        node (str): Name of the calling node, used for per-node opt-out and counters.
+        parser (Optional[Callable[[str], Any]]): Converts the raw text into the node's
+                                                  result; exceptions propagate to the caller.
+        on_token (Optional[Callable[[str], None]]): If given, the model is called through its
+                                                     streaming API and each text chunk is passed
+                                                     here as it arrives (a cache hit is passed
+                                                     as a single chunk).
+
+    Returns:
+        LLMResponse: The model's text, parsed result, token usage and cache flag.
+    """
+    use_cache = cache_enabled_for(node)
+    model = getattr(llm, "model_name", None) or getattr(llm, "model", "")
+    key = make_cache_key(model, getattr(llm, "temperature", 0) or 0, prompt)
+
+    if use_cache:
+        cached = await llm_cache.aget(key, node=node)
+        if cached is not None:
+            content = cached["content"]
+            if on_token is not None:
+                on_token(content)
+            _record_usage(cached.get("usage", {}), cached=True)
+            record_llm_call(node, model, 0.0, cached.get("usage", {}), cached=True)
+            return LLMResponse(
+                content=content,
+                parsed=parser(content) if parser else None,
+                usage=cached.get("usage", {}),
+                cached=True,
+            )
+
+    messages = [HumanMessage(content=prompt)]
+    streamed = False
+
+    async def request() -> Any:
+        nonlocal streamed
+        if on_token is None:
+            return await llm.ainvoke(messages)
+        # Stream the completion, forwarding each chunk and merging them into one message
+        merged = None
+        async for chunk in llm.astream(messages):
+            if chunk.content:
+                streamed = True
+                on_token(chunk.content)
+            merged = chunk if merged is None else merged + chunk
+        return merged
+
+    # Queue behind the RPM / TPM budgets; retries are only safe before anything was streamed
+    estimated = estimate_tokens(prompt) + settings.llm_expected_output_tokens
+    started = time.perf_counter()
+    try:
+        message = await scheduler.run(request, estimated_tokens=estimated, can_retry=lambda: not streamed)
+    except Exception:
+        LLM_ERRORS.inc(node=node)
+        raise
+    content = message.content if message is not None else ""
+    usage = extract_usage(message)
+    _record_usage(usage, cached=False)
+    record_llm_call(node, model, time.perf_counter() - started, usage, cached=False)
+    scheduler.reconcile(estimated, usage.get("total_tokens", 0))
+
+    # Parse before caching so that invalid output raises and is never stored
+    parsed = parser(content) if parser else None
+    if use_cache and content.strip():
+        await llm_cache.aset(key, {"content": content, "usage": usage})
+
+    return LLMResponse(content=content, parsed=parsed, usage=usage)
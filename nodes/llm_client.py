@@ -0,0 +1,173 @@
+from typing import Any, Callable, Dict, Optional, Tuple
+import asyncio
+import threading
+import weakref
+
+import httpx
+from langchain_groq import ChatGroq
+
+from config import settings
+
+
+# Every node gets its chat model from this registry (through `get_llm`, usually via the model
+# router) and only chooses a temperature, so no node constructs or owns a client.
+
+# Registry of constructed chat models, keyed by (model, temperature), for use outside an event loop
+_clients: Dict[Tuple[str, float], Any] = {}
+_lock = threading.Lock()
+
+# One pooled keep-alive transport per flavour, shared by every client in the registry
+_http_client: Optional[httpx.Client] = None
+_http_async_client: Optional[httpx.AsyncClient] = None
+
+# The async pool's connections belong to the event loop that opened them, so each running
+# loop (the server's, or one per `asyncio.run` in the sync node wrappers) gets its own
+# registry and async pool; both go away with the loop.
+_loop_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, float], Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+_loop_http_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# Optional override used to plug in a different model implementation (e.g. a fake for benchmarks)
+_factory: Optional[Callable[[str, float], Any]] = None
+
+
+def _limits() -> httpx.Limits:
+    """
+    Builds the connection pool limits from the shared settings.
+    """
+    return httpx.Limits(
+        max_connections=settings.llm_max_connections,
+        max_keepalive_connections=settings.llm_max_keepalive_connections,
+        keepalive_expiry=settings.llm_keepalive_expiry_seconds,
+    )
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """
+    Returns the running event loop, or None when called from synchronous code.
+    """
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _registry(loop: Optional[asyncio.AbstractEventLoop]) -> Dict[Tuple[str, float], Any]:
+    """
+    Returns the chat model registry for `loop` (None: outside an event loop).
+
+    Must be called with `_lock` held.
+    """
+    if loop is None:
+        return _clients
+    registry = _loop_clients.get(loop)
+    if registry is None:
+        registry = _loop_clients[loop] = {}
+    return registry
+
+
+def _http_clients(loop: Optional[asyncio.AbstractEventLoop]) -> Tuple[httpx.Client, httpx.AsyncClient]:
+    """
+    Returns the shared sync HTTP client and the async one for `loop`, creating them on first use.
+
+    Must be called with `_lock` held.
+    """
+    global _http_client, _http_async_client
+    timeout = httpx.Timeout(settings.llm_timeout_seconds)
+    if _http_client is None:
+        _http_client = httpx.Client(limits=_limits(), timeout=timeout)
+    if loop is None:
+        if _http_async_client is None:
+            _http_async_client = httpx.AsyncClient(limits=_limits(), timeout=timeout)
+        return _http_client, _http_async_client
+    http_async_client = _loop_http_async_clients.get(loop)
+    if http_async_client is None:
+        http_async_client = _loop_http_async_clients[loop] = httpx.AsyncClient(limits=_limits(), timeout=timeout)
+    return _http_client, http_async_client
+
+
+def _build_client(model: str, temperature: float, loop: Optional[asyncio.AbstractEventLoop]) -> Any:
+    """
+    Constructs a ChatGroq client that reuses the shared HTTP connection pools of `loop`.
+    """
+    http_client, http_async_client = _http_clients(loop)
+    return ChatGroq(
+        api_key=settings.groq_api_key,
+        model=model,
+        temperature=temperature,
+        max_retries=settings.llm_max_retries,
+        http_client=http_client,
+        http_async_client=http_async_client,
+    )
+
+
+def get_llm(temperature: float = 0, model: Optional[str] = None) -> Any:
+    """
+    Returns the shared chat model for the given model and temperature.
+
+    Clients are built lazily on first use and then reused by every node and request,
+    so the app starts without constructing any client and all calls share one
+    keep-alive connection pool. Calls on different event loops get separate clients,
+    since async connections cannot outlive their loop.
+
+    Args:
+        temperature (float): Sampling temperature.
+        model (Optional[str]): Model name; defaults to `settings.llm_model`.
+
+    Returns:
+        Any: A LangChain chat model (ChatGroq unless a factory override is installed).
+    """
+    key = (model or settings.llm_model, float(temperature))
+    loop = _running_loop()
+    client = (_clients if loop is None else _loop_clients.get(loop, {})).get(key)
+    if client is not None:
+        return client
+
+    with _lock:
+        # Another thread may have built it while we were waiting for the lock
+        registry = _registry(loop)
+        client = registry.get(key)
+        if client is None:
+            client = _factory(*key) if _factory is not None else _build_client(*key, loop)
+            registry[key] = client
+        return client
+
+
+def set_llm_factory(factory: Optional[Callable[[str, float], Any]]) -> None:
+    """
+    Installs (or removes, with None) a factory used instead of ChatGroq.
+
+    The factory receives (model, temperature). The registry is cleared so that
+    subsequent `get_llm` calls use the new factory.
+    """
+    global _factory
+    with _lock:
+        _factory = factory
+        _clients.clear()
+        _loop_clients.clear()
+
+
+async def aclose_clients() -> None:
+    """
+    Closes the shared HTTP connection pools and empties the registry.
+
+    Async pools of other event loops are dropped rather than closed, as they can only be
+    closed on their own loop.
+    """
+    global _http_client, _http_async_client
+    loop = asyncio.get_running_loop()
+    with _lock:
+        http_client = _http_client
+        http_async_clients = [_http_async_client, _loop_http_async_clients.get(loop)]
+        _http_client, _http_async_client = None, None
+        _clients.clear()
+        _loop_clients.clear()
+        _loop_http_async_clients.clear()
+    for http_async_client in http_async_clients:
+        if http_async_client is not None:
+            await http_async_client.aclose()
+    if http_client is not None:
+        http_client.close()
@@ -0,0 +1,178 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Type
+import re
+import threading
+
+from pydantic import BaseModel
+
+from config import settings
+from metrics import MODEL_ROUTING
+from nodes.llm_call import LLMResponse, call_llm
+from nodes.llm_client import get_llm
+from nodes.response_parser import ResponseParseError, acall_structured
+
+
+# Returns a reason why a parsed result is not good enough, or None to accept it
+QualityCheck = Callable[[Any], Optional[str]]
+
+# Dates the extraction prompts ask for: "YYYY-MM" or "Present"
+_DATE_PATTERN = re.compile(r"^(\d{4}-(0[1-9]|1[0-2])|Present)$")
+
+
+class QualityCheckError(ValueError):
+    """
+    Raised when a fast-model result is valid but fails the node's quality check.
+    """
+
+
+# Per-node routing counters:
+#   fast_calls  - calls that started on the fast model
+#   accepted    - fast-model results that passed validation and the quality check
+#   validation  - escalations because the output did not match the Pydantic schema
+#   quality     - escalations because the node's quality check rejected the output
+#   error       - escalations because the fast-model call failed (e.g. its quota ran out)
+_routing_stats: Dict[str, Dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+
+def _count(node: str, event: str) -> None:
+    """
+    Increments a routing counter for a node.
+    """
+    with _stats_lock:
+        counters = _routing_stats.setdefault(
+            node, {"fast_calls": 0, "accepted": 0, "validation": 0, "quality": 0, "error": 0}
+        )
+        counters[event] += 1
+    if event != "fast_calls":
+        MODEL_ROUTING.inc(node=node, outcome=event)
+
+
+def routing_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Returns a copy of the per-node routing counters, with the escalation rate of each node.
+    """
+    with _stats_lock:
+        stats = {node: dict(counters) for node, counters in _routing_stats.items()}
+    for counters in stats.values():
+        escalated = counters["validation"] + counters["quality"] + counters["error"]
+        counters["escalated"] = escalated
+        counters["escalation_rate"] = round(escalated / counters["fast_calls"], 4) if counters["fast_calls"] else 0.0
+    return stats
+
+
+def model_tiers(node: str, streaming: bool = False) -> List[str]:
+    """
+    Returns the models a node tries, in order.
+
+    A node with an entry in `settings.llm_node_models` always uses that model. A node in
+    `settings.llm_fast_nodes` tries `settings.llm_fast_model` first and escalates to
+    `settings.llm_model`, unless the call is `streaming` and `settings.llm_fast_streaming`
+    is off. Every other node uses `settings.llm_model` only.
+    """
+    pinned = settings.llm_node_models.get(node)
+    if pinned:
+        return [pinned]
+    fast = settings.llm_fast_model
+    routed = node in settings.llm_fast_nodes and (settings.llm_fast_streaming or not streaming)
+    if fast and fast != settings.llm_model and routed:
+        return [fast, settings.llm_model]
+    return [settings.llm_model]
+
+
+def check_entries(entries: Iterable[Dict[str, Any]], required: Iterable[str]) -> Optional[str]:
+    """
+    Quality check shared by the extraction nodes: every entry fills the `required` fields
+    and its dates use the "YYYY-MM" / "Present" format the prompt asks for.
+
+    Returns:
+        Optional[str]: The first problem found, or None.
+    """
+    for index, entry in enumerate(entries):
+        for name in required:
+            if not str(entry.get(name) or "").strip():
+                return f"entry {index} has no {name}"
+        for name in ("start_date", "end_date"):
+            value = entry.get(name)
+            if value and not _DATE_PATTERN.match(value):
+                return f"entry {index} has {name} '{value}' instead of YYYY-MM"
+    return None
+
+
+async def acall_routed(
+    prompt: str,
+    *,
+    node: str,
+    temperature: float = 0,
+    model_cls: Optional[Type[BaseModel]] = None,
+    quality_check: Optional[QualityCheck] = None,
+    on_token: Optional[Callable[[str], None]] = None,
+) -> LLMResponse:
+    """
+    Calls the node's model(s) per the routing policy (see `model_tiers`).
+
+    The fast model's output is accepted only if it validates against `model_cls` and
+    passes `quality_check`; otherwise the call is repeated on the strong model, which gets
+    the usual repair retry and whose result is returned as is. Both checks run as part of
+    the fast call's parser, so rejected output is never cached. Escalations are counted
+    per node and reason (see `routing_stats`).
+
+    Streamed calls skip the fast tier by default, so entries and tokens reach the consumer
+    as they are generated. With `settings.llm_fast_streaming`, the fast model's tokens are
+    held back and forwarded in one chunk once its result is accepted, so a consumer never
+    sees output that is later discarded; the strong model always streams live.
+
+    Args:
+        prompt (str): The node's prompt.
+        node (str): Name of the calling node (selects the tiers and labels the counters).
+        temperature (float): Sampling temperature.
+        model_cls (Optional[Type[BaseModel]]): Schema the output must satisfy; None for free text,
+                                               in which case `parsed` stays None.
+        quality_check (Optional[QualityCheck]): Receives the parsed dict (or the text, without
+                                                `model_cls`) and returns a reason to escalate, or None.
+        on_token (Optional[Callable[[str], None]]): Streaming callback, see `call_llm`.
+
+    Returns:
+        LLMResponse: The accepted response.
+    """
+    *fast_tiers, strong = model_tiers(node, streaming=on_token is not None)
+
+    # Parser hook of the fast calls: rejects output failing the quality check (and returns
+    # None, so free-text responses keep `parsed` empty)
+    def accept(result: Any) -> None:
+        reason = quality_check(result) if quality_check else None
+        if reason:
+            raise QualityCheckError(reason)
+
+    for model in fast_tiers:
+        _count(node, "fast_calls")
+        buffered: List[str] = []
+        buffer = buffered.append if on_token is not None else None
+        try:
+            if model_cls is not None:
+                response = await acall_structured(
+                    get_llm(temperature, model), prompt, node=node, model_cls=model_cls, on_token=buffer,
+                    repair=False, accept=accept,
+                )
+            else:
+                response = await call_llm(get_llm(temperature, model), prompt, node=node, on_token=buffer, parser=accept)
+        except ResponseParseError:
+            _count(node, "validation")
+            continue
+        except QualityCheckError:
+            _count(node, "quality")
+            continue
+        except Exception:
+            _count(node, "error")
+            continue
+
+        _count(node, "accepted")
+        if on_token is not None and buffered:
+            on_token("".join(buffered))
+        return response
+
+    # Strong tier: the final answer, with the repair retry for malformed output
+    if model_cls is not None:
+        return await acall_structured(
+            get_llm(temperature, strong), prompt, node=node, model_cls=model_cls, on_token=on_token
+        )
+    return await call_llm(get_llm(temperature, strong), prompt, node=node, on_token=on_token)
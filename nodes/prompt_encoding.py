@@ -0,0 +1,199 @@
+from typing import Any, Dict, List, Optional
+import re
+import threading
+
+from config import settings
+from metrics import PROMPT_TOKENS_SAVED
+from nodes.chunking import estimate_tokens
+
+
+# Descriptions are first cut to this many characters, then dropped, to fit a budget
+SHORT_DESCRIPTION_CHARS = 160
+
+# Values that carry no information for the model
+_EMPTY_STRINGS = ("", "none", "null", "n/a", "na", "-")
+
+# Per-node savings: prompts built, tokens the old encoding would have used, tokens actually used
+_savings: Dict[str, Dict[str, int]] = {}
+_savings_lock = threading.Lock()
+
+
+def _record_savings(node: str, baseline: str, compact: str, whole_prompt: bool) -> None:
+    """
+    Adds estimated token savings to the per-node counters and metrics.
+
+    `tidy_prompt` reports whole prompts (counted as sent); the encoders report only the
+    difference for the data they embed, since that data ends up inside the prompt.
+    """
+    baseline_tokens, compact_tokens = estimate_tokens(baseline), estimate_tokens(compact)
+    with _savings_lock:
+        counters = _savings.setdefault(node, {"prompts": 0, "baseline_tokens": 0, "compact_tokens": 0})
+        if whole_prompt:
+            counters["prompts"] += 1
+            counters["baseline_tokens"] += baseline_tokens
+            counters["compact_tokens"] += compact_tokens
+        else:
+            counters["baseline_tokens"] += baseline_tokens - compact_tokens
+    PROMPT_TOKENS_SAVED.inc(max(0, baseline_tokens - compact_tokens), node=node)
+
+
+def prompt_savings() -> Dict[str, Dict[str, int]]:
+    """
+    Returns per-node prompt counts and estimated token usage with and without compact encoding.
+    """
+    with _savings_lock:
+        return {
+            node: {**counters, "tokens_saved": counters["baseline_tokens"] - counters["compact_tokens"]}
+            for node, counters in _savings.items()
+        }
+
+
+def _is_empty(value: Any) -> bool:
+    """
+    True for None, empty containers and placeholder strings like "None" or "N/A".
+    """
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return value.strip().lower() in _EMPTY_STRINGS
+    if isinstance(value, (list, dict, tuple)):
+        return not value
+    return False
+
+
+def _text(value: Any) -> str:
+    """
+    Converts a value to a single line of text with collapsed whitespace.
+    """
+    return re.sub(r"\s+", " ", str(value)).strip()
+
+
+def _truncate(text: str, limit: Optional[int]) -> str:
+    """
+    Cuts `text` to at most `limit` characters at a word boundary (None = no limit).
+    """
+    if limit is None or len(text) <= limit:
+        return text
+    if limit <= 0:
+        return ""
+    cut = text[:limit].rsplit(" ", 1)[0] if " " in text[:limit] else text[:limit]
+    return cut.rstrip(" ,;.") + "…"
+
+
+def _dates(entry: Dict[str, Any]) -> str:
+    """
+    Renders a start/end date pair as 'start–end', omitting missing parts.
+    """
+    start, end = entry.get("start_date"), entry.get("end_date")
+    start = "" if _is_empty(start) else _text(start)
+    end = "" if _is_empty(end) else _text(end)
+    if start and end:
+        return f"{start}–{end}"
+    return start or end
+
+
+def encode_work(entry: Dict[str, Any], description_limit: Optional[int] = None) -> str:
+    """
+    Encodes one work experience as a single line: '- Role @ Company (dates): description'.
+    """
+    head = " @ ".join(_text(entry[key]) for key in ("role", "company") if not _is_empty(entry.get(key)))
+    dates = _dates(entry)
+    line = f"- {head}" + (f" ({dates})" if dates else "")
+    description = "" if _is_empty(entry.get("description")) else _truncate(_text(entry["description"]), description_limit)
+    return f"{line}: {description}" if description else line
+
+
+def encode_education(entry: Dict[str, Any]) -> str:
+    """
+    Encodes one education entry as a single line: '- Degree, Field @ Institution (dates)'.
+    """
+    degree = ", ".join(_text(entry[key]) for key in ("degree", "field") if not _is_empty(entry.get(key)))
+    head = " @ ".join(part for part in (degree, _text(entry.get("institution") or "")) if part)
+    dates = _dates(entry)
+    return f"- {head}" + (f" ({dates})" if dates else "")
+
+
+def _render_structured(work: List[Dict[str, Any]], education: List[Dict[str, Any]], limits: List[Optional[int]]) -> str:
+    """
+    Renders the WORK / EDUCATION blocks with per-entry description limits.
+    """
+    lines: List[str] = []
+    if work:
+        lines.append("WORK")
+        lines += [encode_work(entry, limit) for entry, limit in zip(work, limits)]
+    if education:
+        lines.append("EDUCATION")
+        lines += [encode_education(entry) for entry in education]
+    return "\n".join(lines) or "(no work experience or education found)"
+
+
+def encode_structured(structured: Dict[str, Any], node: str, budget: Optional[int] = None) -> str:
+    """
+    Encodes extracted work / education records for a prompt, compactly and within a token budget.
+
+    Each record becomes one line; null, empty and placeholder fields are dropped. If the
+    result exceeds the node's budget, descriptions are shortened by priority: entries
+    are assumed to be most-recent-first, so the oldest roles lose detail first (first
+    cut to SHORT_DESCRIPTION_CHARS, then removed). Titles, employers and dates are
+    always kept.
+
+    Args:
+        structured (Dict[str, Any]): {"work_experiences": [...], "education": [...]}.
+        node (str): Node the prompt is for; selects the budget and labels the savings report.
+        budget (Optional[int]): Token budget; defaults to `settings.prompt_token_budgets[node]`.
+
+    Returns:
+        str: The encoded records.
+    """
+    budget = budget if budget is not None else settings.prompt_token_budgets.get(node)
+    work = [entry for entry in structured.get("work_experiences") or [] if isinstance(entry, dict)]
+    education = [entry for entry in structured.get("education") or [] if isinstance(entry, dict)]
+
+    limits: List[Optional[int]] = [None] * len(work)
+    text = _render_structured(work, education, limits)
+    if budget:
+        for limit in (SHORT_DESCRIPTION_CHARS, 0):
+            for index in reversed(range(len(work))):
+                if estimate_tokens(text) <= budget:
+                    break
+                limits[index] = limit
+                text = _render_structured(work, education, limits)
+
+    # The previous prompts embedded the Python repr of the dict
+    _record_savings(node, str(structured), text, whole_prompt=False)
+    return text
+
+
+def encode_list(items: List[Any], node: str, budget: Optional[int] = None) -> str:
+    """
+    Encodes a list of strings (e.g. insights) as '- item' lines within a token budget.
+
+    Empty items are dropped; if the budget is exceeded, items are dropped from the end,
+    since earlier items are the most important ones.
+
+    Args:
+        items (List[Any]): The items.
+        node (str): Node the prompt is for; selects the budget and labels the savings report.
+        budget (Optional[int]): Token budget; defaults to `settings.prompt_token_budgets[node]`.
+
+    Returns:
+        str: The encoded list.
+    """
+    budget = budget if budget is not None else settings.prompt_token_budgets.get(node)
+    lines = [f"- {_text(item)}" for item in items if not _is_empty(item)]
+    while budget and len(lines) > 1 and estimate_tokens("\n".join(lines)) > budget:
+        lines.pop()
+    text = "\n".join(lines)
+    _record_savings(node, str(items), text, whole_prompt=False)
+    return text
+
+
+def tidy_prompt(prompt: str, node: str) -> str:
+    """
+    Strips the indentation and blank-line runs that prompt templates pick up from the
+    surrounding code, which the model does not need but still pays tokens for.
+    """
+    lines = [line.strip() for line in prompt.strip().splitlines()]
+    tidied = re.sub(r"\n{3,}", "\n\n", "\n".join(lines))
+    _record_savings(node, prompt, tidied, whole_prompt=True)
+    return tidied
@@ -0,0 +1,339 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+import ast
+import json
+import re
+import threading
+
+from pydantic import BaseModel
+
+from metrics import PARSE_EVENTS
+from nodes.llm_call import LLMResponse, call_llm
+
+
+class ResponseParseError(ValueError):
+    """
+    Raised when an LLM response cannot be turned into the expected Pydantic model.
+
+    Attributes:
+        content (str): The raw model output that failed to parse.
+    """
+
+    def __init__(self, message: str, content: str):
+        super().__init__(message)
+        self.content = content
+
+
+# Per-node parse counters:
+#   parsed           - valid JSON on the first try
+#   salvaged         - fixed locally (fences, trailing text, truncation, ...)
+#   repair_prompts   - a repair prompt had to be sent
+#   repair_succeeded - the repair prompt produced valid output
+#   failed           - no valid output at all (the LLM call was wasted)
+_parse_stats: Dict[str, Dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+
+def _count(node: str, event: str) -> None:
+    """
+    Increments a parse counter for a node.
+    """
+    with _stats_lock:
+        counters = _parse_stats.setdefault(
+            node, {"parsed": 0, "salvaged": 0, "repair_prompts": 0, "repair_succeeded": 0, "failed": 0}
+        )
+        counters[event] += 1
+    PARSE_EVENTS.inc(node=node, outcome=event)
+
+
+def parse_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Returns a copy of the per-node parse counters.
+    """
+    with _stats_lock:
+        return {node: dict(counters) for node, counters in _parse_stats.items()}
+
+
+def strip_fences(text: str) -> str:
+    """
+    Removes markdown code fences (``` or ```json) around the model output.
+    """
+    return re.sub(r"```(?:json|JSON)?", "", text).strip()
+
+
+def extract_json_object(text: str) -> Optional[str]:
+    """
+    Returns the outermost JSON object in `text`, ignoring any leading or trailing prose.
+
+    If the object is never closed (truncated output), everything from its opening
+    brace to the end of the text is returned.
+    """
+    start = text.find("{")
+    if start == -1:
+        return None
+    depth, in_string, escaped = 0, False, False
+    for index in range(start, len(text)):
+        char = text[index]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:index + 1]
+    return text[start:]
+
+
+def _close_truncated(text: str) -> str:
+    """
+    Closes an unterminated string and any open brackets, dropping a dangling key or comma.
+    """
+    stack = []
+    in_string, escaped = False, False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append(char)
+        elif char in "}]" and stack:
+            stack.pop()
+
+    if in_string:
+        text += '"'
+    text = text.rstrip()
+    # A key without a value (e.g. `, "description"` or `{"role":`) cannot be completed
+    if stack and stack[-1] == "{":
+        text = re.sub(r'(?:,|(?<=\{))\s*"[^"\\]*"\s*:?\s*$', "", text)
+    text = re.sub(r"[,:]\s*$", "", text)
+    return text + "".join("}" if bracket == "{" else "]" for bracket in reversed(stack))
+
+
+def _split_strings(text: str) -> List[Tuple[bool, str]]:
+    """
+    Splits JSON-like text into (is_string, piece) tokens, so fixes can skip string contents.
+
+    Single-quoted strings (Python literal syntax) are recognized as well.
+    """
+    pieces: List[Tuple[bool, str]] = []
+    start, quote, escaped = 0, None, False
+    for index, char in enumerate(text):
+        if quote is not None:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == quote:
+                pieces.append((True, text[start:index + 1]))
+                start, quote = index + 1, None
+        elif char in "\"'":
+            pieces.append((False, text[start:index]))
+            start, quote = index, char
+    pieces.append((quote is not None, text[start:]))
+    return pieces
+
+
+def _fix_outside_strings(text: str) -> str:
+    """
+    Removes trailing commas and converts Python literals (None / True / False) to JSON,
+    leaving string values untouched.
+    """
+    fixed = []
+    for is_string, piece in _split_strings(text):
+        if not is_string:
+            piece = re.sub(r",\s*([}\]])", r"\1", piece)
+            piece = re.sub(r"(?<=[:\[,\s])None(?=\s*[,}\]])", "null", piece)
+            piece = re.sub(r"(?<=[:\[,\s])True(?=\s*[,}\]])", "true", piece)
+            piece = re.sub(r"(?<=[:\[,\s])False(?=\s*[,}\]])", "false", piece)
+        fixed.append(piece)
+    return "".join(fixed)
+
+
+def repair_json(text: str) -> str:
+    """
+    Fixes common defects in model-produced JSON.
+
+    - Curly quotes are replaced with straight quotes.
+    - Trailing commas before a closing bracket are removed.
+    - Python literals (None / True / False) are converted to JSON.
+    - Truncated output is closed.
+
+    Only the JSON structure is changed; the contents of string values are left as they are.
+    """
+    text = text.replace("“", '"').replace("”", '"').replace("’", "'")
+    text = _close_truncated(text)
+    return _fix_outside_strings(text)
+
+
+def _load(candidate: str) -> Any:
+    """
+    Loads JSON, falling back to Python literal syntax (single-quoted dicts).
+    """
+    try:
+        return json.loads(candidate)
+    except json.JSONDecodeError:
+        return ast.literal_eval(candidate)
+
+
+def _validate(data: Any, model_cls: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    Validates `data` against `model_cls`; if that fails, drops list items that do not
+    validate (e.g. a half-written last entry) and tries again.
+
+    Each list is salvaged on its own, with the other lists emptied, so a bad item in one
+    list (e.g. work experience) does not cost the valid items of another (education).
+    """
+    try:
+        return model_cls(**data).dict()
+    except Exception:
+        if not isinstance(data, dict):
+            raise
+    emptied = {key: [] if isinstance(value, list) else value for key, value in data.items()}
+    salvaged = dict(data)
+    for key, value in data.items():
+        if not isinstance(value, list):
+            continue
+        kept = []
+        for item in value:
+            try:
+                model_cls(**{**emptied, key: kept + [item]})
+                kept.append(item)
+            except Exception:
+                continue
+        salvaged[key] = kept
+    return model_cls(**salvaged).dict()
+
+
+def parse_model(content: str, model_cls: Type[BaseModel], node: str = "default") -> Dict[str, Any]:
+    """
+    Parses raw LLM output into a validated dict for `model_cls`, salvaging what it can.
+
+    Workflow:
+        1. Try the output as-is.
+        2. Strip markdown fences, take the outermost JSON object and repair common defects.
+        3. Validate against the Pydantic model, dropping list items that do not validate.
+
+    Args:
+        content (str): Raw model output.
+        model_cls (Type[BaseModel]): Schema the output must satisfy.
+        node (str): Name of the calling node, used for the parse counters.
+
+    Returns:
+        Dict[str, Any]: The validated data.
+
+    Raises:
+        ResponseParseError: If nothing valid can be recovered.
+    """
+    try:
+        result = model_cls(**json.loads(content.strip())).dict()
+        _count(node, "parsed")
+        return result
+    except Exception:
+        pass
+
+    candidate = extract_json_object(strip_fences(content))
+    if candidate is None:
+        raise ResponseParseError("No JSON object found in model output", content)
+
+    last_error: Exception = ValueError("unparseable")
+    for attempt in (candidate, repair_json(candidate)):
+        try:
+            result = _validate(_load(attempt), model_cls)
+            _count(node, "salvaged")
+            return result
+        except Exception as e:
+            last_error = e
+    raise ResponseParseError(f"Could not parse model output: {last_error}", content)
+
+
+def _build_repair_prompt(broken: str, model_cls: Type[BaseModel], error: str) -> str:
+    """
+    Builds a short prompt asking the model to fix its own output (without resending the resume).
+    """
+    return f"""
+    The following output should be a single JSON object matching this JSON schema, but it is invalid.
+
+    Schema:
+    {json.dumps(model_cls.schema())}
+
+    Error:
+    {error}
+
+    Output:
+    {broken}
+
+    Return only the corrected JSON. No explanations or formatting. No markdown or triple backticks.
+    """
+
+
+async def acall_structured(
+    llm: Any,
+    prompt: str,
+    *,
+    node: str,
+    model_cls: Type[BaseModel],
+    on_token: Optional[Callable[[str], None]] = None,
+    repair: bool = True,
+    accept: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> LLMResponse:
+    """
+    Calls the LLM and parses its output into `model_cls`, with one targeted repair retry.
+
+    If the output cannot be salvaged locally, a short repair prompt containing only the
+    broken output and the schema is sent (not a full re-run with the resume).
+
+    Args:
+        llm (Any): The chat model.
+        prompt (str): The node's prompt.
+        node (str): Name of the calling node.
+        model_cls (Type[BaseModel]): Schema the output must satisfy.
+        on_token (Optional[Callable[[str], None]]): Streaming callback, see `call_llm`.
+        repair (bool): Send the repair prompt on invalid output; False raises right away
+                       (used by the fast tier, which escalates to the strong model instead).
+        accept (Optional[Callable[[Dict[str, Any]], None]]): Extra check of the validated dict;
+                       an exception it raises propagates, and the output is not cached.
+
+    Returns:
+        LLMResponse: With `parsed` holding the validated dict.
+
+    Raises:
+        ResponseParseError: If the (repaired) output is still invalid.
+    """
+    def parser(content: str) -> Dict[str, Any]:
+        parsed = parse_model(content, model_cls, node)
+        if accept is not None:
+            accept(parsed)
+        return parsed
+
+    try:
+        return await call_llm(llm, prompt, node=node, parser=parser, on_token=on_token)
+    except ResponseParseError as e:
+        if not repair:
+            raise
+        _count(node, "repair_prompts")
+        repair_prompt = _build_repair_prompt(e.content, model_cls, str(e))
+        try:
+            response = await call_llm(
+                llm,
+                repair_prompt,
+                node=f"{node}_repair",
+                parser=lambda content: parse_model(content, model_cls, f"{node}_repair"),
+            )
+        except ResponseParseError:
+            _count(node, "failed")
+            raise
+        _count(node, "repair_succeeded")
+        return response
@@ -0,0 +1,324 @@
+from typing import Any, Dict, List, Optional, Tuple
+import re
+
+from nodes.chunking import split_sections
+from nodes.extract_work import WorkExperience
+from nodes.extract_education import Education
+
+
+# Keywords of headings whose sections may hold each kind of entry. Deliberately broad
+# (e.g. "Research Experience"): section fingerprints use them to decide what an edit invalidates.
+WORK_HEADINGS = ("experience", "employment", "work history", "career history")
+EDUCATION_HEADINGS = ("education", "academic", "qualifications")
+
+# Whole headings the rule-based extractor trusts. "Research Experience", "Volunteer
+# Experience" and the like do not match, so their entries are never read as jobs.
+WORK_HEADING_RE = re.compile(
+    r"(?:(?:professional|work|relevant|industry)\s+)?experience"
+    r"|(?:professional\s+)?employment(?:\s+history)?"
+    r"|(?:work|career|employment)\s+history"
+    r"|work"
+)
+EDUCATION_HEADING_RE = re.compile(
+    r"education(?:al\s+background)?"
+    r"|academic\s+(?:background|history|qualifications)"
+    r"|(?:academic\s+|educational\s+)?qualifications"
+    r"|education\s+(?:and|&)\s+(?:training|certifications?)"
+)
+
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+_MONTH_RE = r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sept?(?:ember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?"
+_DATE_RE = rf"(?:{_MONTH_RE}\s+\d{{4}}|\d{{1,2}}/\d{{4}}|\d{{4}}-\d{{2}}|\d{{4}})"
+_END_RE = rf"(?:{_DATE_RE}|present|current|now|today)"
+DATE_RANGE_RE = re.compile(
+    rf"\(?\s*(?P<start>{_DATE_RE})\s*(?:-|–|—|to|until)\s*(?P<end>{_END_RE})\s*\)?",
+    re.IGNORECASE,
+)
+_SINGLE_YEAR_RE = re.compile(r"\b(?:19|20)\d{2}\b")
+
+_COMPANY_HINTS = re.compile(
+    r"\b(?:inc|llc|ltd|limited|corp|corporation|co|company|group|gmbh|plc|solutions|technologies|"
+    r"technology|systems|labs?|software|consulting|partners|bank|agency|studios?|university|hospital)\b\.?",
+    re.IGNORECASE,
+)
+_ROLE_HINTS = re.compile(
+    r"\b(?:engineer|developer|manager|analyst|intern|director|lead|consultant|scientist|designer|"
+    r"architect|specialist|officer|assistant|associate|head|vp|president|administrator|coordinator|"
+    r"researcher|programmer|technician|accountant|teacher|professor|lecturer|founder|owner|executive)\b",
+    re.IGNORECASE,
+)
+_DEGREE_RE = re.compile(
+    r"\b(?:bachelor(?:'s)?(?: of [a-z]+)?|master(?:'s)?(?: of [a-z]+)?|doctor(?:ate)?(?: of [a-z]+)?|"
+    r"associate(?:'s)? degree|diploma|ph\.?\s?d\.?|m\.?b\.?a\.?|b\.?\s?tech|m\.?\s?tech|b\.?\s?sc\.?|m\.?\s?sc\.?|"
+    r"b\.?s\.?|m\.?s\.?|b\.?a\.?|m\.?a\.?|b\.?e\.?|m\.?e\.?)(?=[\s,.(]|$)",
+    re.IGNORECASE,
+)
+_INSTITUTION_RE = re.compile(
+    r"(?:[A-Z][\w.&'-]*\s+){0,5}(?:University|College|Institute|School|Academy|Polytechnic)(?:\s+(?:of|for|at)(?:\s+[A-Z][\w.&'-]*){1,4})?",
+)
+_SEPARATORS = re.compile(r"\s+(?:at|@)\s+|\s*[|•·]\s*|\s+[-–—]\s+|,\s+")
+_BULLET_RE = re.compile(r"^\s*[-•*▪◦‣]\s*")
+# A header fragment that is only a company's legal form, split off by "Foo, Inc."
+_LEGAL_SUFFIX_RE = re.compile(
+    r"(?:inc|llc|llp|ltd|limited|corp|corporation|co|gmbh|ag|plc|s\.?a|b\.?v|pty(?:\s+ltd)?)\.?",
+    re.IGNORECASE,
+)
+
+# Confidence of a work entry whose description looks like it swallowed another job
+_ABSORBED_ENTRY_SCORE = 0.5
+
+# Confidence of a header with more than two fragments (e.g. a location or department),
+# where the company or role may have been cut short
+_EXTRA_FRAGMENTS_SCORE = 0.5
+
+
+def normalize_date(value: Optional[str]) -> Optional[str]:
+    """
+    Converts a matched date into 'YYYY-MM' (or 'YYYY' / 'Present' where that is all we know).
+    """
+    if not value:
+        return None
+    value = value.strip().rstrip(".").lower()
+    if value in ("present", "current", "now", "today"):
+        return "Present"
+    match = re.match(rf"({_MONTH_RE})\s+(\d{{4}})", value)
+    if match:
+        month = _MONTHS[match.group(1).rstrip(".")[:3]]
+        return f"{match.group(2)}-{month:02d}"
+    match = re.match(r"(\d{1,2})/(\d{4})", value)
+    if match:
+        return f"{match.group(2)}-{int(match.group(1)):02d}"
+    return value
+
+
+def _clean(text: str) -> str:
+    """
+    Strips bullets, separators and stray punctuation around a header fragment.
+    """
+    text = _BULLET_RE.sub("", text)
+    return text.strip(" \t,|-–—:()")
+
+
+def _split_company_role(parts: List[str]) -> Tuple[Optional[str], Optional[str], float]:
+    """
+    Decides which header fragment is the company and which is the role.
+
+    A fragment holding only a legal form ("Inc.", "LLC", ...) is joined back onto the
+    company name before it. Only the first two fragments are used, so a header with more
+    (e.g. "Engineer, Foo, Berlin") scores at most `_EXTRA_FRAGMENTS_SCORE`.
+
+    Returns:
+        Tuple[company, role, confidence]: confidence is 1.0 when keyword hints agree,
+        0.6 when the order had to be guessed, and 0.0 if a field is missing.
+    """
+    parts = [part for part in (_clean(p) for p in parts) if part]
+    joined: List[str] = []
+    for part in parts:
+        if joined and _LEGAL_SUFFIX_RE.fullmatch(part):
+            joined[-1] = f"{joined[-1]}, {part}"
+        else:
+            joined.append(part)
+    parts = joined
+    if len(parts) < 2:
+        return (parts[0] if parts else None), None, 0.0
+    first, second = parts[0], parts[1]
+    first_role, second_role = bool(_ROLE_HINTS.search(first)), bool(_ROLE_HINTS.search(second))
+    first_company, second_company = bool(_COMPANY_HINTS.search(first)), bool(_COMPANY_HINTS.search(second))
+    if first_role and not second_role or second_company and not first_company:
+        company, role, score = second, first, 1.0
+    elif second_role and not first_role or first_company and not second_company:
+        company, role, score = first, second, 1.0
+    else:
+        # No evidence either way: "Role, Company" is the most common layout
+        company, role, score = second, first, 0.6
+    if len(parts) > 2:
+        score = min(score, _EXTRA_FRAGMENTS_SCORE)
+    return company, role, score
+
+
+def _looks_like_another_entry(line: str) -> bool:
+    """
+    True if a description line may be a job header without a date range, which would then
+    have been absorbed into the previous entry: any line with a year, or a short, unbulleted
+    line with a role or company keyword.
+    """
+    if _SINGLE_YEAR_RE.search(line):
+        return True
+    if _BULLET_RE.match(line) or len(line.strip()) > 80:
+        return False
+    return bool(_ROLE_HINTS.search(line) or _COMPANY_HINTS.search(line))
+
+
+def _extract_work_section(body: str) -> Tuple[List[Dict[str, Any]], float]:
+    """
+    Extracts work entries from the body of a work experience section.
+
+    An entry starts at every line containing a date range; its company and role are read
+    from the rest of that line or, if the line only holds dates, from the (at most two)
+    short lines right above it. Lines up to the next entry's header form the description.
+    An entry whose description contains a line that looks like another job (see
+    `_looks_like_another_entry`) scores low, so the LLM handles the section instead.
+    """
+    lines = body.split("\n")
+    anchors = [i for i, line in enumerate(lines) if DATE_RANGE_RE.search(line)]
+    if not anchors:
+        return [], 0.0
+
+    # Pass 1: locate each entry's header fragments and the line where its header starts
+    headers: List[Tuple[List[str], int]] = []
+    for n, index in enumerate(anchors):
+        line = lines[index]
+        match = DATE_RANGE_RE.search(line)
+        header = _clean(line[:match.start()] + " " + line[match.end():])
+        if header:
+            headers.append((_SEPARATORS.split(header), index))
+            continue
+        lower_bound = anchors[n - 1] + 1 if n else 0
+        above = [
+            i for i in range(max(lower_bound, index - 2), index)
+            if lines[i].strip() and not _BULLET_RE.match(lines[i]) and len(lines[i]) <= 80
+        ]
+        parts = [lines[i] for i in above]
+        if len(parts) == 1:
+            parts = _SEPARATORS.split(parts[0])
+        headers.append((parts, above[0] if above else index))
+
+    # Pass 2: build the entries, with descriptions running up to the next header
+    entries: List[Dict[str, Any]] = []
+    scores: List[float] = []
+    for n, index in enumerate(anchors):
+        parts, _ = headers[n]
+        next_header_start = headers[n + 1][1] if n + 1 < len(anchors) else len(lines)
+        description_lines = [lines[i] for i in range(index + 1, next_header_start) if lines[i].strip()]
+        description = "; ".join(_BULLET_RE.sub("", line).strip() for line in description_lines)
+        company, role, score = _split_company_role(parts)
+        if any(_looks_like_another_entry(line) for line in description_lines):
+            score = min(score, _ABSORBED_ENTRY_SCORE)
+        if not company or not role:
+            scores.append(0.0)
+            continue
+        match = DATE_RANGE_RE.search(lines[index])
+        entry = WorkExperience(
+            company=company,
+            role=role,
+            start_date=normalize_date(match.group("start")),
+            end_date=normalize_date(match.group("end")),
+            description=description,
+        )
+        entries.append(entry.dict())
+        scores.append(score)
+
+    return entries, sum(scores) / len(scores)
+
+
+def _extract_education_section(body: str) -> Tuple[List[Dict[str, Any]], float]:
+    """
+    Extracts education entries from the body of an education section.
+
+    Blocks are delimited by blank lines or by a new institution name; each block needs
+    an institution and a degree to count as a complete entry.
+    """
+    blocks: List[List[str]] = [[]]
+    for line in body.split("\n"):
+        if not line.strip():
+            if blocks[-1]:
+                blocks.append([])
+            continue
+        if _INSTITUTION_RE.search(line) and any(_INSTITUTION_RE.search(l) for l in blocks[-1]):
+            blocks.append([])
+        blocks[-1].append(line)
+    blocks = [block for block in blocks if block]
+    if not blocks:
+        return [], 0.0
+
+    entries: List[Dict[str, Any]] = []
+    scores: List[float] = []
+    for block in blocks:
+        text = " ".join(_BULLET_RE.sub("", line) for line in block)
+        institution = _INSTITUTION_RE.search(text)
+        degree = _DEGREE_RE.search(text)
+        if not institution or not degree:
+            # Coursework / honours lines without an institution or degree are ignored
+            if institution or degree:
+                scores.append(0.0)
+            continue
+
+        field_match = re.search(
+            r"\b(?:in|of)\s+([A-Z][\w&]*(?:\s+(?:and\s+)?[A-Z][\w&]*){0,4})", text[degree.end():]
+        )
+        date_range = DATE_RANGE_RE.search(text)
+        if date_range:
+            start_date, end_date = normalize_date(date_range.group("start")), normalize_date(date_range.group("end"))
+        else:
+            years = _SINGLE_YEAR_RE.findall(text)
+            start_date, end_date = None, (years[-1] if years else None)
+
+        entry = Education(
+            institution=institution.group(0).strip(),
+            degree=degree.group(0).strip(),
+            field=field_match.group(1).strip() if field_match else "",
+            start_date=start_date,
+            end_date=end_date,
+        )
+        entries.append(entry.dict())
+        scores.append(1.0 if end_date else 0.8)
+
+    if not scores:
+        return [], 0.0
+    return entries, sum(scores) / len(scores)
+
+
+def _find_sections(text: str, heading_re: "re.Pattern[str]") -> List[str]:
+    """
+    Returns the bodies of all sections whose whole heading matches `heading_re`
+    (case, surrounding punctuation and extra whitespace ignored).
+    """
+    bodies = []
+    for heading, body in split_sections(text):
+        normalized = " ".join(re.sub(r"[^\w&]+", " ", heading.lower()).split())
+        if normalized and heading_re.fullmatch(normalized):
+            bodies.append(body)
+    return bodies
+
+
+def rule_extract(resume_text: str) -> Dict[str, Any]:
+    """
+    Deterministically extracts work experience and education from a well-structured resume.
+
+    Relies on section headings, date ranges and institution / degree patterns, and fills
+    the same WorkExperience / Education models as the LLM extractors. Each section gets
+    a confidence score in [0, 1]; resumes without recognizable headings score 0.
+
+    Args:
+        resume_text (str): Normalized resume text.
+
+    Returns:
+        Dict[str, Any]: A dictionary with:
+            - 'work': {"work_experiences": [...]}
+            - 'education': {"education": [...]}
+            - 'work_confidence': float
+            - 'education_confidence': float
+    """
+    work: List[Dict[str, Any]] = []
+    work_scores: List[float] = []
+    for body in _find_sections(resume_text, WORK_HEADING_RE):
+        entries, score = _extract_work_section(body)
+        work += entries
+        work_scores.append(score)
+
+    education: List[Dict[str, Any]] = []
+    education_scores: List[float] = []
+    for body in _find_sections(resume_text, EDUCATION_HEADING_RE):
+        entries, score = _extract_education_section(body)
+        education += entries
+        education_scores.append(score)
+
+    return {
+        "work": {"work_experiences": work},
+        "education": {"education": education},
+        "work_confidence": min(work_scores) if work_scores and work else 0.0,
+        "education_confidence": min(education_scores) if education_scores and education else 0.0,
+    }
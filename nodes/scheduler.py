@@ -0,0 +1,308 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+import asyncio
+import heapq
+import itertools
+import random
+import threading
+import time
+import weakref
+
+from config import settings
+
+
+T = TypeVar("T")
+
+# Lower value = served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 10
+
+# Priority of LLM calls made from the current task (see `llm_priority`)
+_priority: ContextVar[int] = ContextVar("llm_priority", default=PRIORITY_INTERACTIVE)
+
+
+@contextmanager
+def llm_priority(priority: int) -> Iterator[None]:
+    """
+    Runs the block (and tasks spawned from it) with the given LLM scheduling priority.
+
+    Example:
+        with llm_priority(PRIORITY_BATCH):
+            await run_analysis(...)
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at `per_minute / 60` units per second.
+
+    A `per_minute` of 0 disables the limit. The bucket may go negative when usage is
+    reconciled after the fact, which simply delays later callers.
+    """
+
+    def __init__(self, per_minute: float):
+        self.per_minute = per_minute
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.per_minute / 60)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """
+        Seconds until `amount` units are available (0 if they are available now).
+        """
+        if not self.per_minute:
+            return 0.0
+        self._refill()
+        # A single request larger than the whole bucket only has to wait for a full bucket
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) * 60 / self.per_minute
+
+    def consume(self, amount: float) -> None:
+        """
+        Removes `amount` units (negative amounts give units back).
+        """
+        if not self.per_minute:
+            return
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class _LoopQueue:
+    """
+    Wait queue and in-flight count of the scheduler's callers on one event loop.
+
+    asyncio primitives belong to the loop they were first used on, so every loop (the
+    server's, or a fresh one per `asyncio.run` in the sync node wrappers) gets its own.
+    """
+
+    def __init__(self):
+        self.cond = asyncio.Condition()
+        self.waiters: List[Tuple[int, int]] = []
+        self.in_flight = 0
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    """
+    Reads the HTTP status code from a provider / httpx exception, if there is one.
+    """
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    True for rate limiting (429), server errors (5xx), timeouts and connection failures.
+    """
+    status = _status_code(error)
+    if status is not None:
+        return status == 429 or status >= 500
+    name = type(error).__name__
+    return "Timeout" in name or "Connection" in name
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """
+    Reads a Retry-After header (in seconds) from the error's HTTP response.
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class LLMScheduler:
+    """
+    Central gate for outbound LLM requests.
+
+    - Enforces request-per-minute and token-per-minute budgets with token buckets;
+      calls over budget wait in a queue instead of failing.
+    - Serves waiting calls by priority (interactive before batch), FIFO within a priority.
+    - Caps the number of requests in flight (per event loop; the budgets are shared by all loops).
+    - Retries 429 / 5xx / transient network errors with jittered exponential backoff,
+      honouring Retry-After.
+    - Tracks queue depth and wait times.
+
+    Args:
+        rpm (float): Requests per minute (0 = unlimited).
+        tpm (float): Tokens per minute (0 = unlimited).
+        max_concurrency (int): Maximum requests in flight.
+        max_retries (int): Retries per call for retryable errors.
+        base_delay (float): First backoff delay in seconds.
+        max_delay (float): Upper bound of a single backoff delay.
+    """
+
+    def __init__(
+        self,
+        rpm: float,
+        tpm: float,
+        max_concurrency: int,
+        max_retries: int = 4,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._requests = TokenBucket(rpm)
+        self._tokens = TokenBucket(tpm)
+        self._sequence = itertools.count()
+        self._queues: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopQueue]" = weakref.WeakKeyDictionary()
+        self._queues_lock = threading.Lock()
+        self._stats: Dict[str, float] = {
+            "requests": 0, "retries": 0, "failures": 0,
+            "wait_seconds_total": 0.0, "wait_seconds_max": 0.0,
+        }
+
+    def _queue(self) -> _LoopQueue:
+        """
+        Returns the wait queue of the running event loop, creating it on first use.
+        """
+        loop = asyncio.get_running_loop()
+        with self._queues_lock:
+            queue = self._queues.get(loop)
+            if queue is None:
+                queue = self._queues[loop] = _LoopQueue()
+            return queue
+
+    async def _acquire(self, tokens: int, priority: int) -> None:
+        """
+        Waits until this call is first in line, a concurrency slot is free and both budgets allow it.
+        """
+        queue = self._queue()
+        cond = queue.cond
+        entry = (priority, next(self._sequence))
+        enqueued = time.monotonic()
+        async with cond:
+            heapq.heappush(queue.waiters, entry)
+            try:
+                while True:
+                    timeout = None
+                    if queue.waiters[0] == entry and queue.in_flight < self.max_concurrency:
+                        timeout = max(self._requests.wait_time(1), self._tokens.wait_time(tokens))
+                        if timeout <= 0:
+                            heapq.heappop(queue.waiters)
+                            self._requests.consume(1)
+                            self._tokens.consume(tokens)
+                            queue.in_flight += 1
+                            break
+                    try:
+                        await asyncio.wait_for(cond.wait(), timeout=timeout)
+                    except asyncio.TimeoutError:
+                        pass
+            except BaseException:
+                # Cancelled while queued: leave the queue and let the next caller proceed
+                if entry in queue.waiters:
+                    queue.waiters.remove(entry)
+                    heapq.heapify(queue.waiters)
+                cond.notify_all()
+                raise
+            # The next waiter may now be at the head of the queue
+            cond.notify_all()
+
+        waited = time.monotonic() - enqueued
+        self._stats["requests"] += 1
+        self._stats["wait_seconds_total"] += waited
+        self._stats["wait_seconds_max"] = max(self._stats["wait_seconds_max"], waited)
+
+    async def _release(self) -> None:
+        """
+        Frees a concurrency slot and wakes the queue.
+        """
+        queue = self._queue()
+        async with queue.cond:
+            queue.in_flight -= 1
+            queue.cond.notify_all()
+
+    def reconcile(self, estimated_tokens: int, actual_tokens: int) -> None:
+        """
+        Corrects the token budget once the real usage of a call is known.
+        """
+        if actual_tokens:
+            self._tokens.consume(actual_tokens - estimated_tokens)
+
+    async def run(
+        self,
+        call: Callable[[], Awaitable[T]],
+        estimated_tokens: int,
+        priority: Optional[int] = None,
+        can_retry: Optional[Callable[[], bool]] = None,
+    ) -> T:
+        """
+        Runs `call` under the rate limits, retrying retryable failures.
+
+        Args:
+            call (Callable[[], Awaitable[T]]): Makes one LLM request.
+            estimated_tokens (int): Tokens reserved from the TPM budget for each attempt.
+            priority (Optional[int]): Scheduling priority; defaults to the task's `llm_priority`.
+            can_retry (Optional[Callable[[], bool]]): Extra check before retrying (e.g. nothing
+                                                       has been streamed to the client yet).
+
+        Returns:
+            T: Whatever `call` returns.
+        """
+        priority = _priority.get() if priority is None else priority
+        attempt = 0
+        while True:
+            await self._acquire(estimated_tokens, priority)
+            try:
+                return await call()
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e) or (can_retry and not can_retry()):
+                    self._stats["failures"] += 1
+                    raise
+                delay = _retry_after(e)
+                if delay is None:
+                    # Full jitter: uniform in [0, base * 2^attempt], capped
+                    delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+                attempt += 1
+                self._stats["retries"] += 1
+            finally:
+                await self._release()
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns queue depth, in-flight requests, remaining budgets and wait-time statistics.
+        """
+        requests = self._stats["requests"]
+        with self._queues_lock:
+            queues = list(self._queues.values())
+        return {
+            "queue_depth": sum(len(queue.waiters) for queue in queues),
+            "in_flight": sum(queue.in_flight for queue in queues),
+            "rpm_available": round(self._requests.tokens, 2) if self._requests.per_minute else None,
+            "tpm_available": round(self._tokens.tokens, 2) if self._tokens.per_minute else None,
+            "requests": int(requests),
+            "retries": int(self._stats["retries"]),
+            "failures": int(self._stats["failures"]),
+            "wait_seconds_avg": round(self._stats["wait_seconds_total"] / requests, 4) if requests else 0.0,
+            "wait_seconds_max": round(self._stats["wait_seconds_max"], 4),
+        }
+
+
+# Shared scheduler used by every node's LLM calls
+scheduler = LLMScheduler(
+    rpm=settings.llm_rpm,
+    tpm=settings.llm_tpm,
+    max_concurrency=settings.llm_max_concurrency,
+    max_retries=settings.llm_retry_attempts,
+    base_delay=settings.llm_retry_base_delay,
+    max_delay=settings.llm_retry_max_delay,
+)
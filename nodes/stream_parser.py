@@ -0,0 +1,122 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
+import json
+
+from pydantic import BaseModel
+
+
+class IncrementalArrayParser:
+    """
+    Incremental JSON parser that yields the items of top-level arrays as soon as each
+    item is complete, while the rest of the document is still being generated.
+
+    Feed it the model's output chunk by chunk. It tracks strings, escapes and nesting
+    depth, so it is not confused by brackets inside string values, and ignores anything
+    before the first '{' (such as a markdown fence). Only object items of the arrays
+    stored under `keys` in the outermost object are reported.
+
+    Example:
+        parser = IncrementalArrayParser(["work_experiences"])
+        for chunk in stream:
+            for key, item in parser.feed(chunk):
+                ...
+
+    Args:
+        keys (Iterable[str]): Top-level keys whose array items should be emitted.
+    """
+
+    def __init__(self, keys: Iterable[str]):
+        self.keys = set(keys)
+        self._buffer: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._string_start: Optional[int] = None
+        self._last_key: Optional[str] = None
+        self._array_key: Optional[str] = None
+        self._item_start: Optional[int] = None
+        self._position = 0
+
+    def feed(self, chunk: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Consumes the next piece of output.
+
+        Returns:
+            List[Tuple[str, Dict[str, Any]]]: (key, item) for every array item completed by this chunk.
+        """
+        completed: List[Tuple[str, Dict[str, Any]]] = []
+        for char in chunk:
+            self._buffer.append(char)
+            index = self._position
+            self._position += 1
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    # Strings directly inside the outermost object are candidate keys
+                    if self._depth == 1:
+                        self._last_key = "".join(self._buffer[self._string_start + 1:index])
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = index
+            elif char in "{[":
+                self._depth += 1
+                if char == "[" and self._depth == 2 and self._last_key in self.keys:
+                    self._array_key = self._last_key
+                elif char == "{" and self._depth == 3 and self._array_key is not None:
+                    self._item_start = index
+            elif char in "}]":
+                if char == "}" and self._depth == 3 and self._item_start is not None:
+                    item = self._load("".join(self._buffer[self._item_start:index + 1]))
+                    if item is not None:
+                        completed.append((self._array_key, item))
+                    self._item_start = None
+                elif char == "]" and self._depth == 2:
+                    self._array_key = None
+                self._depth = max(0, self._depth - 1)
+        return completed
+
+    @staticmethod
+    def _load(text: str) -> Optional[Dict[str, Any]]:
+        """
+        Parses one completed item; malformed items are skipped (the final parse still sees them).
+        """
+        try:
+            item = json.loads(text)
+        except json.JSONDecodeError:
+            return None
+        return item if isinstance(item, dict) else None
+
+
+def entry_streamer(
+    models: Dict[str, Type[BaseModel]],
+    on_entry: Callable[[str, Dict[str, Any]], None],
+) -> Callable[[str], None]:
+    """
+    Builds an `on_token` callback that validates and forwards array items as they complete.
+
+    Args:
+        models (Dict[str, Type[BaseModel]]): Top-level array key -> model each item must satisfy
+                                             (e.g. {"work_experiences": WorkExperience}).
+        on_entry (Callable[[str, Dict[str, Any]], None]): Receives (key, validated item dict).
+
+    Returns:
+        Callable[[str], None]: Pass as `on_token` to `call_llm` / `acall_structured`.
+    """
+    parser = IncrementalArrayParser(models)
+
+    def on_token(token: str) -> None:
+        for key, item in parser.feed(token):
+            try:
+                entry = models[key](**item).dict()
+            except Exception:
+                # Invalid items are left to the tolerant parse of the full output
+                continue
+            on_entry(key, entry)
+
+    return on_token
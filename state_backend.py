@@ -0,0 +1,288 @@
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+
+from config import settings
+
+
+class StateBackend(ABC):
+    """
+    Key-value store for state that must be shared by every worker process.
+
+    Values are strings (callers store JSON) with an optional per-key TTL. Implementations
+    must be safe to use from several threads and several processes at once; `add` must
+    be atomic, since it is used for leases (e.g. "who runs this coalesced analysis").
+    The async variants run the blocking calls in a worker thread.
+
+    STATE_BACKEND selects the implementation: "sqlite" (a file shared by the workers of
+    one host) or "redis" (a network store shared by several hosts).
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """
+        Returns the value stored under `key`, or None if it is missing or expired.
+        """
+
+    @abstractmethod
+    def set(self, key: str, value: str, ttl_seconds: float = 0) -> None:
+        """
+        Stores `value` under `key`; a positive `ttl_seconds` makes it expire.
+        """
+
+    @abstractmethod
+    def add(self, key: str, value: str, ttl_seconds: float = 0) -> bool:
+        """
+        Stores `value` only if `key` does not exist yet; returns True if it was stored.
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """
+        Removes `key` if it exists.
+        """
+
+    @abstractmethod
+    def delete_prefix(self, prefix: str) -> None:
+        """
+        Removes every key starting with `prefix`.
+        """
+
+    def get_json(self, key: str) -> Any:
+        """
+        Returns the decoded JSON value stored under `key`, or None.
+        """
+        value = self.get(key)
+        return json.loads(value) if value is not None else None
+
+    def set_json(self, key: str, value: Any, ttl_seconds: float = 0) -> None:
+        """
+        Stores `value` as JSON under `key`.
+        """
+        self.set(key, json.dumps(value), ttl_seconds)
+
+    async def aget(self, key: str) -> Optional[str]:
+        """
+        Async variant of `get`, run in a worker thread.
+        """
+        return await asyncio.to_thread(self.get, key)
+
+    async def aget_json(self, key: str) -> Any:
+        """
+        Async variant of `get_json`, run in a worker thread.
+        """
+        return await asyncio.to_thread(self.get_json, key)
+
+    async def aset_json(self, key: str, value: Any, ttl_seconds: float = 0) -> None:
+        """
+        Async variant of `set_json`, run in a worker thread.
+        """
+        await asyncio.to_thread(self.set_json, key, value, ttl_seconds)
+
+    async def aset(self, key: str, value: str, ttl_seconds: float = 0) -> None:
+        """
+        Async variant of `set`, run in a worker thread.
+        """
+        await asyncio.to_thread(self.set, key, value, ttl_seconds)
+
+    async def aadd(self, key: str, value: str, ttl_seconds: float = 0) -> bool:
+        """
+        Async variant of `add`, run in a worker thread.
+        """
+        return await asyncio.to_thread(self.add, key, value, ttl_seconds)
+
+    async def adelete(self, key: str) -> None:
+        """
+        Async variant of `delete`, run in a worker thread.
+        """
+        await asyncio.to_thread(self.delete, key)
+
+
+class SQLiteStateBackend(StateBackend):
+    """
+    State backend stored in a SQLite file, shared by every worker process on one host.
+
+    The database runs in WAL mode, so readers in one process do not block writers in
+    another; writers wait up to `busy_timeout_seconds` for each other. Expired rows are
+    ignored on read and purged at most once every `purge_interval_seconds`.
+
+    Args:
+        db_path (str): Path of the SQLite file.
+        table (str): Table holding the keys (several stores can share one file).
+        busy_timeout_seconds (float): How long a write waits for another process's lock.
+        purge_interval_seconds (float): Minimum time between two purges of expired rows.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        table: str = "state",
+        busy_timeout_seconds: float = 30,
+        purge_interval_seconds: float = 60,
+    ):
+        self.table = table
+        self.purge_interval_seconds = purge_interval_seconds
+        self._last_purge = 0.0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=busy_timeout_seconds, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+        )
+        self._conn.commit()
+        self._purge(time.time())
+
+    @staticmethod
+    def _expires_at(ttl_seconds: float) -> Optional[float]:
+        return time.time() + ttl_seconds if ttl_seconds > 0 else None
+
+    def _purge(self, now: float) -> None:
+        """
+        Deletes expired rows (the caller holds the lock or is the constructor).
+        """
+        self._last_purge = now
+        self._conn.execute(f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at < ?", (now,))
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or (row[1] is not None and row[1] < time.time()):
+            return None
+        return row[0]
+
+    def set(self, key: str, value: str, ttl_seconds: float = 0) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, self._expires_at(ttl_seconds)),
+            )
+            self._conn.commit()
+            if now - self._last_purge >= self.purge_interval_seconds:
+                self._purge(now)
+
+    def add(self, key: str, value: str, ttl_seconds: float = 0) -> bool:
+        with self._lock:
+            # BEGIN IMMEDIATE takes the write lock, so the check-and-insert is atomic across processes
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    f"DELETE FROM {self.table} WHERE key = ? AND expires_at IS NOT NULL AND expires_at < ?",
+                    (key, time.time()),
+                )
+                cursor = self._conn.execute(
+                    f"INSERT OR IGNORE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, value, self._expires_at(ttl_seconds)),
+                )
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+        return cursor.rowcount == 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def delete_prefix(self, prefix: str) -> None:
+        # substr rather than LIKE, which is case-insensitive and treats '_' / '%' specially
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+            self._conn.commit()
+
+
+class RedisStateBackend(StateBackend):
+    """
+    State backend on a Redis (or Redis-protocol compatible) server, shared across hosts.
+
+    TTLs map to native key expiry and `add` to SET NX, so leases are atomic. All keys are
+    namespaced with `prefix`, so several deployments can share one server. For tests, pass
+    any client with the redis-py interface (e.g. a fakeredis instance) as `client`.
+
+    Requires the `redis` package (pip install redis) unless a client is given.
+
+    Args:
+        url (str): Connection URL, e.g. "redis://localhost:6379/0".
+        prefix (str): Prefix added to every key.
+        client (Any): Pre-built client; overrides `url`.
+    """
+
+    def __init__(self, url: str = "redis://localhost:6379/0", prefix: str = "", client: Any = None):
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise RuntimeError("STATE_BACKEND=redis requires the 'redis' package (pip install redis)") from e
+            client = redis.Redis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+        self._client = client
+
+    @staticmethod
+    def _px(ttl_seconds: float) -> Optional[int]:
+        return max(1, int(ttl_seconds * 1000)) if ttl_seconds > 0 else None
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._client.get(self.prefix + key)
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    def set(self, key: str, value: str, ttl_seconds: float = 0) -> None:
+        self._client.set(self.prefix + key, value, px=self._px(ttl_seconds))
+
+    def add(self, key: str, value: str, ttl_seconds: float = 0) -> bool:
+        return bool(self._client.set(self.prefix + key, value, px=self._px(ttl_seconds), nx=True))
+
+    def delete(self, key: str) -> None:
+        self._client.delete(self.prefix + key)
+
+    def delete_prefix(self, prefix: str) -> None:
+        pattern = (self.prefix + prefix).replace("[", "\\[").replace("*", "\\*").replace("?", "\\?") + "*"
+        keys = list(self._client.scan_iter(match=pattern))
+        if keys:
+            self._client.delete(*keys)
+
+
+STATE_BACKENDS = ("sqlite", "redis")
+
+_backend: Optional[StateBackend] = None
+_backend_lock = threading.Lock()
+
+
+def get_state_backend() -> StateBackend:
+    """
+    Returns the shared state backend selected by STATE_BACKEND, creating it on first use.
+
+    Raises:
+        ValueError: If STATE_BACKEND names an unknown backend.
+    """
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            if settings.state_backend == "sqlite":
+                _backend = SQLiteStateBackend(settings.state_db_path)
+            elif settings.state_backend == "redis":
+                _backend = RedisStateBackend(settings.redis_url, prefix=settings.state_key_prefix)
+            else:
+                raise ValueError(
+                    f"Unknown STATE_BACKEND '{settings.state_backend}' (expected one of {', '.join(STATE_BACKENDS)})"
+                )
+        return _backend
+
+
+def set_state_backend(backend: Optional[StateBackend]) -> None:
+    """
+    Replaces the shared backend (e.g. with a RedisStateBackend around a local stand-in);
+    None resets it so the next `get_state_backend` call builds one from the settings.
+    Call it before importing `graph` or `main`, which pick up the backend at import time.
+    """
+    global _backend
+    with _backend_lock:
+        _backend = backend
@@ -0,0 +1,29 @@
+"""
+Shared test setup.
+
+The settings are read once when `config` is first imported, so the environment is
+prepared here, before any test module imports project code: no real API key or rate
+limits, no response cache or rule-based fast path (so every node calls the model), and
+every SQLite file in a throwaway directory.
+"""
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+_workdir = tempfile.mkdtemp(prefix="resume-tests-")
+
+os.environ["GROQ_API_KEY"] = "test"
+os.environ["LLM_RPM"] = "0"
+os.environ["LLM_TPM"] = "0"
+os.environ["LLM_RETRY_BASE_DELAY"] = "0.01"
+os.environ["LLM_CACHE_ENABLED"] = "false"
+os.environ["LLM_CACHE_DB_PATH"] = ""
+os.environ["RULE_EXTRACTION_ENABLED"] = "false"
+os.environ["CANDIDATE_STORE_ENABLED"] = "false"
+os.environ["CANDIDATE_DB_PATH"] = os.path.join(_workdir, "candidates.sqlite3")
+os.environ["STATE_BACKEND"] = "sqlite"
+os.environ["STATE_DB_PATH"] = os.path.join(_workdir, "state.sqlite3")
+os.environ["CHECKPOINT_DB_PATH"] = os.path.join(_workdir, "checkpoints.sqlite3")
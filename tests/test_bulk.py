@@ -0,0 +1,84 @@
+import argparse
+import asyncio
+
+import bulk
+
+
+class _FakeGraph:
+    """
+    Stands in for the compiled workflow: `ainvoke` returns fixed final values.
+    """
+
+    def __init__(self, values):
+        self.values = values
+
+    async def ainvoke(self, state, config=None):
+        return dict(self.values)
+
+
+def _analyze(values):
+    args = argparse.Namespace(extraction_mode=None, include=None)
+    item = {"id": "r1", "resume_text": "Jane Doe\nEngineer"}
+    return asyncio.run(bulk.analyze_item(_FakeGraph(values), item, args))
+
+
+def test_complete_analysis_is_done():
+    result = _analyze({"work": {"work_experiences": []}, "education": {"education": []}, "summary": "Engineer."})
+    assert "error" not in result
+    assert result["summary"] == "Engineer."
+
+
+def test_section_error_is_failed():
+    result = _analyze({"work": {"error": "Failed to parse JSON"}, "education": {"education": []}, "summary": "Engineer."})
+    assert result["error"] == "work: Failed to parse JSON"
+
+
+def test_summary_error_is_failed():
+    result = _analyze({"work": {"work_experiences": []}, "summary": "Error generating summary: rate limited"})
+    assert result["error"] == "Error generating summary: rate limited"
+
+
+def test_top_level_error_is_failed():
+    assert _analyze({"error": "Missing resume_text"})["error"] == "Missing resume_text"
+
+
+def test_truncate_partial_line(tmp_path):
+    path = tmp_path / "out.jsonl"
+    path.write_bytes(b'{"id": "a"}\n{"id": "b"}\n{"id": "c", "summ')
+    bulk._truncate_partial_line(str(path))
+    assert path.read_bytes() == b'{"id": "a"}\n{"id": "b"}\n'
+
+    # A file that ends on a complete line is left alone
+    bulk._truncate_partial_line(str(path))
+    assert path.read_bytes() == b'{"id": "a"}\n{"id": "b"}\n'
+
+
+def test_truncate_partial_line_spanning_blocks(tmp_path):
+    path = tmp_path / "out.jsonl"
+    path.write_bytes(b'{"id": "a"}\n{"id": "b", "summary": "' + b"x" * 100)
+    # The last newline is several blocks before the end of the file
+    bulk._truncate_partial_line(str(path), block_size=8)
+    assert path.read_bytes() == b'{"id": "a"}\n'
+
+
+def test_truncate_partial_only_line(tmp_path):
+    path = tmp_path / "out.jsonl"
+    path.write_bytes(b'{"id": "a", "su')
+    bulk._truncate_partial_line(str(path), block_size=4)
+    assert path.read_bytes() == b""
+
+
+def test_load_progress_resumes_from_ledger_and_output(tmp_path):
+    output, ledger = tmp_path / "out.jsonl", tmp_path / "out.jsonl.progress"
+    ledger.write_text('{"id": "a", "status": "done"}\n{"id": "b", "status": "failed"}\n{"id": "x", "sta')
+    # "c" was written to the output but the process died before its ledger entry
+    output.write_text('{"id": "a"}\n{"id": "c"}\n')
+
+    assert bulk.load_progress(str(output), str(ledger), retry_failed=False) == {"a", "b", "c"}
+    assert bulk.load_progress(str(output), str(ledger), retry_failed=True) == {"a", "c"}
+    # The half-written ledger line was dropped, so appending keeps the file valid
+    assert ledger.read_text().endswith('"failed"}\n')
+
+
+def test_load_progress_without_files(tmp_path):
+    assert bulk.load_progress(str(tmp_path / "out.jsonl"), str(tmp_path / "ledger"), retry_failed=False) == set()
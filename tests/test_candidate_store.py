@@ -0,0 +1,79 @@
+import datetime
+import json
+import sqlite3
+
+import candidate_store
+from candidate_store import years_of_experience
+
+
+TODAY = datetime.date(2024, 7, 15)
+
+
+def _job(start, end):
+    return {"company": "Foo", "role": "Engineer", "start_date": start, "end_date": end}
+
+
+def test_sequential_and_current_roles():
+    jobs = [_job("2015-01", "2019-01"), _job("2020-01", "Present")]
+    # 4 years, then 2020-01 to 2024-07
+    assert years_of_experience(jobs, TODAY) == 8.5
+
+
+def test_overlapping_roles_count_once():
+    jobs = [_job("2018-01", "2022-01"), _job("2020-01", "2021-01"), _job("2021-07", "2023-01")]
+    assert years_of_experience(jobs, TODAY) == 5.0
+
+
+def test_date_formats_and_unusable_entries():
+    jobs = [
+        _job("March 2010", "2012"),
+        _job(None, "2015-01"),
+        _job("2016-01", None),
+        _job("2019-01", "2018-01"),
+        _job("sometime", "later"),
+    ]
+    # Only the first entry counts: 2010-03 to 2012-01
+    assert years_of_experience(jobs, TODAY) == 1.8
+    assert years_of_experience([], TODAY) == 0.0
+
+
+def _values(jobs):
+    return {"work": {"work_experiences": jobs}, "summary": "Engineer.", "fingerprints": {"document": str(jobs)}}
+
+
+def test_ongoing_roles_keep_counting_after_indexing(tmp_path, monkeypatch):
+    store = candidate_store.CandidateStore(str(tmp_path / "candidates.sqlite3"))
+    store.add("current", _values([_job("2020-01", "Present")]))
+    store.add("finished", _values([_job("2015-01", "2019-01")]))
+
+    # Searched in January 2030: the ongoing role has grown to ten years, the finished one has not
+    monkeypatch.setattr(candidate_store, "_month_number", lambda day: 2030 * 12)
+    results = {result["thread_id"]: result["years_experience"] for result in store.search()}
+    assert results == {"current": 10.0, "finished": 4.0}
+    assert [result["thread_id"] for result in store.search(min_years=8)] == ["current"]
+    assert [result["thread_id"] for result in store.search(max_years=8)] == ["finished"]
+
+
+def test_store_with_indexing_time_years_is_upgraded(tmp_path, monkeypatch):
+    path = str(tmp_path / "candidates.sqlite3")
+    old = sqlite3.connect(path)
+    old.executescript(
+        """
+        CREATE TABLE candidates (
+            id INTEGER PRIMARY KEY, thread_id TEXT NOT NULL UNIQUE, document_fingerprint TEXT UNIQUE,
+            summary TEXT, insights TEXT, work TEXT, education TEXT,
+            years_experience REAL NOT NULL, updated_at REAL NOT NULL
+        );
+        CREATE INDEX candidates_years ON candidates (years_experience);
+        """
+    )
+    old.execute(
+        "INSERT INTO candidates VALUES (1, 't1', 'f1', 'Engineer.', '[]', ?, '[]', 4.5, 0)",
+        (json.dumps([_job("2020-01", "Present")]),),
+    )
+    old.commit()
+    old.close()
+
+    monkeypatch.setattr(candidate_store, "_month_number", lambda day: 2030 * 12)
+    store = candidate_store.CandidateStore(path)
+    assert [(result["thread_id"], result["years_experience"]) for result in store.search()] == [("t1", 10.0)]
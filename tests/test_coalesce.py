@@ -0,0 +1,117 @@
+import asyncio
+import multiprocessing
+import time
+
+import pytest
+
+from coalesce import SingleFlight
+from state_backend import SQLiteStateBackend
+
+
+def test_concurrent_calls_share_one_run():
+    flight = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def scenario():
+        return await asyncio.gather(*(flight.run("key", work) for _ in range(5)))
+
+    results = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert [result for result, _ in results] == ["result"] * 5
+    assert sorted(shared for _, shared in results) == [False] + [True] * 4
+    assert flight.stats() == {"in_flight": 0, "leaders": 1, "followers": 4, "remote_followers": 0}
+
+
+def _flight(db_path):
+    return SingleFlight(SQLiteStateBackend(db_path), lease_seconds=1, poll_interval_seconds=0.02)
+
+
+def test_shared_result_is_handed_to_another_instance(tmp_path):
+    db_path = str(tmp_path / "state.sqlite3")
+    leader, follower = _flight(db_path), _flight(db_path)
+    calls = []
+
+    async def work(name):
+        calls.append(name)
+        await asyncio.sleep(0.3)
+        return name
+
+    async def scenario():
+        led = asyncio.ensure_future(leader.run("key", lambda: work("leader"), dumps=str, loads=str))
+        await asyncio.sleep(0.05)
+        followed = await follower.run("key", lambda: work("follower"), dumps=str, loads=str)
+        return await led, followed
+
+    led, followed = asyncio.run(scenario())
+    assert calls == ["leader"]
+    assert led == ("leader", False)
+    assert followed == ("leader", True)
+    assert follower.stats()["remote_followers"] == 1
+
+
+def test_follower_takes_over_when_the_leader_fails(tmp_path):
+    db_path = str(tmp_path / "state.sqlite3")
+    leader, follower = _flight(db_path), _flight(db_path)
+
+    async def failing():
+        await asyncio.sleep(0.1)
+        raise RuntimeError("leader failed")
+
+    async def succeeding():
+        return "follower"
+
+    async def scenario():
+        led = asyncio.ensure_future(leader.run("key", failing, dumps=str, loads=str))
+        await asyncio.sleep(0.02)
+        followed = await follower.run("key", succeeding, dumps=str, loads=str)
+        with pytest.raises(RuntimeError):
+            await led
+        return followed
+
+    assert asyncio.run(scenario()) == ("follower", False)
+
+
+def test_lease_expires_when_the_leader_dies(tmp_path):
+    backend = SQLiteStateBackend(str(tmp_path / "state.sqlite3"))
+    # A lease left behind by a process that died without releasing or renewing it
+    backend.add("coalesce:key:lease", "1", ttl_seconds=0.2)
+    follower = SingleFlight(backend, lease_seconds=1, poll_interval_seconds=0.02)
+
+    async def work():
+        return "recovered"
+
+    started = time.monotonic()
+    assert asyncio.run(follower.run("key", work, dumps=str, loads=str)) == ("recovered", False)
+    assert time.monotonic() - started >= 0.15
+
+
+def _lead_in_process(db_path, ready):
+    async def work():
+        ready.set()
+        await asyncio.sleep(1.0)
+        return "from-other-process"
+
+    asyncio.run(_flight(db_path).run("key", work, dumps=str, loads=str))
+
+
+def test_result_is_shared_across_processes(tmp_path):
+    db_path = str(tmp_path / "state.sqlite3")
+    SQLiteStateBackend(db_path)
+    context = multiprocessing.get_context("spawn")
+    ready = context.Event()
+    process = context.Process(target=_lead_in_process, args=(db_path, ready))
+    process.start()
+    try:
+        assert ready.wait(timeout=30)
+
+        async def work():
+            return "from-this-process"
+
+        assert asyncio.run(_flight(db_path).run("key", work, dumps=str, loads=str)) == ("from-other-process", True)
+    finally:
+        process.join(timeout=30)
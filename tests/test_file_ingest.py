@@ -0,0 +1,126 @@
+import asyncio
+import io
+import os
+import tempfile
+import time
+
+import httpx
+import pytest
+
+import file_ingest
+from config import settings
+from file_ingest import DocumentError, aextract_upload_text
+
+
+class _Upload:
+    def __init__(self, content: bytes):
+        self.stream = io.BytesIO(content)
+
+    async def read(self, size: int = -1) -> bytes:
+        return self.stream.read(size)
+
+
+@pytest.fixture
+def single_worker(monkeypatch):
+    monkeypatch.setattr(settings, "file_extraction_workers", 1)
+    monkeypatch.setattr(settings, "file_extraction_timeout_seconds", 1.0)
+    file_ingest.shutdown_extraction_pool()
+    yield
+    file_ingest.shutdown_extraction_pool()
+
+
+@pytest.fixture
+def spool_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    return tmp_path
+
+
+def test_upload_is_spooled_to_disk_and_extracted(single_worker, spool_dir, monkeypatch):
+    # Small chunks, so the copy takes several reads
+    monkeypatch.setattr(file_ingest, "_COPY_CHUNK_BYTES", 4)
+    text = asyncio.run(aextract_upload_text(_Upload(b"Jane Doe\nEngineer"), "resume.txt", None))
+    assert text == "Jane Doe\nEngineer"
+    # The temporary copy is removed afterwards
+    assert os.listdir(spool_dir) == []
+
+
+def test_oversized_upload_is_rejected(single_worker, spool_dir, monkeypatch):
+    monkeypatch.setattr(settings, "upload_max_bytes", 4)
+    with pytest.raises(DocumentError) as error:
+        asyncio.run(aextract_upload_text(_Upload(b"too long"), "resume.txt", None))
+    assert error.value.status_code == 413
+    assert os.listdir(spool_dir) == []
+
+
+def test_timed_out_worker_is_killed_and_queued_jobs_are_retried(single_worker):
+    async def scenario():
+        # The hostile job holds the only worker; the second job is queued behind it
+        slow = asyncio.ensure_future(file_ingest._run_in_pool(time.sleep, 30))
+        await asyncio.sleep(0.1)
+        queued = asyncio.ensure_future(file_ingest._run_in_pool(str.upper, "queued"))
+        with pytest.raises(DocumentError) as error:
+            await slow
+        assert error.value.status_code == 422
+        started = time.perf_counter()
+        # Without killing the worker, this would wait behind the 30 s sleep and time out
+        assert await file_ingest._run_in_pool(str.upper, "after") == "AFTER"
+        return await queued, time.perf_counter() - started
+
+    queued, elapsed = asyncio.run(scenario())
+    assert queued == "QUEUED"
+    assert elapsed < 1.0
+
+
+def test_ingress_cuts_off_oversized_chunked_bodies():
+    from main import app
+
+    megabyte = 1024 * 1024
+    total_chunks = 4 * settings.upload_max_bytes // megabyte
+    sent_chunks = 0
+
+    async def chunks():
+        nonlocal sent_chunks
+        yield b'--b\r\nContent-Disposition: form-data; name="file"; filename="r.txt"\r\n\r\n'
+        for _ in range(total_chunks):
+            sent_chunks += 1
+            yield b"x" * megabyte
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(
+                "/analyze-resume-file", content=chunks(), headers={"content-type": "multipart/form-data; boundary=b"}
+            )
+
+    response = asyncio.run(scenario())
+    assert response.status_code == 413
+    assert "upload limit" in response.json()["error"]
+    # Reading stopped just past the limit instead of spooling the whole body
+    assert sent_chunks <= settings.upload_max_bytes // megabyte + 2
+
+
+def test_ingress_rejects_declared_length_before_reading_the_body():
+    from main import app
+
+    sent, read = [], []
+
+    async def receive():
+        read.append(1)
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": "/analyze-resume-file", "raw_path": b"/analyze-resume-file",
+        "query_string": b"", "root_path": "", "server": ("test", 80), "client": ("test", 1),
+        "headers": [
+            (b"host", b"test"),
+            (b"content-type", b"multipart/form-data; boundary=b"),
+            (b"content-length", str(10 ** 9).encode()),
+        ],
+    }
+    asyncio.run(app(scope, receive, send))
+    assert sent[0]["status"] == 413
+    assert not read
@@ -0,0 +1,39 @@
+import asyncio
+import uuid
+
+import pytest
+
+import graph
+from benchmark.fake_llm import FakeLLMConfig, install_fake_llm
+from nodes.llm_client import set_llm_factory
+
+
+RESUME = """
+Jane Doe
+Experience
+Senior Engineer, Foo Corp, 2019 - Present
+Built data pipelines.
+Education
+B.Sc. Computer Science, State University, 2011 - 2015
+"""
+
+
+@pytest.fixture
+def fake_llm():
+    install_fake_llm(FakeLLMConfig(latency_seconds=0, jitter_seconds=0))
+    yield
+    set_llm_factory(None)
+
+
+@pytest.mark.parametrize("topology", graph.GRAPH_TOPOLOGIES)
+def test_failed_insights_do_not_lose_the_other_sections(fake_llm, monkeypatch, topology):
+    async def failing_insights(summary_or_data):
+        return {"error": "Error extracting insights: rate limited"}
+
+    monkeypatch.setattr(graph, "aextract_insights", failing_insights)
+    app = graph.build_graph(topology)
+    values = asyncio.run(app.ainvoke({"resume_text": RESUME}, config={"thread_id": str(uuid.uuid4())}))
+
+    assert values["summary"] and values["work"]["work_experiences"]
+    assert "questions" not in values
+    assert values["error"] == "Error generating interview questions: Error extracting insights: rate limited"
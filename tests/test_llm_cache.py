@@ -0,0 +1,22 @@
+import asyncio
+
+from nodes.llm_cache import LLMCache
+from state_backend import SQLiteStateBackend
+
+
+def test_shared_tier_is_seen_by_another_worker(tmp_path):
+    db_path = str(tmp_path / "cache.sqlite3")
+    writer = LLMCache(backend=SQLiteStateBackend(db_path, table="llm_cache_entries"))
+    reader = LLMCache(backend=SQLiteStateBackend(db_path, table="llm_cache_entries"))
+
+    async def scenario():
+        await writer.aset("key", {"content": "cached"})
+        first = await reader.aget("key", node="test")
+        second = await reader.aget("key", node="test")
+        missing = await reader.aget("other", node="test")
+        return first, second, missing
+
+    first, second, missing = asyncio.run(scenario())
+    assert first == second == {"content": "cached"}
+    assert missing is None
+    assert reader.stats()["nodes"]["test"] == {"memory_hits": 1, "disk_hits": 1, "misses": 1}
@@ -0,0 +1,36 @@
+from graph import _reusable, partial_errors
+from nodes.extract_education import merge_education
+from nodes.extract_work import merge_work_experiences
+
+
+JOB = {"company": "Foo Corp", "role": "Engineer", "start_date": "2019-01", "end_date": "Present", "description": "Built it."}
+DEGREE = {"institution": "State University", "degree": "B.Sc.", "start_date": "2011-09", "end_date": "2015-06"}
+
+
+def test_merge_reports_partially_failed_chunks():
+    work = merge_work_experiences([{"work_experiences": [JOB]}, {"error": "Work experience extraction failed: timeout"}])
+    assert work == {"work_experiences": [JOB], "partial_errors": ["Work experience extraction failed: timeout"]}
+
+    education = merge_education([{"error": "Education extraction failed: bad JSON"}, {"education": [DEGREE]}])
+    assert education == {"education": [DEGREE], "partial_errors": ["Education extraction failed: bad JSON"]}
+
+    assert partial_errors({"work": work, "education": {"education": [DEGREE]}}) == {
+        "work": ["Work experience extraction failed: timeout"]
+    }
+
+
+def test_merge_without_failures_has_no_partial_errors():
+    work = merge_work_experiences([{"work_experiences": [JOB]}, {"work_experiences": [dict(JOB, description="")]}])
+    assert work == {"work_experiences": [JOB]}
+    assert partial_errors({"work": work}) is None
+    # Every chunk failed: the error itself is returned
+    assert merge_education([{"error": "down"}, {"error": "down too"}]) == {"error": "down"}
+
+
+def test_partial_extraction_is_not_reused():
+    complete = {"work_experiences": [JOB]}
+    state = {"previous": {"work": complete, "fingerprints": {"work": "abc"}}}
+    assert _reusable(state, "work", "work", "abc") == complete
+
+    state["previous"]["work"] = dict(complete, partial_errors=["timeout"])
+    assert _reusable(state, "work", "work", "abc") is None
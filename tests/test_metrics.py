@@ -0,0 +1,34 @@
+import asyncio
+
+from config import settings
+from metrics import instrument_node, registry, record_llm_call
+
+
+def test_cost_uses_each_models_price(monkeypatch):
+    monkeypatch.setattr(settings, "llm_model_prices", {"fast-model": (0.1, 0.2), "strong-model": (1.0, 2.0)})
+    usage = {"input_tokens": 1000, "output_tokens": 500, "total_tokens": 1500}
+
+    record_llm_call("test_node", "fast-model", 0.1, usage, cached=False)
+    record_llm_call("test_node", "strong-model", 0.1, usage, cached=False)
+    record_llm_call("test_node", "strong-model", 0.0, usage, cached=True)
+
+    rendered = registry.render()
+    assert 'resume_llm_cost_total{node="test_node",model="fast-model"} 0.2' in rendered
+    assert 'resume_llm_cost_total{node="test_node",model="strong-model"} 2.0' in rendered
+    assert 'resume_llm_tokens_total{node="test_node",model="fast-model",kind="prompt"} 1000' in rendered
+    assert 'resume_llm_calls_total{node="test_node",model="strong-model",cached="true"} 1' in rendered
+
+
+def test_summary_error_string_counts_as_node_error():
+    async def failed_summary(state):
+        return {"summary": "Error generating summary: rate limited"}
+
+    async def summary(state):
+        return {"summary": "Engineer with eight years of experience."}
+
+    asyncio.run(instrument_node("test_failed_summary", failed_summary)({}))
+    asyncio.run(instrument_node("test_summary", summary)({}))
+
+    rendered = registry.render()
+    assert 'resume_node_errors_total{node="test_failed_summary"} 1' in rendered
+    assert 'resume_node_errors_total{node="test_summary"}' not in rendered
@@ -0,0 +1,66 @@
+import asyncio
+import json
+
+from langchain_core.messages import AIMessage
+
+from config import settings
+from nodes import model_router
+from nodes.extract_work import WorkExperienceList, check_work_experience
+from nodes.llm_cache import llm_cache
+from nodes.llm_client import set_llm_factory
+
+
+ENTRY = {"company": "Foo Corp", "role": "Engineer", "start_date": "2019-01", "end_date": "Present", "description": "Built data pipelines."}
+
+
+class _ScriptedModel:
+    """
+    Returns a fixed completion and counts its calls, per model name.
+    """
+
+    def __init__(self, model_name, temperature, content, calls):
+        self.model_name = model_name
+        self.temperature = temperature
+        self.content = content
+        self.calls = calls
+
+    async def ainvoke(self, messages, *args, **kwargs):
+        self.calls[self.model_name] = self.calls.get(self.model_name, 0) + 1
+        return AIMessage(content=self.content)
+
+
+def test_fast_tier_is_off_by_default():
+    assert settings.llm_fast_model == ""
+    assert model_router.model_tiers("extract_work") == [settings.llm_model]
+
+
+def test_rejected_fast_output_is_not_cached(monkeypatch):
+    monkeypatch.setattr(settings, "llm_cache_enabled", True)
+    monkeypatch.setattr(settings, "llm_fast_model", "fast-model")
+    monkeypatch.setattr(settings, "llm_fast_nodes", ["extract_work"])
+    # The fast model's output validates but fails the quality check (free-form dates)
+    completions = {
+        "fast-model": json.dumps({"work_experiences": [dict(ENTRY, start_date="Jan 2019")]}),
+        settings.llm_model: json.dumps({"work_experiences": [ENTRY]}),
+    }
+    calls = {}
+    set_llm_factory(lambda model, temperature: _ScriptedModel(model, temperature, completions[model], calls))
+    llm_cache.clear()
+
+    async def analyze():
+        return await model_router.acall_routed(
+            "Extract the work history", node="extract_work", model_cls=WorkExperienceList,
+            quality_check=check_work_experience,
+        )
+
+    try:
+        first = asyncio.run(analyze())
+        second = asyncio.run(analyze())
+    finally:
+        set_llm_factory(None)
+        llm_cache.clear()
+
+    assert first.parsed == second.parsed == {"work_experiences": [ENTRY]}
+    # The strong answer was replayed from the cache, the rejected fast answer was not
+    assert second.cached
+    assert calls == {"fast-model": 2, settings.llm_model: 1}
@@ -0,0 +1,83 @@
+import asyncio
+import json
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from nodes.extract_combined import ResumeExtraction
+from nodes.extract_work import WorkExperienceList
+from nodes.response_parser import ResponseParseError, acall_structured, parse_model, repair_json
+
+
+JOB = {"company": "Foo", "role": "Engineer", "start_date": "2019-01", "end_date": "Present", "description": "Built it."}
+VALID = '{"work_experiences": [{"company": "Foo", "role": "Engineer", "start_date": "2019-01", "end_date": "Present", "description": "Built it."}]}'
+
+
+class ScriptedModel:
+    """
+    Chat model stand-in that answers each call with the next scripted output and records the prompts.
+    """
+
+    def __init__(self, *outputs):
+        self.outputs = list(outputs)
+        self.prompts = []
+        self.model_name = "scripted"
+        self.temperature = 0
+
+    async def ainvoke(self, messages, *args, **kwargs):
+        self.prompts.append(messages[0].content)
+        return AIMessage(content=self.outputs.pop(0))
+
+
+def test_parse_model_salvages_common_defects():
+    fenced = f"Here you go:\n```json\n{VALID}\n```\nAnything else?"
+    assert parse_model(fenced, WorkExperienceList) == {"work_experiences": [JOB]}
+
+    # Trailing commas
+    assert parse_model(VALID.replace('"}]}', '",},]}'), WorkExperienceList) == {"work_experiences": [JOB]}
+
+    # A half-written last entry (output cut off by the token limit)
+    truncated = VALID[:-2] + ', {"company": "Bar", "role": "Int'
+    assert parse_model(truncated, WorkExperienceList) == {"work_experiences": [JOB]}
+
+    with pytest.raises(ResponseParseError):
+        parse_model("I could not find any work experience.", WorkExperienceList)
+
+
+def test_bad_item_in_one_list_keeps_the_other_lists():
+    degree = {"institution": "State University", "degree": "B.Sc.", "field": "CS", "start_date": "2011-09", "end_date": "2015-06"}
+    for bad in ({"work_experiences": [JOB, {"company": "No role"}], "education": [degree]},
+                {"work_experiences": [JOB], "education": [{"degree": "No institution"}, degree]}):
+        assert parse_model(json.dumps(bad), ResumeExtraction) == {"work_experiences": [JOB], "education": [degree]}
+
+
+def test_repair_leaves_string_contents_alone():
+    broken = '{"description": "True, None or False? [None]", "remote": True, "manager": None, "tags": [False,],}'
+    assert json.loads(repair_json(broken)) == {
+        "description": "True, None or False? [None]", "remote": True, "manager": None, "tags": [False],
+    }
+    assert repair_json("{'note': 'a, ]', 'ok': True}") == "{'note': 'a, ]', 'ok': true}"
+
+
+def test_repair_prompt_fixes_invalid_output():
+    llm = ScriptedModel("Sorry, no JSON here.", VALID)
+    response = asyncio.run(acall_structured(llm, "Extract the jobs", node="test_repair", model_cls=WorkExperienceList))
+
+    assert response.parsed == {"work_experiences": [JOB]}
+    assert len(llm.prompts) == 2
+    # The repair prompt carries the broken output and the schema, not the original prompt
+    assert "Sorry, no JSON here." in llm.prompts[1]
+    assert "Extract the jobs" not in llm.prompts[1]
+
+
+def test_repair_gives_up_after_one_retry():
+    llm = ScriptedModel("not json", "still not json")
+    with pytest.raises(ResponseParseError):
+        asyncio.run(acall_structured(llm, "Extract the jobs", node="test_repair", model_cls=WorkExperienceList))
+    assert len(llm.prompts) == 2
+
+    # Without repair (the fast tier), the first invalid output raises right away
+    llm = ScriptedModel("not json")
+    with pytest.raises(ResponseParseError):
+        asyncio.run(acall_structured(llm, "Extract", node="test_repair", model_cls=WorkExperienceList, repair=False))
+    assert len(llm.prompts) == 1
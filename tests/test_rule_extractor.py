@@ -0,0 +1,57 @@
+from nodes.rule_extractor import rule_extract
+
+
+def test_clean_resume_is_extracted_with_full_confidence():
+    result = rule_extract(
+        "Jane Doe\n"
+        "Professional Experience\n"
+        "Senior Engineer, Foo Inc, Jan 2019 - Present\n"
+        "- Built data pipelines\n"
+        "Engineer, Bar LLC, 2015 - 2018\n"
+        "- Shipped services\n"
+        "Education\n"
+        "B.Sc. in Computer Science, State University, 2011 - 2015\n"
+    )
+    jobs = result["work"]["work_experiences"]
+    assert [(job["company"], job["role"], job["start_date"]) for job in jobs] == [
+        ("Foo Inc", "Senior Engineer", "2019-01"),
+        ("Bar LLC", "Engineer", "2015"),
+    ]
+    assert result["work_confidence"] == 1.0
+    assert result["education"]["education"][0]["institution"] == "State University"
+
+
+def test_headings_must_match_as_a_whole():
+    result = rule_extract(
+        "Research Experience\n"
+        "Research Assistant, Vision Lab, 2016 - 2018\n"
+        "Volunteer Experience\n"
+        "Coordinator, Food Bank, 2012 - 2014\n"
+    )
+    assert result["work"]["work_experiences"] == []
+    assert result["work_confidence"] == 0.0
+
+
+def test_undated_job_absorbed_into_a_description_lowers_confidence():
+    result = rule_extract(
+        "Experience\n"
+        "Engineer, Bar LLC, 2015 - 2019\n"
+        "- Shipped services\n"
+        "Freelance consulting, 2014\n"
+    )
+    jobs = result["work"]["work_experiences"]
+    assert len(jobs) == 1 and "Freelance consulting" in jobs[0]["description"]
+    # Below the default RULE_EXTRACTION_MIN_CONFIDENCE, so the LLM fallback runs
+    assert result["work_confidence"] < 0.9
+
+
+def test_legal_suffix_stays_with_the_company():
+    result = rule_extract("Experience\nSenior Engineer, Foo, Inc., Jan 2019 - Present\n- Built data pipelines\n")
+    job = result["work"]["work_experiences"][0]
+    assert (job["company"], job["role"]) == ("Foo, Inc.", "Senior Engineer")
+    assert result["work_confidence"] == 1.0
+
+
+def test_extra_header_fragments_lower_confidence():
+    result = rule_extract("Experience\nSenior Engineer, Foo Corp, Berlin, Jan 2019 - Present\n- Built data pipelines\n")
+    assert result["work_confidence"] < 0.9
@@ -0,0 +1,35 @@
+import asyncio
+
+from nodes import llm_client
+from nodes.scheduler import LLMScheduler
+
+
+async def _contended_calls(scheduler):
+    """
+    Runs three calls through a one-slot scheduler, so callers have to wait on the queue.
+    """
+    async def call():
+        await asyncio.sleep(0.01)
+        return "ok"
+
+    return await asyncio.gather(*(scheduler.run(call, estimated_tokens=10) for _ in range(3)))
+
+
+def test_scheduler_works_across_event_loops():
+    scheduler = LLMScheduler(rpm=0, tpm=0, max_concurrency=1)
+    # Each asyncio.run (like the sync node wrappers) uses a new loop
+    assert asyncio.run(_contended_calls(scheduler)) == ["ok"] * 3
+    assert asyncio.run(_contended_calls(scheduler)) == ["ok"] * 3
+    stats = scheduler.stats()
+    assert stats["requests"] == 6
+    assert stats["in_flight"] == 0 and stats["queue_depth"] == 0
+
+
+def test_async_http_pool_per_event_loop():
+    async def pool():
+        return llm_client._http_clients(asyncio.get_running_loop())[1]
+
+    with llm_client._lock:
+        first = asyncio.run(pool())
+        second = asyncio.run(pool())
+    assert first is not second
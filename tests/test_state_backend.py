@@ -0,0 +1,88 @@
+import multiprocessing
+import time
+
+import pytest
+
+from state_backend import RedisStateBackend, SQLiteStateBackend
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def backend(request, tmp_path):
+    if request.param == "sqlite":
+        return SQLiteStateBackend(str(tmp_path / "state.sqlite3"))
+    fakeredis = pytest.importorskip("fakeredis")
+    return RedisStateBackend(prefix="test:", client=fakeredis.FakeRedis(decode_responses=True))
+
+
+def test_get_set_delete(backend):
+    assert backend.get("missing") is None
+    backend.set("key", "value")
+    assert backend.get("key") == "value"
+    backend.set_json("json", {"a": [1, 2]})
+    assert backend.get_json("json") == {"a": [1, 2]}
+    backend.delete("key")
+    assert backend.get("key") is None
+
+
+def test_values_expire(backend):
+    backend.set("short", "value", ttl_seconds=0.05)
+    backend.set("forever", "value")
+    time.sleep(0.1)
+    assert backend.get("short") is None
+    assert backend.get("forever") == "value"
+
+
+def test_add_only_stores_absent_or_expired_keys(backend):
+    assert backend.add("lease", "first", ttl_seconds=0.05)
+    assert not backend.add("lease", "second", ttl_seconds=0.05)
+    assert backend.get("lease") == "first"
+    time.sleep(0.1)
+    assert backend.add("lease", "third")
+    assert backend.get("lease") == "third"
+
+
+def test_delete_prefix_matches_literally(backend):
+    for key in ("a_b:1", "a_b:2", "axb:1", "A_B:1", "a*b:1"):
+        backend.set(key, "value")
+    backend.delete_prefix("a_b:")
+    assert backend.get("a_b:1") is None and backend.get("a_b:2") is None
+    # '_' and '*' are not wildcards and the match is case-sensitive
+    assert backend.get("axb:1") == "value"
+    assert backend.get("A_B:1") == "value"
+    assert backend.get("a*b:1") == "value"
+
+
+def test_async_variants(backend):
+    import asyncio
+
+    async def scenario():
+        assert await backend.aadd("key", "value", 10)
+        assert not await backend.aadd("key", "other", 10)
+        await backend.aset_json("json", [1])
+        assert await backend.aget_json("json") == [1]
+        await backend.adelete("key")
+        return await backend.aget("key")
+
+    assert asyncio.run(scenario()) is None
+
+
+def _try_lease(db_path, start_at, results):
+    backend = SQLiteStateBackend(db_path)
+    # Line the processes up so the add calls race each other
+    time.sleep(max(0.0, start_at - time.time()))
+    results.put(backend.add("lease", "held", ttl_seconds=30))
+
+
+def test_sqlite_lease_is_won_by_exactly_one_process(tmp_path):
+    db_path = str(tmp_path / "state.sqlite3")
+    SQLiteStateBackend(db_path)
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    start_at = time.time() + 2
+    processes = [context.Process(target=_try_lease, args=(db_path, start_at, results)) for _ in range(6)]
+    for process in processes:
+        process.start()
+    outcomes = [results.get(timeout=30) for _ in processes]
+    for process in processes:
+        process.join(timeout=30)
+    assert sorted(outcomes) == [False] * 5 + [True]
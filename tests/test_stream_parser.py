@@ -0,0 +1,52 @@
+import json
+
+from nodes.extract_work import WorkExperience
+from nodes.stream_parser import IncrementalArrayParser, entry_streamer
+
+
+JOBS = [
+    {"company": "Foo {Corp}", "role": "Engineer [II]", "start_date": "2019-01", "end_date": "Present",
+     "description": 'Said "hi" and built {things}]'},
+    {"company": "Bar", "role": "Intern", "start_date": "2018-06", "end_date": "2018-09", "description": "Tests."},
+]
+DOCUMENT = "```json\n" + json.dumps({"note": "[{", "work_experiences": JOBS, "other": [{"x": 1}]}) + "\n```"
+
+
+def _feed_in_chunks(parser, text, size):
+    """
+    Feeds `text` in `size`-character chunks and returns (chunk index, key, item) per completed item.
+    """
+    completed = []
+    for index in range(0, len(text), size):
+        completed += [(index // size, key, item) for key, item in parser.feed(text[index:index + size])]
+    return completed
+
+
+def test_items_complete_as_soon_as_they_close():
+    for size in (1, 3, 17, len(DOCUMENT)):
+        completed = _feed_in_chunks(IncrementalArrayParser(["work_experiences"]), DOCUMENT, size)
+        # Brackets, braces and escaped quotes inside strings do not confuse the parser, and
+        # arrays under other keys are ignored
+        assert [(key, item) for _, key, item in completed] == [("work_experiences", job) for job in JOBS]
+
+    # One character at a time: the first item is reported before the second one starts
+    completed = _feed_in_chunks(IncrementalArrayParser(["work_experiences"]), DOCUMENT, 1)
+    first_closed = completed[0][0]
+    assert DOCUMENT[first_closed] == "}"
+    assert first_closed < DOCUMENT.index('"company": "Bar"')
+
+
+def test_truncated_output_reports_only_finished_items():
+    cut = DOCUMENT.index('"description": "Tests."')
+    completed = IncrementalArrayParser(["work_experiences"]).feed(DOCUMENT[:cut])
+    assert completed == [("work_experiences", JOBS[0])]
+
+
+def test_entry_streamer_validates_items():
+    received = []
+    on_token = entry_streamer({"work_experiences": WorkExperience}, lambda key, entry: received.append((key, entry)))
+    invalid = {"company": "No role"}
+    for char in json.dumps({"work_experiences": [invalid, JOBS[1]]}):
+        on_token(char)
+    # The item without a role fails validation and is left to the final parse
+    assert received == [("work_experiences", WorkExperience(**JOBS[1]).dict())]
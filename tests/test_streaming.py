@@ -0,0 +1,59 @@
+import asyncio
+import time
+import uuid
+
+from config import settings
+from benchmark.fake_llm import FakeLLMConfig, install_fake_llm
+from nodes.llm_client import set_llm_factory
+
+
+RESUME = """
+Jane Doe
+Experience
+Senior Engineer, Foo Corp, 2019 - Present
+Built data pipelines.
+Engineer, Bar LLC, 2015 - 2019
+Shipped services.
+Education
+B.Sc. Computer Science, State University, 2011 - 2015
+"""
+
+
+async def _stream_timings():
+    """
+    Streams one analysis like /analyze-resume/stream and returns the arrival time of each
+    extract_work entry and of the extract_work node update.
+    """
+    from graph import build_graph
+
+    app = build_graph()
+    started = time.perf_counter()
+    entries, node_done = [], None
+    async for mode, chunk in app.astream(
+        {"resume_text": RESUME, "extraction_mode": "split", "include": ["summary"]},
+        stream_mode=["updates", "custom"],
+        config={"thread_id": str(uuid.uuid4()), "stream_tokens": True, "stream_entries": True},
+    ):
+        now = time.perf_counter() - started
+        if mode == "custom" and chunk.get("event") == "entry" and chunk.get("node") == "extract_work":
+            entries.append(now)
+        elif mode == "updates" and "extract_work" in chunk:
+            node_done = now
+    return entries, node_done
+
+
+def test_entries_stream_before_node_completes(monkeypatch):
+    # Route extract_work through a fast tier: streamed calls must still skip it and arrive live
+    monkeypatch.setattr(settings, "llm_fast_model", "fast-model")
+    monkeypatch.setattr(settings, "llm_fast_nodes", ["extract_work"])
+    # Slow generation, so the time between the first entry and the end of the call is measurable
+    install_fake_llm(FakeLLMConfig(latency_seconds=0.01, jitter_seconds=0, output_tokens_per_second=150))
+    try:
+        entries, node_done = asyncio.run(_stream_timings())
+    finally:
+        set_llm_factory(None)
+
+    assert entries, "no entry events were streamed"
+    assert node_done is not None
+    # Entries must arrive before the node completes
+    assert entries[0] < node_done - 0.1